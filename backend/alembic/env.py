@@ -12,6 +12,9 @@ from src.auth.models import User
 from src.models.blog import Blog
 from src.models.package import Package
 from src.models.booking import Booking
+from src.models.storage_object import StorageObject
+from src.models.package_similarity import PackageSimilarity
+from src.models.catalog_deletion import CatalogDeletion
 
 # Get the database URL and convert it to sync if it's async
 database_url = Config.DATABASE_URL
@@ -0,0 +1,42 @@
+"""add storage objects
+
+Revision ID: a3c91f4e2b7d
+Revises: e7553d702015
+Create Date: 2026-10-19 11:04:27.390114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91f4e2b7d'
+down_revision: Union[str, Sequence[str], None] = 'e7553d702015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('storage_objects',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('bucket', sa.VARCHAR(length=100), nullable=False),
+    sa.Column('key', sa.VARCHAR(length=255), nullable=False),
+    sa.Column('sha256', sa.CHAR(length=64), nullable=False),
+    sa.Column('size', sa.BIGINT(), nullable=False),
+    sa.Column('content_type', sa.VARCHAR(length=100), nullable=False),
+    sa.Column('ref_count', sa.INTEGER(), nullable=False),
+    sa.Column('created_at', postgresql.TIMESTAMP(), nullable=False),
+    sa.Column('updated_at', postgresql.TIMESTAMP(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('bucket', 'key', name='storage_objects_bucket_key_key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('storage_objects')
@@ -0,0 +1,44 @@
+"""add catalog deletions and updated_at indexes
+
+Revision ID: a3c9e6f4b8d2
+Revises: f2b8d5c1e7a3
+Create Date: 2026-10-19 19:12:48.551302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c9e6f4b8d2'
+down_revision: Union[str, Sequence[str], None] = 'f2b8d5c1e7a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('catalog_deletions',
+    sa.Column('id', sa.BIGINT(), autoincrement=True, nullable=False),
+    sa.Column('entity_type', sa.VARCHAR(length=20), nullable=False),
+    sa.Column('entity_id', sa.UUID(), nullable=False),
+    sa.Column('deleted_at', postgresql.TIMESTAMP(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_catalog_deletions_entity_type_deleted_at', 'catalog_deletions', ['entity_type', 'deleted_at'], unique=False)
+    op.create_index('ix_packages_updated_at', 'packages', ['updated_at'], unique=False)
+    op.create_index('ix_destinations_updated_at', 'destinations', ['updated_at'], unique=False)
+    op.create_index('ix_blogs_updated_at', 'blogs', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_blogs_updated_at', table_name='blogs')
+    op.drop_index('ix_destinations_updated_at', table_name='destinations')
+    op.drop_index('ix_packages_updated_at', table_name='packages')
+    op.drop_index('ix_catalog_deletions_entity_type_deleted_at', table_name='catalog_deletions')
+    op.drop_table('catalog_deletions')
@@ -0,0 +1,47 @@
+"""add package available period
+
+Revision ID: b5d2e8f1c4a6
+Revises: a3c91f4e2b7d
+Create Date: 2026-10-19 14:12:51.218406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d2e8f1c4a6'
+down_revision: Union[str, Sequence[str], None] = 'a3c91f4e2b7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('package_detail_schedule', sa.Column(
+        'available_period',
+        postgresql.TSRANGE(),
+        sa.Computed(
+            "CASE WHEN available_from > available_until THEN 'empty'::tsrange "
+            "ELSE tsrange(available_from, available_until, '[]') END",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    op.create_index(
+        'ix_package_detail_schedule_available_period',
+        'package_detail_schedule',
+        ['available_period'],
+        unique=False,
+        postgresql_using='gist'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_package_detail_schedule_available_period', table_name='package_detail_schedule', postgresql_using='gist')
+    op.drop_column('package_detail_schedule', 'available_period')
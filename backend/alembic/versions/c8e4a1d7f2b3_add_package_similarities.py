@@ -0,0 +1,38 @@
+"""add package similarities
+
+Revision ID: c8e4a1d7f2b3
+Revises: b5d2e8f1c4a6
+Create Date: 2026-10-19 15:40:08.573119
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e4a1d7f2b3'
+down_revision: Union[str, Sequence[str], None] = 'b5d2e8f1c4a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('package_similarities',
+    sa.Column('package_id', sa.UUID(), nullable=False),
+    sa.Column('neighbor_ids', postgresql.ARRAY(sa.UUID()), nullable=False),
+    sa.Column('scores', postgresql.ARRAY(postgresql.DOUBLE_PRECISION()), nullable=False),
+    sa.Column('content_hash', sa.CHAR(length=64), nullable=False),
+    sa.Column('computed_at', postgresql.TIMESTAMP(), nullable=False),
+    sa.ForeignKeyConstraint(['package_id'], ['packages.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('package_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('package_similarities')
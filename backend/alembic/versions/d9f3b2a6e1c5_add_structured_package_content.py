@@ -0,0 +1,171 @@
+"""add structured package content
+
+Revision ID: d9f3b2a6e1c5
+Revises: c8e4a1d7f2b3
+Create Date: 2026-10-19 16:55:27.304118
+
+"""
+import re
+from typing import Sequence, Union, Optional, List, Dict, Any
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f3b2a6e1c5'
+down_revision: Union[str, Sequence[str], None] = 'c8e4a1d7f2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 500
+
+
+# Frozen copy of src/utils/package_content.py as of this revision, so later
+# changes to the parser (or moving it) never change what this backfill writes.
+
+# Normalised inclusion tag -> phrases that mention it (case-insensitive regexes)
+INCLUSION_TAGS: Dict[str, List[str]] = {
+    "breakfast": [r"breakfasts?", r"bed (?:and|&) breakfast", r"\bb ?& ?b\b"],
+    "lunch": [r"lunch(?:es)?"],
+    "dinner": [r"dinners?"],
+    "all_meals": [r"all meals", r"full board", r"all[- ]inclusive"],
+    "accommodation": [r"accommodations?", r"hotels?", r"resorts?", r"lodges?", r"guest ?houses?", r"homestays?"],
+    "airport_transfer": [
+        r"airport (?:pick[- ]?ups?|drop[- ]?offs?|drops?|transfers?)",
+        r"(?:pick[- ]?ups?|drop[- ]?offs?|transfers?) (?:from|to) (?:the )?airport",
+    ],
+    "flights": [r"flights?", r"air ?fares?", r"air tickets?"],
+    "transport": [r"transport(?:ation)?", r"(?:private|a/?c|air[- ]conditioned) (?:cars?|vehicles?|coach(?:es)?|bus(?:es)?|vans?)"],
+    "guide": [r"(?:tour |local |english[- ]speaking )?guides?\b", r"guided"],
+    "sightseeing": [r"sightseeing", r"city tours?"],
+    "entrance_fees": [r"entr(?:y|ance) (?:fees?|tickets?)", r"admission(?: fees?| tickets?)?", r"park fees?"],
+    "activities": [r"activities", r"excursions?", r"safaris?", r"cruises?", r"boat (?:rides?|trips?)"],
+    "visa": [r"visas?"],
+    "travel_insurance": [r"(?:travel )?insurance"],
+    "wifi": [r"wi-?fi"],
+    "taxes": [r"taxes", r"\bvat\b", r"service charges?"],
+}
+
+_TAG_PATTERNS = {
+    tag: re.compile(r"\b(?:" + "|".join(phrases) + r")", re.IGNORECASE)
+    for tag, phrases in INCLUSION_TAGS.items()
+}
+
+# Items that name something the package does not cover, e.g. "Lunch (not included)"
+_NEGATED_ITEM = re.compile(
+    r"\b(?:not included|excluded|not covered|own expense|at extra cost|optional)\b", re.IGNORECASE
+)
+
+# Inclusion lists are written as lines, bullets or comma/semicolon separated items
+_ITEM_SEPARATOR = re.compile(r"[\n;,•]+|\s+-\s+")
+
+# "Day 1:", "DAY 2 -", "Day 3-4.", "- Day 5)" ... anywhere in the text
+_DAY_HEADER = re.compile(
+    r"(?:^|(?<=[\s.;]))(?:[-*•]\s*)?day\s*(\d{1,3})(?:\s*(?:-|–|to|&)\s*(\d{1,3}))?\s*[:.)\-–]\s*",
+    re.IGNORECASE
+)
+
+_TITLE_END = re.compile(r"\n|(?<=[.!?])\s|\s[-–]\s")
+
+MAX_TITLE_LENGTH = 120
+
+
+def extract_inclusion_tags(text: Optional[str]) -> List[str]:
+    """Sorted vocabulary tags mentioned by the inclusions text"""
+    if not text:
+        return []
+    tags = set()
+    for item in _ITEM_SEPARATOR.split(text):
+        if not item.strip() or _NEGATED_ITEM.search(item):
+            continue
+        tags.update(tag for tag, pattern in _TAG_PATTERNS.items() if pattern.search(item))
+    return sorted(tags)
+
+
+def parse_itinerary(text: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Split an itinerary into [{"day", "title", "description"}] entries, one per
+    "Day N" header ("Day 3-4" headers also carry "end_day"). Text without day
+    headers gives an empty list; the original text stays the source of truth.
+    """
+    if not text:
+        return []
+    headers = list(_DAY_HEADER.finditer(text))
+    days = []
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+        body = text[header.end():end].strip()
+        split = _TITLE_END.search(body)
+        title = body[:split.start()] if split else body
+        description = body[split.end():].strip() if split else ""
+        if len(title) > MAX_TITLE_LENGTH:
+            title, description = "", body
+
+        day = {
+            "day": int(header.group(1)),
+            "title": title.strip().rstrip(".:") or None,
+            "description": description or None
+        }
+        if header.group(2) and int(header.group(2)) > day["day"]:
+            day["end_day"] = int(header.group(2))
+        days.append(day)
+    return days
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('package_detail_schedule', sa.Column(
+        'itinerary_days', postgresql.JSONB(astext_type=sa.Text()), server_default='[]', nullable=False
+    ))
+    op.add_column('package_detail_schedule', sa.Column(
+        'inclusion_tags', postgresql.JSONB(astext_type=sa.Text()), server_default='[]', nullable=False
+    ))
+
+    # Parse the existing text in batches; rows without either text keep the defaults
+    schedule = sa.table(
+        'package_detail_schedule',
+        sa.column('package_id', sa.UUID()),
+        sa.column('itinerary', sa.Text()),
+        sa.column('inclusions', sa.Text()),
+        sa.column('itinerary_days', postgresql.JSONB()),
+        sa.column('inclusion_tags', postgresql.JSONB()),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(schedule.c.package_id, schedule.c.itinerary, schedule.c.inclusions).where(
+            sa.or_(schedule.c.itinerary.isnot(None), schedule.c.inclusions.isnot(None))
+        )
+    ).all()
+    update = schedule.update().where(schedule.c.package_id == sa.bindparam('b_package_id')).values(
+        itinerary_days=sa.bindparam('b_itinerary_days'),
+        inclusion_tags=sa.bindparam('b_inclusion_tags'),
+    )
+    for start in range(0, len(rows), BACKFILL_BATCH_SIZE):
+        connection.execute(update, [
+            {
+                'b_package_id': row.package_id,
+                'b_itinerary_days': parse_itinerary(row.itinerary),
+                'b_inclusion_tags': extract_inclusion_tags(row.inclusions),
+            }
+            for row in rows[start:start + BACKFILL_BATCH_SIZE]
+        ])
+
+    # Built after the backfill so the rows are indexed once
+    op.create_index(
+        'ix_package_detail_schedule_inclusion_tags',
+        'package_detail_schedule',
+        ['inclusion_tags'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'inclusion_tags': 'jsonb_path_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_package_detail_schedule_inclusion_tags', table_name='package_detail_schedule', postgresql_using='gin', postgresql_ops={'inclusion_tags': 'jsonb_path_ops'})
+    op.drop_column('package_detail_schedule', 'inclusion_tags')
+    op.drop_column('package_detail_schedule', 'itinerary_days')
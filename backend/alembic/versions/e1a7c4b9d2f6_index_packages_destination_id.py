@@ -0,0 +1,29 @@
+"""index packages destination_id
+
+Revision ID: e1a7c4b9d2f6
+Revises: d9f3b2a6e1c5
+Create Date: 2026-10-19 17:42:11.906215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a7c4b9d2f6'
+down_revision: Union[str, Sequence[str], None] = 'd9f3b2a6e1c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_packages_destination_id', 'packages', ['destination_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_packages_destination_id', table_name='packages')
@@ -0,0 +1,37 @@
+"""add image renditions
+
+Revision ID: e7553d702015
+Revises: f8b7e10a9c92
+Create Date: 2026-10-19 09:12:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7553d702015'
+down_revision: Union[str, Sequence[str], None] = 'f8b7e10a9c92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rendition metadata is filled by scripts/backfill_image_renditions.py
+    op.add_column('package_images', sa.Column('renditions', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('packages', sa.Column('featured_image_renditions', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('destinations', sa.Column('featured_image_renditions', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('blogs', sa.Column('cover_image_renditions', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('blogs', 'cover_image_renditions')
+    op.drop_column('destinations', 'featured_image_renditions')
+    op.drop_column('packages', 'featured_image_renditions')
+    op.drop_column('package_images', 'renditions')
@@ -0,0 +1,38 @@
+"""add destination coordinates
+
+Revision ID: f2b8d5c1e7a3
+Revises: e1a7c4b9d2f6
+Create Date: 2026-10-19 18:05:37.218460
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d5c1e7a3'
+down_revision: Union[str, Sequence[str], None] = 'e1a7c4b9d2f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('destinations', sa.Column('latitude', postgresql.DOUBLE_PRECISION(), nullable=True))
+    op.add_column('destinations', sa.Column('longitude', postgresql.DOUBLE_PRECISION(), nullable=True))
+    op.add_column('destinations', sa.Column('geohash', sa.VARCHAR(length=12, collation='C'), nullable=True))
+    op.create_index('ix_destinations_geohash', 'destinations', ['geohash'], unique=False)
+    op.create_index('ix_destinations_latitude_longitude', 'destinations', ['latitude', 'longitude'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_destinations_latitude_longitude', table_name='destinations')
+    op.drop_index('ix_destinations_geohash', table_name='destinations')
+    op.drop_column('destinations', 'geohash')
+    op.drop_column('destinations', 'longitude')
+    op.drop_column('destinations', 'latitude')
@@ -0,0 +1,53 @@
+"""
+Script to generate image renditions (resized WebP + placeholder) for images
+that were uploaded before the rendition pipeline existed.
+Run this after applying the database migrations.
+"""
+import argparse
+import asyncio
+import sys
+import os
+
+# Add the parent directory to the path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.db.main import async_session_maker
+from src.services.image_rendition_service import image_rendition_service
+from src.utils.image_utils import ImageManager, shutdown_process_pool
+
+
+async def backfill_image_renditions(entity_types, limit):
+    """Process every stored image that has no renditions yet"""
+    try:
+        async with async_session_maker() as session:
+            summary = await image_rendition_service.backfill(
+                session,
+                entity_types=entity_types,
+                limit=limit
+            )
+
+        for entity_type, counts in summary.items():
+            print(
+                f"✓ {entity_type}: {counts['images_processed']} image(s) processed "
+                f"across {counts['entities']} record(s), {counts['failed']} failed"
+            )
+    finally:
+        shutdown_process_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill image renditions")
+    parser.add_argument(
+        "--entity",
+        action="append",
+        choices=ImageManager.get_supported_entities(),
+        help="Entity type to process (repeatable, defaults to all)"
+    )
+    parser.add_argument("--limit", type=int, default=None, help="Maximum records per entity type")
+    args = parser.parse_args()
+
+    print("🖼️  Backfilling image renditions...")
+    print("=" * 50)
+    asyncio.run(backfill_image_renditions(args.entity, args.limit))
+    print("=" * 50)
+    print("✅ Backfill complete!")
@@ -0,0 +1,139 @@
+"""
+Benchmark date-availability filtering on a seeded catalog.
+
+Seeds a temporary copy of package_detail_schedule (dropped when the connection
+closes, so the real tables are untouched) and compares:
+  - plain column predicates on available_from/available_until with B-tree indexes
+  - the generated available_period tsrange with its GiST index (&& and @>)
+Each query also filters on duration and price, like the package search.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add the parent directory to the path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from src.db.main import async_engine
+from src.models.package_detail_schedule import AVAILABLE_PERIOD_EXPRESSION
+
+
+SETUP = [
+    f"""
+    CREATE TEMP TABLE bench_schedule (
+        package_id integer PRIMARY KEY,
+        duration_days integer NOT NULL,
+        price numeric NOT NULL,
+        available_from timestamp,
+        available_until timestamp,
+        available_period tsrange GENERATED ALWAYS AS ({AVAILABLE_PERIOD_EXPRESSION}) STORED
+    )
+    """,
+    # Windows start within two years of 2026-01-01 and last 1-180 days; 5% have open bounds
+    """
+    INSERT INTO bench_schedule (package_id, duration_days, price, available_from, available_until)
+    SELECT
+        g,
+        1 + (random() * 20)::int,
+        round((100 + random() * 4900)::numeric, 2),
+        CASE WHEN random() < 0.05 THEN NULL ELSE start END,
+        CASE WHEN random() < 0.05 THEN NULL ELSE start + ((1 + random() * 179)::int || ' days')::interval END
+    FROM (
+        SELECT g, timestamp '2026-01-01' + ((random() * 730)::int || ' days')::interval AS start
+        FROM generate_series(1, :rows) AS g
+    ) seeded
+    """,
+    "CREATE INDEX ON bench_schedule (available_from)",
+    "CREATE INDEX ON bench_schedule (available_until)",
+    "CREATE INDEX ON bench_schedule USING gist (available_period)",
+    "ANALYZE bench_schedule",
+]
+
+FILTERS = "duration_days BETWEEN 4 AND 7 AND price <= 2500"
+
+QUERIES = {
+    "columns overlap": f"""
+        SELECT count(*) FROM bench_schedule
+        WHERE (available_from IS NULL OR available_from <= :until)
+          AND (available_until IS NULL OR available_until >= :start)
+          AND {FILTERS}
+    """,
+    "tsrange overlap (&&)": f"""
+        SELECT count(*) FROM bench_schedule
+        WHERE available_period && tsrange(:start, :until, '[]') AND {FILTERS}
+    """,
+    "columns contain": f"""
+        SELECT count(*) FROM bench_schedule
+        WHERE (available_from IS NULL OR available_from <= :start)
+          AND (available_until IS NULL OR available_until >= :until)
+          AND {FILTERS}
+    """,
+    "tsrange contain (@>)": f"""
+        SELECT count(*) FROM bench_schedule
+        WHERE available_period @> tsrange(:start, :until, '[]') AND {FILTERS}
+    """,
+}
+
+
+def random_windows(count: int, days: int):
+    windows = []
+    for _ in range(count):
+        start = datetime(2026, 1, 1) + timedelta(days=random.randint(0, 730))
+        windows.append({"start": start, "until": start + timedelta(days=days)})
+    return windows
+
+
+async def run(rows: int, queries: int, days: int):
+    async with async_engine.connect() as conn:
+        started = time.perf_counter()
+        for statement in SETUP:
+            params = {"rows": rows} if ":rows" in statement else {}
+            await conn.execute(text(statement), params)
+        print(f"Seeded {rows} schedules in {time.perf_counter() - started:.2f}s")
+
+        windows = random_windows(queries, days)
+        results = {}
+        for name, sql in QUERIES.items():
+            statement = text(sql)
+            await conn.execute(statement, windows[0])  # warm up
+            started = time.perf_counter()
+            matched = 0
+            for window in windows:
+                matched += (await conn.execute(statement, window)).scalar()
+            elapsed = time.perf_counter() - started
+            results[name] = matched
+            print(f"{name:>22}: {elapsed / queries * 1000:7.2f} ms/query  ({matched / queries:.0f} rows/query)")
+
+        plan = await conn.execute(text("EXPLAIN " + QUERIES["tsrange overlap (&&)"]), windows[0])
+        print("\nPlan for tsrange overlap:")
+        for (line,) in plan:
+            print(f"  {line}")
+
+        if results["columns overlap"] != results["tsrange overlap (&&)"]:
+            print("⚠️  overlap results differ between column and range predicates")
+        if results["columns contain"] != results["tsrange contain (@>)"]:
+            print("⚠️  contain results differ between column and range predicates")
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark availability search")
+    parser.add_argument("--rows", type=int, default=200000, help="Schedules to seed")
+    parser.add_argument("--queries", type=int, default=200, help="Random date windows to query")
+    parser.add_argument("--days", type=int, default=10, help="Length of each requested window in days")
+    args = parser.parse_args()
+
+    print(f"📅 Availability search on {args.rows} schedules, {args.queries} windows of {args.days} days")
+    print("=" * 50)
+    asyncio.run(run(args.rows, args.queries, args.days))
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark radius searches over seeded destination coordinates.
+
+Seeds a temporary destinations table (dropped when the connection closes, so
+the real tables are untouched) and compares, for random centres:
+  - a full scan computing the great-circle distance of every row
+  - geohash prefix ranges from covering_prefixes on the B-tree index, then the
+    exact distance filter, as DestinationService.get_nearby_destinations does
+Both must return the same destinations.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+# Add the parent directory to the path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from src.db.main import async_engine
+from src.utils.geo import EARTH_RADIUS_KM, encode_geohash, covering_prefixes, prefix_upper_bound
+
+
+SETUP = [
+    """
+    CREATE TEMP TABLE bench_destinations (
+        id integer PRIMARY KEY,
+        latitude double precision NOT NULL,
+        longitude double precision NOT NULL,
+        geohash varchar(12) COLLATE "C" NOT NULL
+    )
+    """,
+]
+INDEXES = [
+    "CREATE INDEX ON bench_destinations (geohash)",
+    "ANALYZE bench_destinations",
+]
+
+DISTANCE = f"""
+    2 * {EARTH_RADIUS_KM} * asin(least(1.0, sqrt(
+        power(sin(radians(latitude - :lat) / 2), 2) +
+        cos(radians(:lat)) * cos(radians(latitude)) * power(sin(radians(longitude - :lon) / 2), 2)
+    )))
+"""
+
+FULL_SCAN = f"SELECT id FROM bench_destinations WHERE {DISTANCE} <= :radius"
+
+BATCH_SIZE = 5000
+
+
+def seed_points(rows: int):
+    """Points clustered around a few hundred cities, like real destinations"""
+    cities = [(random.uniform(-60, 70), random.uniform(-180, 180)) for _ in range(300)]
+    points = []
+    for i in range(1, rows + 1):
+        city_lat, city_lon = random.choice(cities)
+        lat = max(-89.9, min(89.9, random.gauss(city_lat, 1.5)))
+        lon = (random.gauss(city_lon, 1.5) + 180) % 360 - 180
+        points.append({"id": i, "latitude": lat, "longitude": lon, "geohash": encode_geohash(lat, lon)})
+    return points, cities
+
+
+def prefix_query(prefixes):
+    ranges = " OR ".join(f"(geohash >= :p{i} AND geohash < :u{i})" for i in range(len(prefixes)))
+    params = {}
+    for i, prefix in enumerate(prefixes):
+        params[f"p{i}"] = prefix
+        params[f"u{i}"] = prefix_upper_bound(prefix)
+    return f"SELECT id FROM bench_destinations WHERE ({ranges}) AND {DISTANCE} <= :radius", params
+
+
+async def run(rows: int, queries: int, radius: float):
+    async with async_engine.connect() as conn:
+        started = time.perf_counter()
+        for statement in SETUP:
+            await conn.execute(text(statement))
+        points, cities = seed_points(rows)
+        insert = text(
+            "INSERT INTO bench_destinations (id, latitude, longitude, geohash) "
+            "VALUES (:id, :latitude, :longitude, :geohash)"
+        )
+        for start in range(0, rows, BATCH_SIZE):
+            await conn.execute(insert, points[start:start + BATCH_SIZE])
+        for statement in INDEXES:
+            await conn.execute(text(statement))
+        print(f"Seeded {rows} destinations in {time.perf_counter() - started:.2f}s")
+
+        centres = []
+        for _ in range(queries):
+            lat, lon = random.choice(cities)
+            centres.append({"lat": lat + random.uniform(-1, 1), "lon": lon + random.uniform(-1, 1), "radius": radius})
+
+        timings = {"full scan": 0.0, "geohash prefixes": 0.0}
+        mismatches = 0
+        matched = 0
+        for centre in centres:
+            started = time.perf_counter()
+            expected = {row.id for row in await conn.execute(text(FULL_SCAN), centre)}
+            timings["full scan"] += time.perf_counter() - started
+
+            prefixes = covering_prefixes(centre["lat"], centre["lon"], radius)
+            started = time.perf_counter()
+            if prefixes is None:
+                found = {row.id for row in await conn.execute(text(FULL_SCAN), centre)}
+            else:
+                sql, params = prefix_query(prefixes)
+                found = {row.id for row in await conn.execute(text(sql), {**centre, **params})}
+            timings["geohash prefixes"] += time.perf_counter() - started
+
+            matched += len(found)
+            mismatches += found != expected
+
+        for name, elapsed in timings.items():
+            print(f"{name:>18}: {elapsed / queries * 1000:7.2f} ms/query  ({matched / queries:.0f} rows/query)")
+
+        sample = centres[0]
+        prefixes = covering_prefixes(sample["lat"], sample["lon"], radius)
+        if prefixes is not None:
+            sql, params = prefix_query(prefixes)
+            plan = await conn.execute(text("EXPLAIN " + sql), {**sample, **params})
+            print("\nPlan for geohash prefixes:")
+            for (line,) in plan:
+                print(f"  {line}")
+
+        if mismatches:
+            print(f"⚠️  {mismatches} queries returned different destinations")
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark nearby-destination searches")
+    parser.add_argument("--rows", type=int, default=50000, help="Destinations to seed")
+    parser.add_argument("--queries", type=int, default=200, help="Random centres to query")
+    parser.add_argument("--radius", type=float, default=50, help="Search radius in km")
+    args = parser.parse_args()
+
+    print(f"📍 Nearby search on {args.rows} destinations, {args.queries} centres, {args.radius} km radius")
+    print("=" * 50)
+    asyncio.run(run(args.rows, args.queries, args.radius))
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark peak Python memory while handling concurrent multi-file package uploads.
+Compares the old full read (await file.read()) with the chunked spool used by
+SupabaseService.upload_image. Storage calls are not made; only the request-side
+handling of the file bodies is measured.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add the parent directory to the path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from src.utils.upload_utils import spool_upload
+
+
+JPEG_HEADER = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00"
+
+
+def make_upload(size: int, index: int) -> UploadFile:
+    """Build an UploadFile the way Starlette does (spooled, rolled to disk past 1 MB)"""
+    body = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    body.write(JPEG_HEADER)
+    remaining = size - len(JPEG_HEADER)
+    block = os.urandom(min(remaining, 1024 * 1024))
+    while remaining > 0:
+        body.write(block[:remaining])
+        remaining -= len(block)
+    body.seek(0)
+    return UploadFile(
+        file=body,
+        size=size,
+        filename=f"image_{index}.jpg",
+        headers=Headers({"content-type": "image/jpeg"})
+    )
+
+
+async def read_full(file: UploadFile) -> int:
+    content = await file.read()
+    return len(content)
+
+
+async def read_spooled(file: UploadFile) -> int:
+    spooled = await spool_upload(file, max_bytes=file.size)
+    spooled.cleanup()
+    return spooled.size
+
+
+async def create_package(handler, files) -> int:
+    """Mirror the create-package route: featured image first, then the gallery in order"""
+    total = 0
+    for file in files:
+        total += await handler(file)
+    return total
+
+
+async def run(handler, requests: int, files_per_request: int, file_size: int):
+    batches = [
+        [make_upload(file_size, i) for i in range(files_per_request)]
+        for _ in range(requests)
+    ]
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    totals = await asyncio.gather(*(create_package(handler, files) for files in batches))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for files in batches:
+        for file in files:
+            await file.close()
+    return sum(totals), peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark upload memory usage")
+    parser.add_argument("--requests", type=int, default=8, help="Concurrent package creations")
+    parser.add_argument("--files", type=int, default=5, help="Images per package (featured + gallery)")
+    parser.add_argument("--size-mb", type=float, default=8, help="Size of each image in MB")
+    args = parser.parse_args()
+
+    file_size = int(args.size_mb * 1024 * 1024)
+    print(f"📦 {args.requests} concurrent package creations x {args.files} images x {args.size_mb} MB")
+    print("=" * 50)
+    for name, handler in (("full read", read_full), ("chunked spool", read_spooled)):
+        total, peak, elapsed = asyncio.run(run(handler, args.requests, args.files, file_size))
+        print(
+            f"{name:>14}: peak {peak / (1024 * 1024):8.1f} MB  "
+            f"({total / (1024 * 1024):.0f} MB handled in {elapsed:.2f}s)"
+        )
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Script to delete stored images that are no longer referenced by any package,
+destination or blog. Runs as a dry run unless --delete is given.
+"""
+import argparse
+import asyncio
+import sys
+import os
+
+# Add the parent directory to the path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.db.main import async_session_maker
+from src.services.storage_gc_service import storage_gc_service
+from src.services.storage_service import storage_service
+
+
+async def gc_storage(buckets, grace_hours, delete):
+    """Scan buckets and remove (or report) orphaned objects"""
+    async with async_session_maker() as session:
+        report = await storage_gc_service.collect(
+            session,
+            buckets=buckets,
+            grace_hours=grace_hours,
+            dry_run=not delete
+        )
+
+    print(f"Referenced images: {report['referenced_images']} (grace period {report['grace_hours']}h)")
+    for bucket, counts in report["buckets"].items():
+        print(
+            f"✓ {bucket}: {counts['objects']} object(s), {counts['orphaned']} orphaned "
+            f"({counts['orphaned_bytes'] / (1024 * 1024):.1f} MB), "
+            f"{counts['skipped_within_grace']} within grace, "
+            f"{counts['deleted']} deleted, {counts['failed']} failed"
+        )
+        for key in counts["orphaned_keys"]:
+            print(f"    - {key}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Garbage-collect orphaned storage objects")
+    parser.add_argument(
+        "--bucket",
+        action="append",
+        choices=list(storage_service.buckets.keys()),
+        help="Bucket to scan (repeatable, defaults to catalog buckets)"
+    )
+    parser.add_argument("--grace-hours", type=int, default=None, help="Keep objects younger than this")
+    parser.add_argument("--delete", action="store_true", help="Actually delete (default is a dry run)")
+    args = parser.parse_args()
+
+    print("🧹 Collecting orphaned storage objects" + ("" if args.delete else " (dry run)") + "...")
+    print("=" * 50)
+    asyncio.run(gc_storage(args.bucket, args.grace_hours, args.delete))
+    print("=" * 50)
+    print("✅ Storage GC complete!")
@@ -0,0 +1,53 @@
+"""
+Script to publish the public catalog as static JSON documents and sitemap.xml.
+By default only what changed since the last run is re-rendered; --full
+re-renders everything. Documents go to the catalog bucket of the configured
+storage backend, or under --output for a directory served by a CDN or the
+frontend.
+"""
+import argparse
+import asyncio
+import sys
+import os
+import time
+
+# Add the parent directory to the path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import Config
+from src.db.main import async_session_maker
+from src.services.catalog_publisher import CatalogPublisher
+from src.services.storage_backends import LocalStorageBackend
+
+
+async def publish_catalog(full, output, base_url, bucket):
+    """Publish the catalog and report what was written"""
+    backend = LocalStorageBackend(output, base_url) if output else None
+    publisher = CatalogPublisher(backend=backend, bucket=bucket)
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        stats = await publisher.publish(session, full=full)
+
+    print(f"✓ {'Full' if stats['full'] else 'Incremental'} run up to {stats['watermark'].isoformat(timespec='seconds')}")
+    for entity_type, rendered in stats["rendered"].items():
+        print(
+            f"✓ {entity_type}: {rendered} rendered, {stats['removed'][entity_type]} removed, "
+            f"{stats['pages'][entity_type]} list page(s)"
+        )
+    print(f"✓ sitemap.xml: {stats['sitemap_urls']} URL(s)")
+    print(f"✓ Took {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish static catalog documents and sitemap.xml")
+    parser.add_argument("--full", action="store_true", help="Re-render everything, not only what changed")
+    parser.add_argument("--output", default=None, help="Write to <output>/<bucket> on disk instead of the storage backend")
+    parser.add_argument("--base-url", default=Config.LOCAL_STORAGE_URL, help="URL --output is served at (for sitemap parts)")
+    parser.add_argument("--bucket", default=Config.CATALOG_PUBLISH_BUCKET, help="Bucket (or directory) to publish to")
+    args = parser.parse_args()
+
+    print("📰 Publishing catalog" + (" (full)" if args.full else "") + "...")
+    print("=" * 50)
+    asyncio.run(publish_catalog(args.full, args.output, args.base_url, args.bucket))
+    print("=" * 50)
+    print("✅ Catalog publish complete!")
@@ -0,0 +1,39 @@
+"""
+Script to (re)build the "similar packages" lists. By default only packages whose
+content changed since the last run are recomputed; --full rebuilds every list.
+"""
+import argparse
+import asyncio
+import sys
+import os
+import time
+
+# Add the parent directory to the path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.db.main import async_session_maker
+from src.services.recommendation_service import recommendation_service
+
+
+async def refresh_similar_packages(full, top_k):
+    """Refresh the stored neighbor lists and report what changed"""
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        stats = await recommendation_service.refresh(session, full=full, top_k=top_k)
+
+    print(f"✓ {stats['packages']} active package(s), {stats['changed']} changed")
+    print(f"✓ {stats['recomputed']} list(s) recomputed, {stats['updated']} written, {stats['removed']} removed")
+    print(f"✓ Took {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh similar-package recommendations")
+    parser.add_argument("--full", action="store_true", help="Recompute every package, not only changed ones")
+    parser.add_argument("--top-k", type=int, default=None, help="Neighbors to keep per package")
+    args = parser.parse_args()
+
+    print("🧭 Refreshing similar packages" + (" (full rebuild)" if args.full else "") + "...")
+    print("=" * 50)
+    asyncio.run(refresh_similar_packages(args.full, args.top_k))
+    print("=" * 50)
+    print("✅ Similar packages refresh complete!")
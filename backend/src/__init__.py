@@ -1,4 +1,7 @@
+import os
+import asyncio
 from fastapi import FastAPI
+from fastapi.staticfiles import StaticFiles
 
  
 from contextlib import asynccontextmanager
@@ -10,6 +13,12 @@ from src.admin.auth_routes import admin_auth_router
 from src.user import user_router
 from fastapi.middleware.cors import CORSMiddleware
 from src.home.routes import home_router
+from src.storage.routes import storage_upload_router
+from src.utils.image_utils import shutdown_process_pool
+from src.utils.upload_utils import UploadSizeLimitMiddleware
+from src.services.popularity_service import popularity_service
+from src.services.catalog_snapshot import catalog_snapshot_service
+from src.config import Config
 
 
 @asynccontextmanager
@@ -17,7 +26,12 @@ async def lifespan(app: FastAPI):
 
     print(f"Server is starting...")
     await init_db()
+    popularity_task = asyncio.create_task(popularity_service.run_periodic_refresh())
+    snapshot_task = asyncio.create_task(catalog_snapshot_service.run())
     yield
+    popularity_task.cancel()
+    snapshot_task.cancel()
+    shutdown_process_pool()
     print(f"Server has been stopped.")
      
 
@@ -31,6 +45,9 @@ app = FastAPI(
 )
 
 
+# Registered before CORS so that 413 responses still carry CORS headers
+app.add_middleware(UploadSizeLimitMiddleware, max_body_size=Config.MAX_UPLOAD_REQUEST_BYTES)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"], # Allow all origins
@@ -45,3 +62,10 @@ app.include_router(admin_auth_router,prefix = f"/api/{version}/admin/auth",tags=
 app.include_router(admin_router,prefix = f"/api/{version}/admin",tags=["admin"]) 
 app.include_router(user_router,prefix = f"/api/{version}/user",tags=["user"]) 
 app.include_router(home_router, prefix=f"/api/{version}/home", tags=["home"])
+
+# With the local storage backend the API serves uploaded files itself and
+# receives signed direct uploads in place of Supabase
+if Config.STORAGE_BACKEND == "local":
+    os.makedirs(Config.LOCAL_STORAGE_PATH, exist_ok=True)
+    app.include_router(storage_upload_router, prefix=f"/api/{version}/storage", tags=["storage"])
+    app.mount("/storage", StaticFiles(directory=Config.LOCAL_STORAGE_PATH), name="storage")
@@ -11,6 +11,9 @@ from .routes.blogs import blog_router
 from .routes.packages import packages_router
 from .routes.bookings import bookings_router
 from .routes.destinations import destinations_router
+from .routes.storage import storage_router
+from .routes.uploads import uploads_router
+from .routes.imports import imports_router
  
 
 # Try to import promo_codes_router with error handling
@@ -37,6 +40,9 @@ admin_router.include_router(blog_router, tags=["Blogs"])
 admin_router.include_router(packages_router, tags=["Packages"])
 admin_router.include_router(bookings_router, tags=["Bookings"])
 admin_router.include_router(destinations_router, tags=["Destinations"])
+admin_router.include_router(storage_router, tags=["Storage"])
+admin_router.include_router(uploads_router, tags=["Uploads"])
+admin_router.include_router(imports_router, tags=["Import"])
 
 # Include promo codes router only if available
 if promo_codes_available and promo_codes_router:
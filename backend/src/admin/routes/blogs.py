@@ -7,6 +7,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ...db.main import get_session
 from ...services.blog_service import blog_service
+from ...schemas.bulk_schemas import BlogBulkPublishModel, BulkOperationResponseModel
 from ..dependencies import admin_access_bearer
 from .utils import validate_uuid
 
@@ -59,6 +60,19 @@ async def delete_blog(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@blog_router.patch("/blogs/bulk/publish", response_model=BulkOperationResponseModel)
+async def bulk_publish_blogs(
+    changes: BlogBulkPublishModel,
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(admin_access_bearer)
+):
+    """Publish or unpublish blogs selected by ids or filter"""
+    try:
+        return await blog_service.bulk_set_publish_status(session, changes)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @blog_router.patch("/blogs/{blog_id}/toggle-publish")
 async def toggle_blog_publish_status(
     blog_id: str,
@@ -2,12 +2,15 @@
 Admin bookings routes
 """
 from fastapi import APIRouter, HTTPException, Depends
-from typing import Optional
+from fastapi.responses import StreamingResponse
+from typing import Optional, Literal
+from datetime import date, datetime
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ...db.main import get_session
 from ...services.booking_service import booking_service
 from ...schemas.booking_schemas import BookingStatusUpdateModel
+from ...schemas.bulk_schemas import BookingBulkStatusModel, BulkOperationResponseModel
 from ..dependencies import admin_access_bearer
 
 bookings_router = APIRouter()
@@ -19,6 +22,9 @@ async def get_bookings(
     limit: int = 10, 
     search: Optional[str] = None, 
     status: Optional[str] = None,
+    user_id: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
     session: AsyncSession = Depends(get_session),
     token_data: dict = Depends(admin_access_bearer)
 ):
@@ -30,12 +36,40 @@ async def get_bookings(
             limit=limit,
             search=search,
             status=status,
-            user_id=None  # Admin can see all bookings
+            user_id=user_id,
+            date_from=date_from,
+            date_to=date_to
         )
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@bookings_router.get("/bookings/export")
+async def export_bookings(
+    format: Literal["csv", "ndjson"] = "csv",
+    search: Optional[str] = None,
+    status: Optional[str] = None,
+    user_id: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    token_data: dict = Depends(admin_access_bearer)
+):
+    """Stream all bookings matching the list filters as CSV or NDJSON"""
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"bookings-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{format}"
+    return StreamingResponse(
+        booking_service.stream_bookings_export(
+            fmt=format,
+            search=search,
+            status=status,
+            user_id=user_id,
+            date_from=date_from,
+            date_to=date_to
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @bookings_router.get("/bookings/{booking_id}")
 async def get_booking(
     booking_id: str, 
@@ -56,6 +90,18 @@ async def get_booking(
             raise e
         raise HTTPException(status_code=500, detail=str(e))
 
+@bookings_router.patch("/bookings/bulk/status", response_model=BulkOperationResponseModel)
+async def bulk_update_booking_status(
+    changes: BookingBulkStatusModel,
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(admin_access_bearer)
+):
+    """Change the status of bookings selected by ids or filter"""
+    try:
+        return await booking_service.bulk_update_status(session, changes)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @bookings_router.patch("/bookings/{booking_id}/status")
 async def update_booking_status(
     booking_id: str, 
@@ -282,6 +282,31 @@ async def get_system_stats(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@dashboard_router.get("/catalog/snapshot")
+async def get_catalog_snapshot_stats(
+    token_data: dict = Depends(admin_access_bearer)
+):
+    """Age and size of this worker's in-memory catalog snapshot"""
+    from ...services.catalog_snapshot import catalog_snapshot_service
+    
+    return catalog_snapshot_service.stats()
+
+
+@dashboard_router.post("/catalog/snapshot/refresh")
+async def refresh_catalog_snapshot(
+    token_data: dict = Depends(admin_access_bearer)
+):
+    """Rebuild this worker's catalog snapshot now"""
+    try:
+        from ...services.catalog_snapshot import catalog_snapshot_service
+        
+        await catalog_snapshot_service.refresh_in_background()
+        return catalog_snapshot_service.stats()
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to rebuild catalog snapshot: {str(e)}")
+
+
 @dashboard_router.post("/sync-booking-counts")
 async def sync_user_booking_counts(
     session: AsyncSession = Depends(get_session),
@@ -300,14 +325,14 @@ async def sync_user_booking_counts(
 
 @dashboard_router.post("/setup-storage")
 async def setup_supabase_storage(token_data: dict = Depends(admin_access_bearer)):
-    """Setup Supabase storage bucket for blog images (admin only)"""
+    """Setup storage bucket for blog images (admin only)"""
     try:
         from ...services.supabase_service import supabase_service
         
         # Try to create the bucket (will fail if it already exists, which is fine)
         try:
-            response = supabase_service.supabase.storage.create_bucket(
-                id="blogs-images",
+            await supabase_service.create_bucket(
+                "blogs-images",
                 options={
                     "public": True,
                     "allowed_mime_types": ["image/jpeg", "image/png", "image/gif", "image/webp"],
@@ -1,7 +1,7 @@
 """
 Admin destinations routes
 """
-from fastapi import APIRouter, HTTPException, Depends, Form, UploadFile, File
+from fastapi import APIRouter, HTTPException, Depends, Form, UploadFile, File, BackgroundTasks
 from typing import Optional
 from datetime import datetime
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -9,8 +9,13 @@ from sqlmodel import select, func
 
 from ...db.main import get_session
 from ...models.destination import Destination
-from ...models.package import Package
 from ...schemas.destination_schemas import DestinationDetailResponseModel
+from ...services.catalog_events import notify_change
+from ...services.destination_service import destination_service
+from ...services.sync_service import sync_service
+from ...services.storage_service import storage_service
+from ...services.image_rendition_service import image_rendition_service
+from ...utils.geo import validate_coordinates, geohash_for
 from ..dependencies import admin_access_bearer
 from .utils import validate_uuid
 
@@ -57,9 +62,15 @@ async def get_destinations(
         query = query.offset((page - 1) * limit).limit(limit)
         result = await session.exec(query)
         destinations = result.all()
+        aggregates = await destination_service.get_package_aggregates(
+            session, [destination.id for destination in destinations]
+        )
         
         return {
-            "destinations": destinations,
+            "destinations": [
+                {**destination.model_dump(), **aggregates.get(destination.id, {})}
+                for destination in destinations
+            ],
             "total": total,
             "page": page,
             "limit": limit,
@@ -71,6 +82,7 @@ async def get_destinations(
 
 @destinations_router.post("/destinations")
 async def create_destination(
+    background_tasks: BackgroundTasks,
     name: str = Form(...),
     country: str = Form(...),
     city: str = Form(...),
@@ -78,12 +90,18 @@ async def create_destination(
     climate: Optional[str] = Form(None),
     best_time_to_visit: Optional[str] = Form(None),
     timezone: Optional[str] = Form(None),
+    latitude: Optional[float] = Form(None),
+    longitude: Optional[float] = Form(None),
     is_active: bool = Form(True),
     featured_image: Optional[UploadFile] = File(None),
     session: AsyncSession = Depends(get_session),
     token_data: dict = Depends(admin_access_bearer)
 ):
     """Create a new destination"""
+    try:
+        validate_coordinates(latitude, longitude)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     try:
         # Handle featured image upload if provided
         featured_image_url = None
@@ -101,6 +119,9 @@ async def create_destination(
             best_time_to_visit=best_time_to_visit,
             timezone=timezone,
             featured_image=featured_image_url,
+            latitude=latitude,
+            longitude=longitude,
+            geohash=geohash_for(latitude, longitude),
             is_active=is_active,
             created_by=admin_id
         )
@@ -108,6 +129,9 @@ async def create_destination(
         session.add(destination)
         await session.commit()
         await session.refresh(destination)
+        await notify_change("destination", [destination.id])
+        if featured_image_url:
+            background_tasks.add_task(image_rendition_service.process_in_background, 'destination', destination.id)
 
         return destination
     except Exception as e:
@@ -118,6 +142,7 @@ async def create_destination(
 @destinations_router.put("/destinations/{destination_id}")
 async def update_destination(
     destination_id: str,
+    background_tasks: BackgroundTasks,
     name: Optional[str] = Form(None),
     country: Optional[str] = Form(None),
     city: Optional[str] = Form(None),
@@ -125,12 +150,18 @@ async def update_destination(
     climate: Optional[str] = Form(None),
     best_time_to_visit: Optional[str] = Form(None),
     timezone: Optional[str] = Form(None),
+    latitude: Optional[float] = Form(None),
+    longitude: Optional[float] = Form(None),
     is_active: Optional[bool] = Form(None),
     featured_image: Optional[UploadFile] = File(None),
     session: AsyncSession = Depends(get_session),
     token_data: dict = Depends(admin_access_bearer)
 ):
     """Update an existing destination"""
+    try:
+        validate_coordinates(latitude, longitude)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     try:
         # Validate destination_id format
         destination_uuid = validate_uuid(destination_id, "destination ID")
@@ -142,11 +173,13 @@ async def update_destination(
         if not destination:
             raise HTTPException(status_code=404, detail="Destination not found")
         
+        previous_image = destination.featured_image
         # Handle featured image upload if provided
         if featured_image:
             from ...services.supabase_service import supabase_service
             featured_image_url = await supabase_service.upload_destination_image(featured_image)
             destination.featured_image = featured_image_url
+            destination.featured_image_renditions = None
         
         if name is not None:
             destination.name = name
@@ -164,11 +197,20 @@ async def update_destination(
             destination.timezone = timezone
         if is_active is not None:
             destination.is_active = is_active
+        if latitude is not None:
+            destination.latitude = latitude
+            destination.longitude = longitude
+            destination.geohash = geohash_for(latitude, longitude)
         
         destination.updated_at = datetime.now()
         
         await session.commit()
         await session.refresh(destination)
+        if destination.featured_image != previous_image:
+            await storage_service.release_images([previous_image], "destination-images")
+        await notify_change("destination", [destination.id])
+        if featured_image:
+            background_tasks.add_task(image_rendition_service.process_in_background, 'destination', destination.id)
         
         return destination
     except Exception as e:
@@ -194,8 +236,12 @@ async def delete_destination(
         if not destination:
             raise HTTPException(status_code=404, detail="Destination not found")
         
+        featured_image = destination.featured_image
         await session.delete(destination)
+        await sync_service.record_deletions(session, "destination", [destination_uuid])
         await session.commit()
+        await storage_service.release_images([featured_image], "destination-images")
+        await notify_change("destination", [destination_uuid])
         
         return {"message": "Destination deleted successfully"}
     except Exception as e:
@@ -247,31 +293,13 @@ async def get_destination_details(
         if not destination:
             raise HTTPException(status_code=404, detail="Destination not found")
         
-        # Get package statistics for this destination
-        total_packages_query = select(func.count(Package.id)).where(Package.destination_id == destination_uuid)
-        total_packages_result = await session.exec(total_packages_query)
-        total_packages = total_packages_result.first() or 0
-        
-        active_packages_query = select(func.count(Package.id)).where(
-            Package.destination_id == destination_uuid,
-            Package.is_active == True
-        )
-        active_packages_result = await session.exec(active_packages_query)
-        active_packages = active_packages_result.first() or 0
-        
-        featured_packages_query = select(func.count(Package.id)).where(
-            Package.destination_id == destination_uuid,
-            Package.is_featured == True
-        )
-        featured_packages_result = await session.exec(featured_packages_query)
-        featured_packages = featured_packages_result.first() or 0
+        # Package statistics for this destination in one grouped query
+        aggregates = await destination_service.get_package_aggregates(session, [destination_uuid])
         
         # Build detailed response
         destination_dict = {
             **destination.model_dump(),
-            "total_packages": total_packages,
-            "active_packages": active_packages,
-            "featured_packages": featured_packages
+            **aggregates.get(destination_uuid, {})
         }
         
         return DestinationDetailResponseModel(**destination_dict)
@@ -0,0 +1,60 @@
+"""
+Admin catalog import routes (CSV / NDJSON)
+"""
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Optional
+
+from ...db.main import get_session
+from ...schemas.import_schemas import ImportReportModel
+from ...services.catalog_import_service import catalog_import_service
+from ..dependencies import admin_access_bearer
+
+imports_router = APIRouter()
+
+
+@imports_router.post("/import/destinations", response_model=ImportReportModel)
+async def import_destinations(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv or ndjson (defaults to the file extension)"),
+    dry_run: bool = Query(False, description="Validate only, write nothing"),
+    batch_size: int = Query(500, ge=1, le=2000),
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(admin_access_bearer)
+):
+    """Bulk import destinations and return a per-row error report"""
+    try:
+        admin_id = token_data.get("sub") or token_data.get("admin_id")
+        return await catalog_import_service.import_destinations(
+            session, file, admin_id, fmt=format, dry_run=dry_run, batch_size=batch_size
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Destination import error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@imports_router.post("/import/packages", response_model=ImportReportModel)
+async def import_packages(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv or ndjson (defaults to the file extension)"),
+    dry_run: bool = Query(False, description="Validate only, write nothing"),
+    batch_size: int = Query(500, ge=1, le=2000),
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(admin_access_bearer)
+):
+    """
+    Bulk import packages with their schedule/details and gallery URLs.
+    Each row references its destination by destination_id or destination_name.
+    """
+    try:
+        admin_id = token_data.get("sub") or token_data.get("admin_id")
+        return await catalog_import_service.import_packages(
+            session, file, admin_id, fmt=format, dry_run=dry_run, batch_size=batch_size
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Package import error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, BackgroundTasks
 from fastapi.responses import Response
 from typing import Optional, List, Dict, Any
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -8,7 +8,9 @@ import json
 
 from ...db.main import get_session
 from ...services.package_service import package_service
+from ...services.image_rendition_service import image_rendition_service
 from ...schemas.package_schemas import PackageCreateModel, PackageUpdateModel, PackageListResponseModel, PackageDetailResponseModel
+from ...schemas.bulk_schemas import PackageBulkUpdateModel, PackageBulkDeleteModel, BulkOperationResponseModel
 from ...models.package import Package
 from ..dependencies import admin_access_bearer
 
@@ -87,6 +89,7 @@ async def get_packages(
 
 @packages_router.post("/packages")
 async def create_package(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     description: str = Form(...),
     price: float = Form(...),
@@ -219,6 +222,8 @@ async def create_package(
         
         admin_id = token_data.get("sub") or token_data.get("admin_id")
         new_package = await package_service.create_package(session, package_data, admin_id=admin_id)
+        if featured_image_url or gallery_image_urls:
+            background_tasks.add_task(image_rendition_service.process_in_background, 'package', new_package.id)
         return new_package
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=f"Invalid UUID format: {str(ve)}")
@@ -230,6 +235,7 @@ async def create_package(
 @packages_router.put("/packages/{package_id}")
 async def update_package(
     package_id: str,
+    background_tasks: BackgroundTasks,
     title: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
     price: Optional[float] = Form(None),
@@ -382,6 +388,8 @@ async def update_package(
         )
         if not updated_package:
             raise HTTPException(status_code=404, detail="Package not found")
+        if featured_image is not None or gallery_images is not None:
+            background_tasks.add_task(image_rendition_service.process_in_background, 'package', updated_package.id)
         return updated_package
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=f"Invalid UUID format: {str(ve)}")
@@ -390,6 +398,30 @@ async def update_package(
             raise e
         raise HTTPException(status_code=500, detail=str(e))
 
+@packages_router.patch("/packages/bulk", response_model=BulkOperationResponseModel)
+async def bulk_update_packages(
+    changes: PackageBulkUpdateModel,
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(admin_access_bearer)
+):
+    """Set is_active/is_featured on packages selected by ids or filter"""
+    try:
+        return await package_service.bulk_update_packages(session, changes)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@packages_router.post("/packages/bulk/delete", response_model=BulkOperationResponseModel)
+async def bulk_delete_packages(
+    selection: PackageBulkDeleteModel,
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(admin_access_bearer)
+):
+    """Delete packages selected by ids or filter; packages with active bookings are skipped"""
+    try:
+        return await package_service.bulk_delete_packages(session, selection)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @packages_router.patch("/packages/{package_id}/toggle-active")
 async def toggle_package_active_status(
     package_id: str,
@@ -467,6 +499,7 @@ async def get_package(
 @packages_router.post("/packages/{package_id}/upload-image")
 async def upload_package_image_to_existing(
     package_id: str,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     session: AsyncSession = Depends(get_session),
     token_data: dict = Depends(admin_access_bearer)
@@ -497,6 +530,7 @@ async def upload_package_image_to_existing(
             package_id=package_id,
             package_data=package_data
         )
+        background_tasks.add_task(image_rendition_service.process_in_background, 'package', existing_package.id)
         
         return {"image_url": image_url}
     except Exception as e:
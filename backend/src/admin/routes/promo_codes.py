@@ -2,11 +2,12 @@
 Admin promo codes routes
 """
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional, List
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select, func
 import uuid
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 
 from ...db.main import get_session
 from ...models.promo_code import PromoCode
@@ -14,8 +15,14 @@ from ...schemas.promo_code_schemas import (
     PromoCodeCreateModel, 
     PromoCodeUpdateModel, 
     PromoCodeResponseModel,
-    PromoCodeListResponseModel
+    PromoCodeListResponseModel,
+    PromoCampaignCreateModel,
+    PromoAnalyticsResponseModel,
+    PromoUsageAlertsResponseModel,
+    PromoSimulationRequestModel,
+    PromoSimulationResponseModel
 )
+from ...services.promo_code_service import PromoCodeService
 from ..dependencies import admin_access_bearer
 
 promo_codes_router = APIRouter()
@@ -176,6 +183,62 @@ async def get_promo_codes_stats(
         raise HTTPException(status_code=500, detail=f"Error fetching promo code stats: {str(e)}")
 
 
+@promo_codes_router.get("/promo-codes/analytics", response_model=PromoAnalyticsResponseModel)
+async def get_promo_codes_analytics(
+    date_from: Optional[date] = Query(None, description="First booking day (default: 30 days ago)"),
+    date_to: Optional[date] = Query(None, description="Last booking day (default: today)"),
+    bucket: str = Query("week", pattern="^(day|week|month)$"),
+    metric: str = Query("revenue", pattern="^(revenue|redemptions|conversions|discount_given)$"),
+    top: int = Query(10, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
+    user=Depends(admin_access_bearer)
+):
+    """Redemptions, conversions, discount given and revenue over time for the top promo codes"""
+    try:
+        date_to = date_to or datetime.utcnow().date()
+        date_from = date_from or date_to - timedelta(days=30)
+        if date_from > date_to:
+            raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+        
+        return await PromoCodeService.get_promo_code_analytics(
+            session, date_from, date_to, bucket=bucket, metric=metric, top=top
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching promo code analytics: {str(e)}")
+
+
+@promo_codes_router.get("/promo-codes/analytics/alerts", response_model=PromoUsageAlertsResponseModel)
+async def get_promo_codes_usage_alerts(
+    threshold: float = Query(0.8, gt=0, le=1, description="Fraction of usage_limit already used"),
+    window_days: int = Query(7, ge=1, le=90, description="Days of bookings used for the redemption rate"),
+    session: AsyncSession = Depends(get_session),
+    user=Depends(admin_access_bearer)
+):
+    """Usable promo codes close to their usage limit"""
+    try:
+        return await PromoCodeService.get_usage_alerts(session, threshold=threshold, window_days=window_days)
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching promo code usage alerts: {str(e)}")
+
+
+@promo_codes_router.post("/promo-codes/simulate", response_model=PromoSimulationResponseModel)
+async def simulate_promo_codes(
+    simulation: PromoSimulationRequestModel,
+    session: AsyncSession = Depends(get_session),
+    user=Depends(admin_access_bearer)
+):
+    """Replay candidate promo rules over historical bookings to estimate their cost"""
+    try:
+        return await PromoCodeService.simulate_rules(session, simulation)
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error simulating promo codes: {str(e)}")
+
+
 @promo_codes_router.get("/promo-codes/{promo_code_id}", response_model=PromoCodeResponseModel)
 async def get_promo_code(
     promo_code_id: uuid.UUID,
@@ -303,6 +366,23 @@ async def create_promo_code(
         raise HTTPException(status_code=500, detail=f"Error creating promo code: {str(e)}")
 
 
+@promo_codes_router.post("/promo-codes/campaigns")
+async def create_promo_code_campaign(
+    campaign_data: PromoCampaignCreateModel,
+    user=Depends(admin_access_bearer)
+):
+    """Generate a batch of unique promo codes and download them as CSV"""
+    admin_id = user.get("sub") or user.get("admin_id")
+    if not admin_id:
+        raise HTTPException(status_code=401, detail="Admin ID not found in token")
+    filename = f"promo-codes-{campaign_data.prefix.lower() or 'campaign'}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.csv"
+    return StreamingResponse(
+        PromoCodeService.generate_campaign(campaign_data, admin_id),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @promo_codes_router.put("/promo-codes/{promo_code_id}", response_model=PromoCodeResponseModel)
 async def update_promo_code(
     promo_code_id: uuid.UUID,
@@ -0,0 +1,35 @@
+"""
+Admin storage maintenance routes
+"""
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Optional, List
+
+from ...db.main import get_session
+from ...services.storage_gc_service import storage_gc_service
+from ..dependencies import admin_access_bearer
+
+storage_router = APIRouter()
+
+
+@storage_router.post("/storage/gc")
+async def collect_orphaned_images(
+    dry_run: bool = Query(True, description="Only report what would be deleted"),
+    grace_hours: Optional[int] = Query(None, ge=0, description="Keep unreferenced objects younger than this"),
+    bucket: Optional[List[str]] = Query(None, description="Buckets to scan (defaults to catalog buckets)"),
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(admin_access_bearer)
+):
+    """Delete stored images no longer referenced by any package, destination or blog (admin only)"""
+    try:
+        return await storage_gc_service.collect(
+            session,
+            buckets=bucket,
+            grace_hours=grace_hours,
+            dry_run=dry_run
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Storage GC error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
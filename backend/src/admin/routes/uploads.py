@@ -0,0 +1,61 @@
+"""
+Admin direct-upload routes: sign an upload, then finalize it onto an entity
+"""
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ...db.main import get_session
+from ...schemas.upload_schemas import (
+    SignedUploadRequestModel,
+    SignedUploadResponseModel,
+    FinalizeUploadRequestModel,
+    FinalizeUploadResponseModel
+)
+from ...services.direct_upload_service import direct_upload_service
+from ...services.image_rendition_service import image_rendition_service
+from ..dependencies import admin_access_bearer
+
+uploads_router = APIRouter()
+
+
+@uploads_router.post("/uploads/sign", response_model=SignedUploadResponseModel)
+async def create_signed_upload(
+    upload_data: SignedUploadRequestModel,
+    token_data: dict = Depends(admin_access_bearer)
+):
+    """Issue a short-lived URL to upload an image straight to storage"""
+    try:
+        return await direct_upload_service.create_upload(upload_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@uploads_router.post("/uploads/finalize", response_model=FinalizeUploadResponseModel)
+async def finalize_upload(
+    upload_data: FinalizeUploadRequestModel,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(admin_access_bearer)
+):
+    """Verify a direct upload and attach it to a package, destination or blog"""
+    try:
+        result = await direct_upload_service.finalize(session, upload_data)
+        if not result:
+            raise HTTPException(status_code=404, detail=f"{upload_data.entity_type.capitalize()} not found")
+
+        background_tasks.add_task(
+            image_rendition_service.process_in_background,
+            upload_data.entity_type,
+            upload_data.entity_id
+        )
+        return result
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
+        raise HTTPException(status_code=500, detail=str(e))
@@ -7,6 +7,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ...db.main import get_session
 from ...services.admin_user_service import admin_user_service
+from ...schemas.bulk_schemas import UserBulkStatusModel, BulkOperationResponseModel
 from ..dependencies import admin_access_bearer
 
 users_router = APIRouter()
@@ -33,6 +34,19 @@ async def get_users(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@users_router.patch("/users/bulk/status", response_model=BulkOperationResponseModel)
+async def bulk_update_user_status(
+    changes: UserBulkStatusModel,
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(admin_access_bearer)
+):
+    """Activate or deactivate users selected by ids or filter"""
+    try:
+        return await admin_user_service.bulk_set_active(session, changes)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @users_router.patch("/users/{user_id}/toggle-status")
 async def toggle_user_status(
     user_id: str,
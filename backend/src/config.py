@@ -1,4 +1,5 @@
 
+from typing import List, Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -7,8 +8,18 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str 
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
-    SUPABASE_URL: str  
-    SUPABASE_KEY: str
+    SUPABASE_URL: str = ""
+    SUPABASE_KEY: str = ""
+
+    # File storage: "supabase" or "local" (files under LOCAL_STORAGE_PATH served at LOCAL_STORAGE_URL)
+    STORAGE_BACKEND: Literal["supabase", "local"] = "supabase"
+    LOCAL_STORAGE_PATH: str = "storage"
+    LOCAL_STORAGE_URL: str = "http://localhost:8000/storage"
+    # Where clients PUT signed uploads when the local backend is used
+    LOCAL_UPLOAD_URL: str = "http://localhost:8000/api/v1/storage/upload"
+    SIGNED_UPLOAD_EXPIRE_SECONDS: int = 600
+    # Unreferenced objects younger than this are kept by the storage GC
+    STORAGE_GC_GRACE_HOURS: int = 24
     
     # Admin-specific settings
     ADMIN_JWT_SECRET_KEY: str
@@ -30,6 +41,46 @@ class Settings(BaseSettings):
     SMTP_FROM_EMAIL: str = ""
     SMTP_FROM_NAME: str = "VistaVoyage"
 
+    # Image rendition pipeline
+    IMAGE_RENDITION_WIDTHS: List[int] = [320, 768, 1600]
+    IMAGE_RENDITION_QUALITY: int = 80
+    IMAGE_PROCESS_POOL_SIZE: int = 2
+
+    # Upload limits
+    MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    MAX_UPLOAD_REQUEST_BYTES: int = 60 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+
+    # "Similar packages" recommendations
+    SIMILAR_PACKAGES_TOP_K: int = 10
+    SIMILAR_PACKAGES_MAX_TERMS: int = 4096
+
+    # Booking-driven popularity ranking (Redis sorted sets)
+    POPULARITY_HALF_LIFE_DAYS: float = 30
+    POPULARITY_FEATURED_BOOST: float = 0.25
+    POPULARITY_REFRESH_SECONDS: int = 900
+
+    # Detail response cache (Redis) and batch multi-get
+    DETAIL_CACHE_TTL_SECONDS: int = 300
+    BATCH_GET_MAX_IDS: int = 50
+
+    # In-memory catalog snapshot for list reads (rebuilt on LISTEN/NOTIFY, polled as a fallback)
+    CATALOG_SNAPSHOT_ENABLED: bool = True
+    CATALOG_SNAPSHOT_POLL_SECONDS: int = 60
+
+    # Landing page bundle cache (Redis); also dropped on catalog and blog changes
+    HOME_BUNDLE_TTL_SECONDS: int = 60
+
+    # Delta sync (?updated_since): watermark safety lag and how long deletions are remembered
+    SYNC_WATERMARK_LAG_SECONDS: int = 5
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30
+
+    # Static catalog publishing (scripts/publish_catalog.py): public site linked from
+    # sitemap.xml, bucket the documents go to and items per list page
+    SITE_URL: str = "http://localhost:3000"
+    CATALOG_PUBLISH_BUCKET: str = "catalog"
+    CATALOG_PUBLISH_PAGE_SIZE: int = 12
+
     model_config = SettingsConfigDict(
         env_file = ".env",
         extra="ignore"
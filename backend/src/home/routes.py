@@ -5,9 +5,20 @@ from .service import HomeService
 from ..schemas.package_schemas import PackageResponseModel
 from ..schemas.blog_schemas import BlogResponseModel
 from ..schemas.destination_schemas import DestinationResponseModel
+from ..schemas.home_schemas import HomeBundleResponseModel
 
 home_router = APIRouter()
 
+@home_router.get("/bundle", response_model=HomeBundleResponseModel)
+async def get_home_bundle(
+    limit: int = Query(8, ge=1, le=20, description="Items per section")
+):
+    """Popular packages, top destinations and latest blogs for the landing page in one call"""
+    try:
+        return await HomeService.get_bundle(limit=limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @home_router.get("/packages", response_model=list[PackageResponseModel])
 async def get_home_packages(
     page: int = Query(1, ge=1),
@@ -1,36 +1,169 @@
+import asyncio
+import uuid
+from datetime import datetime
+from typing import List
+
+from redis.exceptions import RedisError
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
+from sqlmodel import select, func
+from sqlalchemy import and_
+from sqlalchemy.orm import selectinload
+from ..config import Config
+from ..db.main import async_session_maker
+from ..db.redis import redis_client
 from ..models.package import Package
 from ..models.blog import Blog, BlogStatus
 from ..models.destination import Destination
+from ..services.popularity_service import popularity_service
+from ..services.package_service import package_service
+from ..services.destination_service import destination_service
+from ..services.catalog_snapshot import catalog_snapshot_service
+from ..services.catalog_events import on_change
+from ..schemas.destination_schemas import DestinationResponseModel
+from ..schemas.blog_schemas import BlogResponseModel
+from ..schemas.home_schemas import HomeBundleResponseModel
+
+
+# Cached bundles live under "home:bundle:<limit>"; the set lists them for invalidation
+HOME_BUNDLE_KEY_PREFIX = "home:bundle"
+HOME_BUNDLE_KEYS = "home:bundle:keys"
+
 
 class HomeService:
     @staticmethod
     async def get_packages(session: AsyncSession, limit: int = 12, page: int = 1, search: str = None):
-        query = select(Package)
+        snapshot = catalog_snapshot_service.current()
+        # Unfiltered pages come straight from the popularity ranking
+        if not search:
+            package_ids = await popularity_service.get_ranked_ids(offset=(page - 1) * limit, limit=limit)
+            if package_ids is not None:
+                if snapshot is not None:
+                    return snapshot.get_packages_in_order(package_ids)
+                packages = await popularity_service.get_packages_in_order(session, package_ids)
+                return [package_service.to_list_item(package) for package in packages]
+
+        if snapshot is not None:
+            return snapshot.list_packages(page=page, limit=limit, search=search, search_description=False)["packages"]
+
+        query = select(Package).options(selectinload(Package.detail_schedule)).where(Package.is_active == True)
         if search:
             query = query.where(Package.title.ilike(f"%{search}%"))
-        query = query.offset((page - 1) * limit).limit(limit)
+        query = query.order_by(Package.created_at.desc()).offset((page - 1) * limit).limit(limit)
         result = await session.exec(query)
         packages = result.all()
-        return packages
+        return [package_service.to_list_item(package) for package in packages]
 
     @staticmethod
     async def get_blogs(session: AsyncSession, limit: int = 12, page: int = 1, search: str = None):
         query = select(Blog).where(Blog.status == BlogStatus.PUBLISHED)
         if search:
             query = query.where(Blog.title.ilike(f"%{search}%"))
-        query = query.offset((page - 1) * limit).limit(limit)
+        query = query.order_by(
+            Blog.is_featured.desc(), Blog.published_at.desc().nulls_last(), Blog.created_at.desc()
+        ).offset((page - 1) * limit).limit(limit)
         result = await session.exec(query)
         blogs = result.all()
         return blogs
 
     @staticmethod
     async def get_destinations(session: AsyncSession, limit: int = 12, page: int = 1, search: str = None):
-        query = select(Destination)
+        snapshot = catalog_snapshot_service.current()
+        if snapshot is not None:
+            return snapshot.list_destinations(page=page, limit=limit, search=search)
+
+        query = select(Destination).where(Destination.is_active == True)
         if search:
             query = query.where(Destination.name.ilike(f"%{search}%"))
-        query = query.offset((page - 1) * limit).limit(limit)
+        query = query.order_by(Destination.name.asc()).offset((page - 1) * limit).limit(limit)
         result = await session.exec(query)
         destinations = result.all()
-        return destinations
+        return await destination_service.with_package_aggregates(
+            session, [DestinationResponseModel.model_validate(destination) for destination in destinations]
+        )
+
+    @staticmethod
+    async def get_top_destinations(session: AsyncSession, limit: int = 12) -> List[DestinationResponseModel]:
+        """Active destinations with the most active packages"""
+        snapshot = catalog_snapshot_service.current()
+        if snapshot is not None:
+            ranked = sorted(snapshot.destinations, key=lambda record: (-record.response.active_packages, record.name))
+            return [record.response for record in ranked[:limit]]
+
+        package_count = func.count(Package.id)
+        query = select(Destination).outerjoin(
+            Package, and_(Package.destination_id == Destination.id, Package.is_active == True)
+        ).where(Destination.is_active == True).group_by(Destination.id).order_by(
+            package_count.desc(), Destination.name.asc()
+        ).limit(limit)
+        destinations = (await session.exec(query)).all()
+        return await destination_service.with_package_aggregates(
+            session, [DestinationResponseModel.model_validate(destination) for destination in destinations]
+        )
+
+    @staticmethod
+    async def _in_new_session(method, **kwargs):
+        """Run a HomeService query on its own session so several can run at once"""
+        async with async_session_maker() as session:
+            return await method(session, **kwargs)
+
+    @staticmethod
+    async def build_bundle(limit: int = 8) -> HomeBundleResponseModel:
+        """The landing page sections, queried concurrently"""
+        packages, destinations, blogs = await asyncio.gather(
+            HomeService._in_new_session(HomeService.get_packages, limit=limit),
+            HomeService._in_new_session(HomeService.get_top_destinations, limit=limit),
+            HomeService._in_new_session(HomeService.get_blogs, limit=limit)
+        )
+        return HomeBundleResponseModel(
+            packages=packages,
+            destinations=destinations,
+            blogs=[BlogResponseModel.model_validate(blog) for blog in blogs],
+            generated_at=datetime.utcnow()
+        )
+
+    @staticmethod
+    async def get_bundle(limit: int = 8) -> HomeBundleResponseModel:
+        """Cached landing page bundle; Redis errors only cost a rebuild"""
+        key = f"{HOME_BUNDLE_KEY_PREFIX}:{limit}"
+        try:
+            cached = await redis_client.get(key)
+            if cached is not None:
+                return HomeBundleResponseModel.model_validate_json(cached)
+        except RedisError as e:
+            print(f"Home bundle cache read failed: {str(e)}")
+
+        bundle = await HomeService.build_bundle(limit)
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(key, bundle.model_dump_json(), ex=Config.HOME_BUNDLE_TTL_SECONDS)
+                pipe.sadd(HOME_BUNDLE_KEYS, key)
+                await pipe.execute()
+        except RedisError as e:
+            print(f"Home bundle cache write failed: {str(e)}")
+        return bundle
+
+    @staticmethod
+    async def invalidate_bundle() -> None:
+        try:
+            keys = await redis_client.smembers(HOME_BUNDLE_KEYS)
+            await redis_client.delete(HOME_BUNDLE_KEYS, *keys)
+        except RedisError as e:
+            print(f"Home bundle invalidation failed: {str(e)}")
+
+
+@on_change("package", "destination", "blog")
+async def invalidate_home_bundle(entity_type: str, ids: List[uuid.UUID]) -> None:
+    """
+    Blog changes, and catalog changes read through SQL, show on the landing page
+    on its next load. With the snapshot enabled, the catalog sections are only
+    current once the rebuild this change started has been swapped in.
+    """
+    if entity_type == "blog" or catalog_snapshot_service.current() is None:
+        await HomeService.invalidate_bundle()
+
+
+@catalog_snapshot_service.on_refresh
+@popularity_service.on_refresh
+async def invalidate_home_bundle_after_refresh() -> None:
+    """Drop bundles built from the previous snapshot or ranking (each worker's swap drops them again)"""
+    await HomeService.invalidate_bundle()
@@ -7,6 +7,9 @@ from .package_image import PackageImage
 from .package import Package 
 from .promo_code import PromoCode
 from .package_detail_schedule import  PackageDetailSchedule 
+from .storage_object import StorageObject
+from .package_similarity import PackageSimilarity
+from .catalog_deletion import CatalogDeletion
  
 
 __all__ = [
@@ -22,5 +25,8 @@ __all__ = [
     "PackageImage",
     "PromoCode",
     "PackageDetailSchedule",
+    "StorageObject",
+    "PackageSimilarity",
+    "CatalogDeletion",
   
 ]
\ No newline at end of file
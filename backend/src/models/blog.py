@@ -1,9 +1,9 @@
 from sqlmodel import SQLModel, Field, Column, Relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 import sqlalchemy.dialects.postgresql as pg
 import uuid
 from datetime import datetime
-from typing import Optional, List, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, TYPE_CHECKING
 from enum import Enum
 
 if TYPE_CHECKING:
@@ -30,6 +30,10 @@ class BlogCategory(str, Enum):
 class Blog(SQLModel, table=True):
     """Blog model for travel blog posts."""
     __tablename__ = "blogs"
+    __table_args__ = (
+        # Delta sync (?updated_since)
+        Index("ix_blogs_updated_at", "updated_at"),
+    )
     
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -99,6 +103,13 @@ class Blog(SQLModel, table=True):
             nullable=True
         )
     )
+    cover_image_renditions: Optional[Dict[str, Any]] = Field(
+        default=None,
+        sa_column=Column(
+            pg.JSONB(none_as_null=True),
+            nullable=True
+        )
+    )
     is_featured: bool = Field(
         default=False,
         sa_column=Column(
@@ -0,0 +1,47 @@
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import Index
+import sqlalchemy.dialects.postgresql as pg
+import uuid
+from datetime import datetime
+
+
+class CatalogDeletion(SQLModel, table=True):
+    """Tombstone of a deleted package, destination or blog, for delta sync clients."""
+    __tablename__ = "catalog_deletions"
+    __table_args__ = (
+        Index("ix_catalog_deletions_entity_type_deleted_at", "entity_type", "deleted_at"),
+    )
+
+    id: int = Field(
+        default=None,
+        sa_column=Column(
+            pg.BIGINT,
+            primary_key=True,
+            autoincrement=True
+        )
+    )
+
+    # "package", "destination" or "blog"
+    entity_type: str = Field(
+        sa_column=Column(
+            pg.VARCHAR(20),
+            nullable=False
+        )
+    )
+
+    entity_id: uuid.UUID = Field(
+        sa_column=Column(
+            pg.UUID(as_uuid=True),
+            nullable=False
+        )
+    )
+
+    # Same clock as the updated_at columns it is compared with
+    deleted_at: datetime = Field(
+        default_factory=datetime.now,
+        sa_column=Column(
+            pg.TIMESTAMP,
+            default=datetime.now,
+            nullable=False
+        )
+    )
@@ -1,9 +1,9 @@
 from sqlmodel import SQLModel, Field, Column, Relationship
 import sqlalchemy.dialects.postgresql as pg
-from sqlalchemy import UniqueConstraint, ForeignKey
+from sqlalchemy import UniqueConstraint, ForeignKey, Index
 import uuid
 from datetime import datetime
-from typing import Optional, List, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .package import Package
@@ -14,6 +14,11 @@ class Destination(SQLModel, table=True):
     __tablename__ = "destinations"
     __table_args__ = (
         UniqueConstraint("name", "city", "country", name="unique_destination_name_location"),
+        # Prefix range scans for radius searches, coordinate ranges for map bounding boxes
+        Index("ix_destinations_geohash", "geohash"),
+        Index("ix_destinations_latitude_longitude", "latitude", "longitude"),
+        # Delta sync (?updated_since)
+        Index("ix_destinations_updated_at", "updated_at"),
     )
     
     id: uuid.UUID = Field(
@@ -77,6 +82,36 @@ class Destination(SQLModel, table=True):
             nullable=True
         )
     )
+    featured_image_renditions: Optional[Dict[str, Any]] = Field(
+        default=None,
+        sa_column=Column(
+            pg.JSONB(none_as_null=True),
+            nullable=True
+        )
+    )
+    latitude: Optional[float] = Field(
+        default=None,
+        sa_column=Column(
+            pg.DOUBLE_PRECISION,
+            nullable=True
+        )
+    )
+    longitude: Optional[float] = Field(
+        default=None,
+        sa_column=Column(
+            pg.DOUBLE_PRECISION,
+            nullable=True
+        )
+    )
+    # Derived from latitude/longitude with utils.geo.geohash_for on every write;
+    # "C" collation so prefixes are contiguous byte ranges in the index
+    geohash: Optional[str] = Field(
+        default=None,
+        sa_column=Column(
+            pg.VARCHAR(12, collation="C"),
+            nullable=True
+        )
+    )
     is_active: bool = Field(
         default=True,
         sa_column=Column(
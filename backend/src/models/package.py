@@ -1,10 +1,10 @@
 
 from sqlmodel import SQLModel, Field, Column, Relationship
 import sqlalchemy.dialects.postgresql as pg
-from sqlalchemy import UniqueConstraint, ForeignKey
+from sqlalchemy import UniqueConstraint, ForeignKey, Index
 import uuid
 from datetime import datetime
-from typing import Optional, List, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, TYPE_CHECKING
 from enum import Enum
 
 if TYPE_CHECKING:
@@ -22,6 +22,10 @@ class Package(SQLModel, table=True):
     __tablename__ = "packages"
     __table_args__ = (
         UniqueConstraint("title", "destination_id", name="unique_title_per_destination"),
+        # Per-destination package aggregates and listings
+        Index("ix_packages_destination_id", "destination_id"),
+        # Delta sync (?updated_since)
+        Index("ix_packages_updated_at", "updated_at"),
     )
     
     id: uuid.UUID = Field(
@@ -86,6 +90,14 @@ class Package(SQLModel, table=True):
             nullable=True
         )
     )
+
+    featured_image_renditions: Optional[Dict[str, Any]] = Field(
+        default=None,
+        sa_column=Column(
+            pg.JSONB(none_as_null=True),
+            nullable=True
+        )
+    )
    
     is_featured: bool = Field(
         default=False,
@@ -157,12 +169,12 @@ class Package(SQLModel, table=True):
     @property
     def is_available(self) -> bool:
         """Check if the package is currently available for booking."""
-        if not self.schedule:
+        if not self.detail_schedule:
             return self.is_active
         
         now = datetime.now()
         return (
             self.is_active and
-            (self.schedule.available_from is None or self.schedule.available_from <= now) and
-            (self.schedule.available_until is None or now <= self.schedule.available_until)
+            (self.detail_schedule.available_from is None or self.detail_schedule.available_from <= now) and
+            (self.detail_schedule.available_until is None or now <= self.detail_schedule.available_until)
         )
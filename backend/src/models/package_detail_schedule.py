@@ -1,9 +1,9 @@
 from sqlmodel import SQLModel, Field, Column
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Computed, Index
 import sqlalchemy.dialects.postgresql as pg
 import uuid
 from datetime import datetime
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .package import Package
@@ -28,6 +28,16 @@ class PackageDetailSchedule(SQLModel, table=True):
     exclusions: Optional[str] = Field(default=None, sa_column=Column(pg.TEXT, nullable=True))
     terms_conditions: Optional[str] = Field(default=None, sa_column=Column(pg.TEXT, nullable=True))
 
+    # Structured content parsed from itinerary/inclusions (see utils.package_content)
+    itinerary_days: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        sa_column=Column(pg.JSONB, nullable=False, server_default="[]")
+    )
+    inclusion_tags: List[str] = Field(
+        default_factory=list,
+        sa_column=Column(pg.JSONB, nullable=False, server_default="[]")
+    )
+
     # Schedule fields
     duration_days: int = Field(sa_column=Column(pg.INTEGER, nullable=False))
     duration_nights: int = Field(sa_column=Column(pg.INTEGER, nullable=False))
@@ -37,3 +47,35 @@ class PackageDetailSchedule(SQLModel, table=True):
 
     created_at: datetime = Field(default_factory=datetime.utcnow, sa_column=Column(pg.TIMESTAMP, default=datetime.utcnow, nullable=False))
     updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column=Column(pg.TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False))
+
+
+# Availability window as a tsrange (NULL bounds are open ended), generated by
+# Postgres and GiST indexed for overlap/containment searches. It is added to the
+# table rather than the model so the ORM never writes or reloads it.
+AVAILABLE_PERIOD_EXPRESSION = (
+    "CASE WHEN available_from > available_until THEN 'empty'::tsrange "
+    "ELSE tsrange(available_from, available_until, '[]') END"
+)
+
+PackageDetailSchedule.__table__.append_column(
+    Column(
+        "available_period",
+        pg.TSRANGE,
+        Computed(AVAILABLE_PERIOD_EXPRESSION, persisted=True),
+        nullable=True
+    )
+)
+
+Index(
+    "ix_package_detail_schedule_available_period",
+    PackageDetailSchedule.__table__.c.available_period,
+    postgresql_using="gist"
+)
+
+# Containment filters (inclusion_tags @> '["breakfast"]') use this index
+Index(
+    "ix_package_detail_schedule_inclusion_tags",
+    PackageDetailSchedule.__table__.c.inclusion_tags,
+    postgresql_using="gin",
+    postgresql_ops={"inclusion_tags": "jsonb_path_ops"}
+)
@@ -3,7 +3,7 @@ from sqlalchemy import ForeignKey
 import sqlalchemy.dialects.postgresql as pg
 import uuid
 from datetime import datetime
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, Dict, Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .package import Package
@@ -37,6 +37,14 @@ class PackageImage(SQLModel, table=True):
         )
     )
     
+    renditions: Optional[Dict[str, Any]] = Field(
+        default=None,
+        sa_column=Column(
+            pg.JSONB(none_as_null=True),
+            nullable=True
+        )
+    )
+    
     alt_text: Optional[str] = Field(
         default=None,
         sa_column=Column(
@@ -0,0 +1,56 @@
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import ForeignKey
+import sqlalchemy.dialects.postgresql as pg
+import uuid
+from datetime import datetime
+from typing import List
+
+
+class PackageSimilarity(SQLModel, table=True):
+    """Precomputed most similar packages for one package, best first."""
+    __tablename__ = "package_similarities"
+
+    package_id: uuid.UUID = Field(
+        sa_column=Column(
+            pg.UUID(as_uuid=True),
+            ForeignKey("packages.id", ondelete="CASCADE"),
+            nullable=False,
+            primary_key=True
+        )
+    )
+
+    neighbor_ids: List[uuid.UUID] = Field(
+        default_factory=list,
+        sa_column=Column(
+            pg.ARRAY(pg.UUID(as_uuid=True)),
+            nullable=False
+        )
+    )
+
+    # Same order as neighbor_ids
+    scores: List[float] = Field(
+        default_factory=list,
+        sa_column=Column(
+            pg.ARRAY(pg.DOUBLE_PRECISION),
+            nullable=False
+        )
+    )
+
+    # sha256 of the package content the neighbors were computed from
+    content_hash: str = Field(
+        sa_column=Column(
+            pg.CHAR(64),
+            nullable=False
+        )
+    )
+
+    computed_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column=Column(
+            pg.TIMESTAMP,
+            nullable=False
+        )
+    )
+
+    def __repr__(self):
+        return f"<PackageSimilarity {self.package_id} ({len(self.neighbor_ids)} neighbors)>"
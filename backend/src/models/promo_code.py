@@ -4,13 +4,47 @@ import sqlalchemy.dialects.postgresql as pg
 from sqlalchemy import UniqueConstraint, ForeignKey
 import uuid
 from datetime import datetime, date
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, Sequence, Tuple, TYPE_CHECKING
+import numpy as np
 
 if TYPE_CHECKING:
     from .offer import Offer
     from ..models.booking import Booking
 
 
+def apply_discount_rule(
+    amounts: np.ndarray,
+    discount_type: str,
+    discount_value: float,
+    minimum_amount: Optional[float] = None,
+    maximum_discount: Optional[float] = None
+) -> np.ndarray:
+    """
+    Discount of one promo rule for each amount, vectorized. Shared by
+    PromoCode.calculate_discounts and the what-if simulator so both stay in step.
+    """
+    # Calculate discount based on type
+    if discount_type == "percentage":
+        discounts = amounts * (discount_value / 100)
+    elif discount_type == "fixed":
+        discounts = np.full_like(amounts, discount_value)
+    else:
+        return np.zeros_like(amounts)
+        
+    # Apply maximum discount limit
+    if maximum_discount:
+        discounts = np.minimum(discounts, maximum_discount)
+        
+    # Ensure discount doesn't exceed the amount
+    discounts = np.minimum(discounts, amounts)
+    
+    # Check minimum amount requirement
+    if minimum_amount:
+        discounts = np.where(amounts < minimum_amount, 0.0, discounts)
+    
+    return discounts
+
+
 class PromoCode(SQLModel, table=True):
     """Promo code model for discount codes."""
     __tablename__ = "promo_codes"
@@ -177,6 +211,20 @@ class PromoCode(SQLModel, table=True):
         """Increment the usage count of the promo code."""
         self.used_count += 1
     
+    @property
+    def invalid_reason(self) -> Optional[str]:
+        """Why the promo code cannot be used right now, or None if it is valid."""
+        current_date = datetime.utcnow().date()
+        if not self.is_active:
+            return "Promo code is inactive"
+        if current_date < self.start_date:
+            return "Promo code is not yet active"
+        if current_date > self.expiry_date:
+            return "Promo code has expired"
+        if self.usage_limit is not None and self.used_count >= self.usage_limit:
+            return "Promo code has reached its usage limit"
+        return None
+    
     @property 
     def remaining_uses(self) -> Optional[int]:
         """Get the remaining uses for this promo code."""
@@ -189,27 +237,23 @@ class PromoCode(SQLModel, table=True):
         Calculate discount amount and final price.
         Returns: (discount_amount, final_amount)
         """
+        discounts, final_amounts = self.calculate_discounts([amount])
+        return float(discounts[0]), float(final_amounts[0])
+    
+    def calculate_discounts(self, amounts: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate discounts for many amounts in one vectorized pass.
+        Returns: (discount_amounts, final_amounts) as float arrays
+        """
+        amounts = np.asarray(amounts, dtype=float)
         if not self.is_valid:
-            return 0.0, amount
-            
-        # Check minimum amount requirement
-        if self.minimum_amount and amount < self.minimum_amount:
-            return 0.0, amount
-            
-        # Calculate discount based on type
-        if self.discount_type == "percentage":
-            discount_amount = amount * (self.discount_value / 100)
-        elif self.discount_type == "fixed":
-            discount_amount = self.discount_value
-        else:
-            return 0.0, amount
-            
-        # Apply maximum discount limit
-        if self.maximum_discount:
-            discount_amount = min(discount_amount, self.maximum_discount)
-            
-        # Ensure discount doesn't exceed the amount
-        discount_amount = min(discount_amount, amount)
+            return np.zeros_like(amounts), amounts.copy()
         
-        final_amount = amount - discount_amount
-        return discount_amount, final_amount
+        discounts = apply_discount_rule(
+            amounts,
+            self.discount_type,
+            self.discount_value,
+            minimum_amount=self.minimum_amount,
+            maximum_discount=self.maximum_discount
+        )
+        return discounts, amounts - discounts
@@ -0,0 +1,87 @@
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import UniqueConstraint
+import sqlalchemy.dialects.postgresql as pg
+import uuid
+from datetime import datetime
+
+
+class StorageObject(SQLModel, table=True):
+    """Content-addressed stored file and the number of uploads referencing it."""
+    __tablename__ = "storage_objects"
+    __table_args__ = (
+        UniqueConstraint("bucket", "key", name="storage_objects_bucket_key_key"),
+    )
+
+    id: uuid.UUID = Field(
+        default_factory=uuid.uuid4,
+        sa_column=Column(
+            pg.UUID(as_uuid=True),
+            nullable=False,
+            primary_key=True
+        )
+    )
+
+    bucket: str = Field(
+        sa_column=Column(
+            pg.VARCHAR(100),
+            nullable=False
+        )
+    )
+
+    # <sha256 of the content><extension>
+    key: str = Field(
+        sa_column=Column(
+            pg.VARCHAR(255),
+            nullable=False
+        )
+    )
+
+    sha256: str = Field(
+        sa_column=Column(
+            pg.CHAR(64),
+            nullable=False
+        )
+    )
+
+    size: int = Field(
+        sa_column=Column(
+            pg.BIGINT,
+            nullable=False
+        )
+    )
+
+    content_type: str = Field(
+        sa_column=Column(
+            pg.VARCHAR(100),
+            nullable=False
+        )
+    )
+
+    ref_count: int = Field(
+        default=1,
+        sa_column=Column(
+            pg.INTEGER,
+            nullable=False,
+            default=1
+        )
+    )
+
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column=Column(
+            pg.TIMESTAMP,
+            nullable=False
+        )
+    )
+
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column=Column(
+            pg.TIMESTAMP,
+            nullable=False,
+            onupdate=datetime.utcnow
+        )
+    )
+
+    def __repr__(self):
+        return f"<StorageObject {self.bucket}/{self.key} refs={self.ref_count}>"
@@ -0,0 +1,59 @@
+from pydantic import BaseModel
+from typing import Optional, List
+import uuid
+
+from .package_schemas import PackageDetailResponseModel
+from .destination_schemas import DestinationResponseModel
+from .blog_schemas import BlogDetailResponseModel
+
+
+def parse_batch_ids(values: List[str], max_ids: int) -> List[uuid.UUID]:
+    """
+    Ids from ?ids=a&ids=b or ?ids=a,b (or both), in request order. Raises
+    ValueError for malformed ids or more than max_ids of them.
+    """
+    raw = [part.strip() for value in values for part in value.split(",") if part.strip()]
+    if not raw:
+        raise ValueError("ids must contain at least one id")
+    if len(raw) > max_ids:
+        raise ValueError(f"At most {max_ids} ids can be requested at once")
+    ids = []
+    for value in raw:
+        try:
+            ids.append(uuid.UUID(value))
+        except ValueError:
+            raise ValueError(f"Invalid id: {value}")
+    return ids
+
+
+class PackageBatchItemModel(BaseModel):
+    """One requested id; package is None when found is false"""
+    id: uuid.UUID
+    found: bool
+    package: Optional[PackageDetailResponseModel] = None
+
+
+class PackageBatchResponseModel(BaseModel):
+    items: List[PackageBatchItemModel]
+
+
+class DestinationBatchItemModel(BaseModel):
+    """One requested id; destination is None when found is false"""
+    id: uuid.UUID
+    found: bool
+    destination: Optional[DestinationResponseModel] = None
+
+
+class DestinationBatchResponseModel(BaseModel):
+    items: List[DestinationBatchItemModel]
+
+
+class BlogBatchItemModel(BaseModel):
+    """One requested id; blog is None when found is false"""
+    id: uuid.UUID
+    found: bool
+    blog: Optional[BlogDetailResponseModel] = None
+
+
+class BlogBatchResponseModel(BaseModel):
+    items: List[BlogBatchItemModel]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
 import uuid
@@ -52,6 +52,7 @@ class BlogResponseModel(BaseModel):
     content: str
     category: str
     cover_image: Optional[str] = None
+    cover_image_renditions: Optional[Dict[str, Any]] = None
     status: BlogStatusEnum
     is_featured: bool
     published_at: Optional[datetime] = None
@@ -62,12 +63,20 @@ class BlogResponseModel(BaseModel):
         from_attributes = True
 
 
+class BlogDetailResponseModel(BlogResponseModel):
+    """A blog with its author's name, as shown on the blog page"""
+    author_name: Optional[str] = None
+
+
 class BlogListResponseModel(BaseModel):
     blogs: List[BlogResponseModel]
     total: int
     page: int
     limit: int
     total_pages: int
+    # Set on delta responses (?updated_since): ids to remove and the next updated_since
+    deleted_ids: Optional[List[uuid.UUID]] = None
+    watermark: Optional[datetime] = None
 
 
 class BlogSummaryResponseModel(BaseModel):
@@ -78,6 +87,7 @@ class BlogSummaryResponseModel(BaseModel):
     excerpt: Optional[str] = None
     category: str
     cover_image: Optional[str] = None
+    cover_image_renditions: Optional[Dict[str, Any]] = None
     status: BlogStatusEnum
     is_featured: bool
     published_at: Optional[datetime] = None
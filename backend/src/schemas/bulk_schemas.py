@@ -0,0 +1,88 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List
+from datetime import date
+import uuid
+
+from .booking_schemas import BookingStatus
+
+
+class BulkSelectionModel(BaseModel):
+    """
+    Rows are selected either by an explicit id list or by a filter. A filter must
+    set at least one condition, so an empty body never matches a whole table.
+    """
+    ids: Optional[List[uuid.UUID]] = Field(None, min_length=1, max_length=10000)
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        filter_value = getattr(self, "filter", None)
+        if (self.ids is None) == (filter_value is None):
+            raise ValueError("Provide either ids or filter")
+        if filter_value is not None and not filter_value.model_dump(exclude_none=True):
+            raise ValueError("filter must set at least one condition")
+        return self
+
+
+class PackageBulkFilterModel(BaseModel):
+    search: Optional[str] = None
+    destination_id: Optional[uuid.UUID] = None
+    is_active: Optional[bool] = None
+    is_featured: Optional[bool] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+
+class BookingBulkFilterModel(BaseModel):
+    search: Optional[str] = None
+    status: Optional[BookingStatus] = None
+    user_id: Optional[uuid.UUID] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+
+
+class BlogBulkFilterModel(BaseModel):
+    search: Optional[str] = None
+    category: Optional[str] = None
+    status: Optional[str] = None
+
+
+class UserBulkFilterModel(BaseModel):
+    search: Optional[str] = None
+    is_active: Optional[bool] = None
+
+
+class PackageBulkUpdateModel(BulkSelectionModel):
+    filter: Optional[PackageBulkFilterModel] = None
+    is_active: Optional[bool] = None
+    is_featured: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def check_changes(self):
+        if self.is_active is None and self.is_featured is None:
+            raise ValueError("Set is_active and/or is_featured")
+        return self
+
+
+class PackageBulkDeleteModel(BulkSelectionModel):
+    filter: Optional[PackageBulkFilterModel] = None
+
+
+class BookingBulkStatusModel(BulkSelectionModel):
+    filter: Optional[BookingBulkFilterModel] = None
+    status: BookingStatus
+
+
+class BlogBulkPublishModel(BulkSelectionModel):
+    filter: Optional[BlogBulkFilterModel] = None
+    publish: bool
+
+
+class UserBulkStatusModel(BulkSelectionModel):
+    filter: Optional[UserBulkFilterModel] = None
+    is_active: bool
+
+
+class BulkOperationResponseModel(BaseModel):
+    affected: int
+    skipped_ids: List[uuid.UUID] = []
+    message: str
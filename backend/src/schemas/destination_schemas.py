@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 import uuid
 
@@ -12,8 +12,16 @@ class DestinationCreateModel(BaseModel):
     best_time_to_visit: Optional[str] = Field(None, max_length=100)
     timezone: Optional[str] = Field(None, max_length=50)
     featured_image: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     is_active: bool = True
 
+    @model_validator(mode="after")
+    def check_coordinates(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError('latitude and longitude must be given together')
+        return self
+
 
 class DestinationUpdateModel(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=255)
@@ -23,8 +31,19 @@ class DestinationUpdateModel(BaseModel):
     best_time_to_visit: Optional[str] = Field(None, max_length=100)
     timezone: Optional[str] = Field(None, max_length=50)
     featured_image: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     is_active: Optional[bool] = None
 
+    @model_validator(mode="after")
+    def check_coordinates(self):
+        # Coordinates move together; clearing both is allowed
+        if ('latitude' in self.model_fields_set) != ('longitude' in self.model_fields_set):
+            raise ValueError('latitude and longitude must be updated together')
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError('latitude and longitude must be given together')
+        return self
+
 
 class DestinationResponseModel(BaseModel):
     id: uuid.UUID
@@ -35,34 +54,27 @@ class DestinationResponseModel(BaseModel):
     best_time_to_visit: Optional[str] = None
     timezone: Optional[str] = None
     featured_image: Optional[str] = None
+    featured_image_renditions: Optional[Dict[str, Any]] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     is_active: bool
     created_at: datetime
     updated_at: datetime
     
+    # Aggregated over the destination's active packages
+    active_packages: int = 0
+    featured_packages: int = 0
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_duration_days: Optional[int] = None
+    
     class Config:
         from_attributes = True
 
 
-class DestinationDetailResponseModel(BaseModel):
-    id: uuid.UUID
-    name: str
-    description: Optional[str] = None
-    country: str
-    city: str
-    best_time_to_visit: Optional[str] = None
-    timezone: Optional[str] = None
-    featured_image: Optional[str] = None
-    is_active: bool
-    created_at: datetime
-    updated_at: datetime
-    
+class DestinationDetailResponseModel(DestinationResponseModel):
     # Additional details
     total_packages: int = 0
-    active_packages: int = 0
-    featured_packages: int = 0
-    
-    class Config:
-        from_attributes = True
 
 
 class DestinationListResponseModel(BaseModel):
@@ -71,3 +83,24 @@ class DestinationListResponseModel(BaseModel):
     page: int
     limit: int
     total_pages: int
+    # Set on delta responses (?updated_since): ids to remove and the next updated_since
+    deleted_ids: Optional[List[uuid.UUID]] = None
+    watermark: Optional[datetime] = None
+
+
+class NearbyDestinationModel(DestinationResponseModel):
+    distance_km: float
+
+
+class NearbyDestinationsResponseModel(BaseModel):
+    latitude: float
+    longitude: float
+    radius_km: float
+    # Nearest first
+    destinations: List[NearbyDestinationModel]
+
+
+class DestinationMapResponseModel(BaseModel):
+    destinations: List[DestinationResponseModel]
+    # More destinations are inside the box than were returned
+    truncated: bool
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import datetime
+
+from .package_schemas import PackageResponseModel
+from .blog_schemas import BlogResponseModel
+from .destination_schemas import DestinationResponseModel
+
+
+class HomeBundleResponseModel(BaseModel):
+    """Everything the landing page shows, in one response"""
+    # Most popular first
+    packages: List[PackageResponseModel]
+    # Most active packages first
+    destinations: List[DestinationResponseModel]
+    # Featured first, then newest
+    blogs: List[BlogResponseModel]
+    generated_at: datetime
@@ -0,0 +1,82 @@
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Optional, List, Any
+from datetime import datetime
+import uuid
+
+
+def _split_list(value: Any) -> Any:
+    """CSV cells hold lists as "a|b|c"; NDJSON rows may already use arrays"""
+    if isinstance(value, str):
+        return [item.strip() for item in value.split("|") if item.strip()]
+    return value
+
+
+class DestinationImportRowModel(BaseModel):
+    """One destination row of a catalog import"""
+    name: str = Field(min_length=1, max_length=255)
+    country: str = Field(min_length=1, max_length=100)
+    city: str = Field(min_length=1, max_length=100)
+    description: Optional[str] = None
+    best_time_to_visit: Optional[str] = Field(None, max_length=100)
+    featured_image: Optional[str] = Field(None, max_length=500)
+    is_active: bool = True
+
+
+class PackageImportRowModel(BaseModel):
+    """
+    One package row of a catalog import. The destination is given either by id
+    or by destination_name (+ optional destination_country).
+    """
+    title: str = Field(min_length=1, max_length=255)
+    description: str = Field(min_length=1)
+    price: float = Field(gt=0)
+    destination_id: Optional[uuid.UUID] = None
+    destination_name: Optional[str] = None
+    destination_country: Optional[str] = None
+    featured_image: Optional[str] = Field(None, max_length=500)
+    is_featured: bool = False
+    is_active: bool = True
+
+    duration_days: int = Field(gt=0)
+    duration_nights: int = Field(gt=0)
+    max_group_size: Optional[int] = Field(None, gt=0)
+    available_from: Optional[datetime] = None
+    available_until: Optional[datetime] = None
+
+    highlights: Optional[str] = None
+    itinerary: Optional[str] = None
+    inclusions: Optional[str] = None
+    exclusions: Optional[str] = None
+    terms_conditions: Optional[str] = None
+    image_gallery: Optional[List[str]] = Field(None, max_length=20)
+
+    _split_gallery = field_validator("image_gallery", mode="before")(_split_list)
+
+    @field_validator("image_gallery")
+    @classmethod
+    def check_gallery_urls(cls, value):
+        if value and any(len(url) > 500 for url in value):
+            raise ValueError("Image URLs must be at most 500 characters")
+        return value
+
+    @model_validator(mode="after")
+    def check_destination_and_dates(self):
+        if not self.destination_id and not self.destination_name:
+            raise ValueError("Either destination_id or destination_name is required")
+        if self.available_from and self.available_until and self.available_from > self.available_until:
+            raise ValueError("available_from must be before available_until")
+        return self
+
+
+class ImportRowErrorModel(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class ImportReportModel(BaseModel):
+    entity_type: str
+    dry_run: bool
+    total_rows: int
+    imported: int
+    failed: int
+    errors: List[ImportRowErrorModel] = []
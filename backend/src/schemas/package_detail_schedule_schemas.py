@@ -1,8 +1,15 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 import uuid
 
+class ItineraryDayModel(BaseModel):
+    """One day (or day range) parsed from the itinerary text"""
+    day: int
+    end_day: Optional[int] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+
 class PackageDetailScheduleCreateModel(BaseModel):
     package_id: uuid.UUID
     # Details fields
@@ -37,6 +44,8 @@ class PackageDetailScheduleResponseModel(BaseModel):
     inclusions: Optional[str]
     exclusions: Optional[str]
     terms_conditions: Optional[str]
+    itinerary_days: List[ItineraryDayModel] = []
+    inclusion_tags: List[str] = []
     duration_days: int
     duration_nights: int
     max_group_size: Optional[int]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, Dict, Any
 from datetime import datetime
 import uuid
 
@@ -22,6 +22,7 @@ class PackageImageResponseModel(BaseModel):
     id: uuid.UUID
     package_id: uuid.UUID
     image_url: str
+    renditions: Optional[Dict[str, Any]] = None
     alt_text: Optional[str] = None
     display_order: int
     is_primary: bool
@@ -1,10 +1,10 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
 import uuid
 from .package_image_schemas import PackageImageResponseModel
-from .package_detail_schedule_schemas import PackageDetailScheduleResponseModel
+from .package_detail_schedule_schemas import PackageDetailScheduleResponseModel, ItineraryDayModel
 
 
 class PackageCategoryEnum(str, Enum):
@@ -90,10 +90,13 @@ class PackageResponseModel(BaseModel):
     destination_id: uuid.UUID
     # Removed trip_type_id and offer_id
     featured_image: Optional[str] = None
+    featured_image_renditions: Optional[Dict[str, Any]] = None
     is_featured: bool
     is_active: bool
     created_at: datetime
     updated_at: datetime
+    # Compact summary of the inclusions text, e.g. ["airport_transfer", "breakfast"]
+    inclusion_tags: List[str] = []
     
 class PackageDetailResponseModel(BaseModel):
     """Detailed package response with normalized related data"""
@@ -104,6 +107,7 @@ class PackageDetailResponseModel(BaseModel):
     destination_id: uuid.UUID
     # Removed trip_type_id and offer_id
     featured_image: Optional[str] = None
+    featured_image_renditions: Optional[Dict[str, Any]] = None
     is_featured: bool
     is_active: bool
     created_at: datetime
@@ -125,6 +129,8 @@ class PackageDetailResponseModel(BaseModel):
     inclusions: Optional[str] = None
     exclusions: Optional[str] = None
     terms_conditions: Optional[str] = None
+    itinerary_days: List[ItineraryDayModel] = []
+    inclusion_tags: List[str] = []
     image_gallery: Optional[List[str]] = None
     
     class Config:
@@ -138,5 +144,45 @@ class PackageListResponseModel(BaseModel):
     page: int
     limit: int
     total_pages: int
+    # Set on delta responses (?updated_since): ids to remove and the next updated_since
+    deleted_ids: Optional[List[uuid.UUID]] = None
+    watermark: Optional[datetime] = None
 
 
+
+
+class FacetCountModel(BaseModel):
+    """One value of a search facet and the number of matching packages"""
+    value: str
+    label: Optional[str] = None
+    count: int
+
+
+class PriceBucketModel(BaseModel):
+    """One bar of the price histogram; min is inclusive, max exclusive"""
+    min: float
+    max: float
+    count: int
+
+
+class PackageSearchFacetsModel(BaseModel):
+    destinations: List[FacetCountModel] = []
+    countries: List[FacetCountModel] = []
+    durations: List[FacetCountModel] = []
+    prices: List[PriceBucketModel] = []
+
+
+class PackageSearchResponseModel(PackageListResponseModel):
+    """A page of search results with facet counts for the current filters"""
+    facets: PackageSearchFacetsModel
+
+
+class SimilarPackageModel(PackageResponseModel):
+    """A recommended package and its similarity score (0-1)"""
+    score: float
+
+
+class SimilarPackagesResponseModel(BaseModel):
+    package_id: uuid.UUID
+    packages: List[SimilarPackageModel]
+    computed_at: Optional[datetime] = None
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Optional, List, Literal
 from datetime import datetime, date
 import uuid
 
@@ -104,3 +104,194 @@ class PromoCodeValidationResponseModel(BaseModel):
     promo_code_id: Optional[uuid.UUID] = None
     # Removed offer_title field
     remaining_uses: Optional[int] = None
+
+
+class PromoQuoteFilterModel(BaseModel):
+    """Active packages to quote when no ids are given (same filters as the package list)"""
+    search: Optional[str] = None
+    destination_id: Optional[uuid.UUID] = None
+    min_price: Optional[float] = Field(None, ge=0)
+    max_price: Optional[float] = Field(None, ge=0)
+
+
+class PromoQuoteRequestModel(BaseModel):
+    """A promo code applied to many packages; give either package_ids or filter"""
+    code: str = Field(min_length=1, max_length=50)
+    package_ids: Optional[List[uuid.UUID]] = Field(None, min_length=1, max_length=200)
+    filter: Optional[PromoQuoteFilterModel] = None
+    travelers: int = Field(1, ge=1, description="Quote price * travelers, as a booking would")
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.package_ids is None) == (self.filter is None):
+            raise ValueError("Provide either package_ids or filter")
+        return self
+
+
+class PromoQuoteItemModel(BaseModel):
+    package_id: uuid.UUID
+    amount: float
+    discount_amount: float
+    final_amount: float
+
+
+class PromoQuoteResponseModel(BaseModel):
+    is_valid: bool
+    message: str
+    promo_code_id: Optional[uuid.UUID] = None
+    discount_type: Optional[str] = None
+    discount_value: Optional[float] = None
+    minimum_amount: Optional[float] = None
+    maximum_discount: Optional[float] = None
+    quotes: List[PromoQuoteItemModel] = []
+    # Requested ids that are not active packages
+    missing_package_ids: List[uuid.UUID] = []
+
+
+class PromoCampaignCreateModel(BaseModel):
+    """
+    A batch of generated promo codes sharing one set of discount rules. Codes are
+    prefix + code_length random characters from alphabet; by default each code
+    can be redeemed once.
+    """
+    count: int = Field(gt=0, le=100000)
+    prefix: str = Field("", max_length=20, pattern="^[A-Za-z0-9-]*$")
+    code_length: int = Field(10, ge=4, le=30)
+    # No 0/O or 1/I/L, so codes survive being read out or retyped
+    alphabet: str = Field("ABCDEFGHJKMNPQRSTUVWXYZ23456789", min_length=2, max_length=64)
+    description: Optional[str] = None
+    discount_type: str = Field(default="percentage", pattern="^(percentage|fixed)$")
+    discount_value: float = Field(gt=0)
+    minimum_amount: Optional[float] = Field(None, ge=0)
+    maximum_discount: Optional[float] = Field(None, ge=0)
+    start_date: date
+    expiry_date: date
+    usage_limit: Optional[int] = Field(1, ge=1)
+    is_active: bool = True
+
+    @field_validator('prefix', 'alphabet')
+    @classmethod
+    def must_be_uppercase(cls, v):
+        return v.upper().strip()
+
+    @model_validator(mode="after")
+    def check_campaign(self):
+        if self.expiry_date <= self.start_date:
+            raise ValueError('Expiry date must be after start date')
+        if len(set(self.alphabet)) != len(self.alphabet) or not self.alphabet.isalnum():
+            raise ValueError('alphabet must be distinct letters and digits')
+        if len(self.prefix) + self.code_length > 50:
+            raise ValueError('prefix and code_length together must be at most 50 characters')
+        # Keep random collisions rare so few codes need regenerating
+        if len(self.alphabet) ** self.code_length < self.count * 1000:
+            raise ValueError('Too few possible codes for count; use a longer code_length or alphabet')
+        return self
+
+
+class PromoMetricsModel(BaseModel):
+    # Bookings made with the code; conversions are the confirmed/completed ones
+    redemptions: int
+    conversions: int
+    conversion_rate: float
+    # Summed over conversions only
+    discount_given: float
+    revenue: float
+
+
+class PromoPeriodMetricsModel(PromoMetricsModel):
+    period: datetime
+
+
+class PromoCodeAnalyticsModel(BaseModel):
+    promo_code_id: uuid.UUID
+    code: str
+    totals: PromoMetricsModel
+    series: List[PromoPeriodMetricsModel]
+
+
+class PromoAnalyticsResponseModel(BaseModel):
+    date_from: date
+    date_to: date
+    bucket: str
+    metric: str
+    codes: List[PromoCodeAnalyticsModel]
+
+
+class PromoUsageAlertModel(BaseModel):
+    promo_code_id: uuid.UUID
+    code: str
+    usage_limit: int
+    used_count: int
+    remaining_uses: int
+    used_ratio: float
+    expiry_date: date
+    recent_daily_redemptions: float
+    # None when the code had no redemptions in the window
+    days_to_exhaustion: Optional[float] = None
+    exhausted: bool
+
+
+class PromoUsageAlertsResponseModel(BaseModel):
+    threshold: float
+    window_days: int
+    alerts: List[PromoUsageAlertModel]
+
+
+class PromoRuleModel(BaseModel):
+    """Candidate discount rules, evaluated like PromoCode.calculate_discount"""
+    name: Optional[str] = Field(None, max_length=100)
+    discount_type: str = Field(default="percentage", pattern="^(percentage|fixed)$")
+    discount_value: float = Field(gt=0)
+    minimum_amount: Optional[float] = Field(None, ge=0)
+    maximum_discount: Optional[float] = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def check_percentage(self):
+        if self.discount_type == "percentage" and self.discount_value > 100:
+            raise ValueError('Percentage discount cannot exceed 100')
+        return self
+
+
+class PromoSimulationRequestModel(BaseModel):
+    rules: List[PromoRuleModel] = Field(min_length=1, max_length=50)
+    date_from: date
+    date_to: date
+    # Booking statuses replayed; defaults to confirmed and completed bookings
+    statuses: Optional[List[Literal["pending", "confirmed", "cancelled", "completed", "refunded"]]] = Field(None, min_length=1)
+    histogram_bins: int = Field(10, ge=1, le=100)
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.date_from > self.date_to:
+            raise ValueError('date_from must not be after date_to')
+        return self
+
+
+class PromoDiscountDistributionModel(BaseModel):
+    # Over affected bookings only
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+    # counts[i] bookings got a discount in [bin_edges[i], bin_edges[i + 1])
+    bin_edges: List[float]
+    counts: List[int]
+
+
+class PromoSimulationResultModel(BaseModel):
+    rule: PromoRuleModel
+    total_discount: float
+    affected_bookings: int
+    affected_ratio: float
+    net_amount: float
+    distribution: PromoDiscountDistributionModel
+
+
+class PromoSimulationResponseModel(BaseModel):
+    date_from: date
+    date_to: date
+    booking_count: int
+    # Booking amounts before any promo code discount
+    gross_amount: float
+    results: List[PromoSimulationResultModel]
@@ -0,0 +1,42 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Literal
+import uuid
+
+
+class SignedUploadRequestModel(BaseModel):
+    entity_type: Literal["package", "destination", "blog"]
+    content_type: Literal["image/jpeg", "image/png", "image/gif", "image/webp"]
+    size: int = Field(gt=0)
+    # Hex SHA-256 of the file, computed by the client. When given, the object is
+    # stored under its content address and an existing copy is reused.
+    sha256: Optional[str] = Field(None, pattern=r"^[0-9a-f]{64}$")
+
+
+class SignedUploadResponseModel(BaseModel):
+    bucket: str
+    key: str
+    public_url: str
+    already_exists: bool = False
+    method: str = "PUT"
+    upload_url: Optional[str] = None
+    token: Optional[str] = None
+    expires_at: Optional[int] = None
+    headers: dict = {}
+
+
+class FinalizeUploadRequestModel(BaseModel):
+    entity_type: Literal["package", "destination", "blog"]
+    entity_id: uuid.UUID
+    key: str = Field(min_length=1, max_length=255)
+    # featured (package/destination), cover (blog) or gallery (package)
+    target: Literal["featured", "cover", "gallery"]
+    alt_text: Optional[str] = Field(None, max_length=255)
+    is_primary: bool = False
+
+
+class FinalizeUploadResponseModel(BaseModel):
+    entity_type: str
+    entity_id: uuid.UUID
+    target: str
+    image_url: str
+    image_id: Optional[uuid.UUID] = None
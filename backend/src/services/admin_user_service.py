@@ -1,11 +1,14 @@
 from typing import Optional, List, Dict, Any
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, func
+from sqlmodel import select, func, update
 from datetime import datetime
 import uuid
 
 from ..auth.models import User
 from ..auth.schemas import UserUpdateModel
+from ..schemas.bulk_schemas import UserBulkStatusModel, BulkOperationResponseModel
+from ..utils.sql_utils import matches_any
+from .catalog_events import notify_change
 
 
 class AdminUserService:
@@ -120,6 +123,43 @@ class AdminUserService:
         
         return True
     
+    async def bulk_set_active(
+        self,
+        session: AsyncSession,
+        changes: UserBulkStatusModel
+    ) -> BulkOperationResponseModel:
+        """Activate or deactivate every selected user with one UPDATE"""
+        statement = update(User).where(User.is_active != changes.is_active).values(
+            is_active=changes.is_active,
+            updated_at=datetime.now()
+        )
+        
+        if changes.ids is not None:
+            statement = statement.where(matches_any(User.uid, changes.ids))
+        else:
+            if changes.filter.is_active is not None:
+                statement = statement.where(User.is_active == changes.filter.is_active)
+            if changes.filter.search:
+                search_term = f"%{changes.filter.search}%"
+                statement = statement.where(
+                    (User.full_name.ilike(search_term)) |
+                    (User.email.ilike(search_term))
+                )
+        
+        try:
+            result = await session.execute(
+                statement.returning(User.uid).execution_options(synchronize_session=False)
+            )
+            updated = result.scalars().all()
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        
+        await notify_change("user", updated)
+        action = "Activated" if changes.is_active else "Deactivated"
+        return BulkOperationResponseModel(affected=len(updated), message=f"{action} {len(updated)} user(s)")
+    
     async def update_user(
         self,
         session: AsyncSession,
@@ -1,9 +1,14 @@
 from typing import Optional, List, Dict, Any
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, func
+from sqlmodel import select, func, update
 from fastapi import HTTPException, UploadFile
 from ..models.blog import Blog
-from ..schemas.blog_schemas import BlogCreateModel, BlogUpdateModel
+from ..schemas.blog_schemas import BlogCreateModel, BlogUpdateModel, BlogDetailResponseModel
+from ..schemas.bulk_schemas import BlogBulkPublishModel, BulkOperationResponseModel
+from ..utils.sql_utils import matches_any
+from .catalog_events import notify_change
+from .detail_cache import detail_cache
+from .sync_service import sync_service
 from .supabase_service import supabase_service
 import uuid
 
@@ -99,6 +104,28 @@ class BlogService:
             # Invalid UUID format
             return None
     
+    async def get_blogs_by_ids(
+        self,
+        session: AsyncSession,
+        blog_ids: List[uuid.UUID]
+    ) -> Dict[uuid.UUID, BlogDetailResponseModel]:
+        """Blogs with author names keyed by id for the ids that exist, cached ones first, the rest in one query"""
+        from src.auth.models import User
+        
+        blog_ids = list(dict.fromkeys(blog_ids))
+        blogs = await detail_cache.get_many("blog", blog_ids, BlogDetailResponseModel)
+        missing = [blog_id for blog_id in blog_ids if blog_id not in blogs]
+        if missing:
+            query = select(Blog, User.full_name).join(User, Blog.author_id == User.uid).where(
+                matches_any(Blog.id, missing)
+            )
+            loaded = {}
+            for blog, author_name in (await session.exec(query)).all():
+                loaded[blog.id] = BlogDetailResponseModel.model_validate({**blog.model_dump(), 'author_name': author_name})
+            await detail_cache.set_many("blog", loaded)
+            blogs.update(loaded)
+        return blogs
+    
     async def create_blog(
         self, 
         session: AsyncSession, 
@@ -123,6 +150,7 @@ class BlogService:
         session.add(new_blog)
         await session.commit()
         await session.refresh(new_blog)
+        await notify_change("blog", [new_blog.id])
         
         return new_blog
     
@@ -149,17 +177,21 @@ class BlogService:
             # Upload new image
             new_cover_image_url = await supabase_service.upload_blog_image(cover_image)
             blog.cover_image = new_cover_image_url
+            blog.cover_image_renditions = None
         
         # Update blog fields
         update_data = blog_data.model_dump(exclude_unset=True, exclude_none=True)
         for field, value in update_data.items():
             if hasattr(blog, field):
                 setattr(blog, field, value)
+        if 'cover_image' in update_data:
+            blog.cover_image_renditions = None
         
         # Save changes
         session.add(blog)
         await session.commit()
         await session.refresh(blog)
+        await notify_change("blog", [blog.id])
         
         return blog
     
@@ -175,8 +207,11 @@ class BlogService:
             await supabase_service.delete_blog_image(blog.cover_image)
         
         # Delete blog from database
+        deleted_id = blog.id
         await session.delete(blog)
+        await sync_service.record_deletions(session, "blog", [deleted_id])
         await session.commit()
+        await notify_change("blog", [deleted_id])
         
         return True
     
@@ -199,9 +234,57 @@ class BlogService:
         session.add(blog)
         await session.commit()
         await session.refresh(blog)
+        await notify_change("blog", [blog.id])
         
         return blog
     
+    async def bulk_set_publish_status(
+        self,
+        session: AsyncSession,
+        changes: BlogBulkPublishModel
+    ) -> BulkOperationResponseModel:
+        """Publish or unpublish every selected blog with one UPDATE"""
+        from ..models.blog import BlogStatus
+        from datetime import datetime
+        
+        if changes.publish:
+            statement = update(Blog).where(Blog.status != BlogStatus.PUBLISHED).values(
+                status=BlogStatus.PUBLISHED,
+                published_at=func.coalesce(Blog.published_at, datetime.now()),
+                updated_at=datetime.now()
+            )
+        else:
+            statement = update(Blog).where(Blog.status == BlogStatus.PUBLISHED).values(
+                status=BlogStatus.DRAFT,
+                published_at=None,
+                updated_at=datetime.now()
+            )
+        
+        if changes.ids is not None:
+            statement = statement.where(matches_any(Blog.id, changes.ids))
+        else:
+            blog_filter = changes.filter
+            if blog_filter.search:
+                statement = statement.where(Blog.title.contains(blog_filter.search))
+            if blog_filter.category:
+                statement = statement.where(Blog.category == blog_filter.category)
+            if blog_filter.status:
+                statement = statement.where(Blog.status == blog_filter.status)
+        
+        try:
+            result = await session.execute(
+                statement.returning(Blog.id).execution_options(synchronize_session=False)
+            )
+            updated = result.scalars().all()
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        
+        await notify_change("blog", updated)
+        action = "Published" if changes.publish else "Unpublished"
+        return BulkOperationResponseModel(affected=len(updated), message=f"{action} {len(updated)} blog(s)")
+    
     async def get_blog_stats(self, session: AsyncSession) -> Dict[str, Any]:
         """Get blog statistics for admin dashboard"""
         from ..models.blog import BlogStatus
@@ -1,16 +1,58 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, func
-from datetime import datetime
+from sqlmodel import select, func, update
+from sqlalchemy import cast, String
+from datetime import datetime, date, time, timedelta
 from decimal import Decimal
+import csv
+import io
+import json
 import uuid
 
 from ..models.booking import Booking
 from ..schemas.booking_schemas import BookingCreateModel, BookingUpdateModel, BookingResponseModel, BookingStatusUpdateModel
+from ..schemas.bulk_schemas import BookingBulkStatusModel, BulkOperationResponseModel
+from ..utils.sql_utils import matches_any
+from .catalog_events import notify_change
 from .promo_code_service import PromoCodeService
 
 
 class BookingService:
+    def _apply_booking_filters(
+        self,
+        statement,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        user_id: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ):
+        """Apply the admin booking list filters (statement must join User and Package)"""
+        from ..auth.models import User
+        from ..models.package import Package
+        
+        if status:
+            statement = statement.where(Booking.status == status)
+        
+        if user_id:
+            statement = statement.where(Booking.user_id == user_id)
+        
+        # Dates are inclusive calendar days on the booking date
+        if date_from:
+            statement = statement.where(Booking.booking_date >= datetime.combine(date_from, time.min))
+        if date_to:
+            statement = statement.where(Booking.booking_date < datetime.combine(date_to + timedelta(days=1), time.min))
+        
+        if search:
+            # Search in booking ID, package title, or user name
+            statement = statement.where(
+                cast(Booking.id, String).ilike(f"%{search}%") |
+                Package.title.ilike(f"%{search}%") |
+                User.full_name.ilike(f"%{search}%")
+            )
+        
+        return statement
+    
     async def get_bookings(
         self,
         session: AsyncSession,
@@ -18,7 +60,9 @@ class BookingService:
         limit: int = 10,
         search: Optional[str] = None,
         status: Optional[str] = None,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
     ) -> Dict[str, Any]:
         """Get paginated list of bookings with filtering and joined data"""
         from ..auth.models import User
@@ -31,26 +75,17 @@ class BookingService:
             Package, Booking.package_id == Package.id
         )
         
-        count_statement = select(func.count(Booking.id))
+        # The count needs the same joins, since search filters on package and user columns
+        count_statement = select(func.count(Booking.id)).select_from(Booking).join(
+            User, Booking.user_id == User.uid
+        ).join(
+            Package, Booking.package_id == Package.id
+        )
         
         # Add filters to both statements
-        if status:
-            statement = statement.where(Booking.status == status)
-            count_statement = count_statement.where(Booking.status == status)
-        
-        if user_id:
-            statement = statement.where(Booking.user_id == user_id)
-            count_statement = count_statement.where(Booking.user_id == user_id)
-        
-        if search:
-            # Search in booking ID, package title, or user name
-            search_condition = (
-                Booking.id.ilike(f"%{search}%") |
-                Package.title.ilike(f"%{search}%") |
-                User.full_name.ilike(f"%{search}%")
-            )
-            statement = statement.where(search_condition)
-            count_statement = count_statement.where(search_condition)
+        filters = dict(search=search, status=status, user_id=user_id, date_from=date_from, date_to=date_to)
+        statement = self._apply_booking_filters(statement, **filters)
+        count_statement = self._apply_booking_filters(count_statement, **filters)
         
         total_result = await session.exec(count_statement)
         total = total_result.first() or 0
@@ -320,6 +355,45 @@ class BookingService:
         
         return booking
     
+    async def bulk_update_status(
+        self,
+        session: AsyncSession,
+        changes: BookingBulkStatusModel
+    ) -> BulkOperationResponseModel:
+        """Set the status of every selected booking with one UPDATE"""
+        from ..auth.models import User
+        from ..models.package import Package
+        
+        statement = update(Booking).values(status=changes.status.value, updated_at=func.now())
+        if changes.ids is not None:
+            statement = statement.where(matches_any(Booking.id, changes.ids))
+        else:
+            # The list filters search joined columns, so select the ids in a subquery
+            selected = self._apply_booking_filters(
+                select(Booking.id)
+                .join(User, Booking.user_id == User.uid)
+                .join(Package, Booking.package_id == Package.id),
+                **changes.filter.model_dump()
+            )
+            statement = statement.where(Booking.id.in_(selected))
+        statement = statement.where(Booking.status != changes.status.value)
+        
+        try:
+            result = await session.execute(
+                statement.returning(Booking.id).execution_options(synchronize_session=False)
+            )
+            updated = result.scalars().all()
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        
+        await notify_change("booking", updated)
+        return BulkOperationResponseModel(
+            affected=len(updated),
+            message=f"Updated {len(updated)} booking(s) to {changes.status.value}"
+        )
+    
     async def delete_booking(self, session: AsyncSession, booking_id: str) -> bool:
         """Delete a booking"""
         
@@ -513,6 +587,93 @@ class BookingService:
             "users_updated": updated_count,
             "message": f"Synced booking counts for {updated_count} out of {total_users} users"
         }
+    
+    async def stream_bookings_export(
+        self,
+        fmt: str = "csv",
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        user_id: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        yield_per: int = 1000
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream bookings joined with user and package as CSV or NDJSON chunks.
+        
+        Rows come from a server-side cursor and plain columns are selected (not
+        ORM entities), so memory stays flat however many bookings match. The
+        generator opens its own session because it runs after the request's
+        dependencies have been closed.
+        """
+        from ..auth.models import User
+        from ..models.package import Package
+        from ..db.main import async_session_maker
+        
+        statement = select(
+            Booking.id.label("booking_id"),
+            Booking.created_at,
+            Booking.booking_date,
+            Booking.status,
+            Booking.payment_status,
+            Booking.total_amount,
+            Booking.paid_amount,
+            Booking.discount_amount,
+            Booking.promo_code_id,
+            Booking.cancellation_date,
+            Booking.cancellation_reason,
+            Booking.user_id,
+            User.full_name.label("user_full_name"),
+            User.email.label("user_email"),
+            User.phone.label("user_phone"),
+            Booking.package_id,
+            Package.title.label("package_title"),
+            Package.price.label("package_price"),
+        ).join(
+            User, Booking.user_id == User.uid
+        ).join(
+            Package, Booking.package_id == Package.id
+        )
+        statement = self._apply_booking_filters(
+            statement, search=search, status=status, user_id=user_id, date_from=date_from, date_to=date_to
+        ).order_by(Booking.created_at.desc(), Booking.id)
+        
+        columns = [column.name for column in statement.selected_columns]
+        
+        def format_value(value):
+            if value is None:
+                return None
+            if isinstance(value, (datetime, date)):
+                return value.isoformat()
+            if isinstance(value, Decimal):
+                return float(value)
+            if isinstance(value, uuid.UUID):
+                return str(value)
+            return value
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            writer.writerow(columns)
+        
+        async with async_session_maker() as session:
+            result = await session.stream(statement.execution_options(yield_per=yield_per))
+            async for row in result:
+                values = [format_value(value) for value in row]
+                if fmt == "csv":
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(columns, values))))
+                    buffer.write("\n")
+                
+                # Flush in ~64 KB chunks rather than per row
+                if buffer.tell() >= 65536:
+                    yield buffer.getvalue().encode("utf-8")
+                    buffer.seek(0)
+                    buffer.truncate()
+        
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
 
 
 # Create singleton instance
@@ -0,0 +1,33 @@
+"""
+In-process hooks fired after catalog data changes in bulk.
+
+Services call notify_change() once their transaction has committed; caches and
+other derived data register a handler with on_change() to drop stale entries.
+"""
+import uuid
+from typing import Awaitable, Callable, Dict, Iterable, List
+
+# entity type ("package", "destination", "blog", "booking", "user") -> handlers
+ChangeHandler = Callable[[str, List[uuid.UUID]], Awaitable[None]]
+_handlers: Dict[str, List[ChangeHandler]] = {}
+
+
+def on_change(*entity_types: str):
+    """Register an async handler called with (entity_type, ids) after a change"""
+    def decorator(handler: ChangeHandler) -> ChangeHandler:
+        for entity_type in entity_types:
+            _handlers.setdefault(entity_type, []).append(handler)
+        return handler
+    return decorator
+
+
+async def notify_change(entity_type: str, ids: Iterable[uuid.UUID]) -> None:
+    """Run the handlers for entity_type; a failing handler never fails the caller"""
+    ids = list(ids)
+    if not ids:
+        return
+    for handler in _handlers.get(entity_type, []):
+        try:
+            await handler(entity_type, ids)
+        except Exception as e:
+            print(f"Change handler {handler.__name__} failed for {entity_type}: {str(e)}")
@@ -0,0 +1,451 @@
+"""
+Bulk import of destinations and packages from CSV or NDJSON files.
+
+Rows are parsed and validated in batches while the file is read, and each
+batch of valid rows is written with multi-row INSERTs in its own transaction.
+Rows that would break a unique constraint (against the database or an earlier
+row of the same file) are reported per row, in dry runs too; inserts skip
+conflicts that slip in concurrently and report those rows as well.
+"""
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from itertools import islice
+from typing import Optional, List, Dict, Any, Tuple, Iterator, AsyncIterator, Type, Set, Callable
+from fastapi import UploadFile
+from pydantic import BaseModel, ValidationError
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import select, func
+from sqlalchemy import insert, Table, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from starlette.concurrency import run_in_threadpool
+
+from ..models.package import Package
+from ..models.package_image import PackageImage
+from ..models.package_detail_schedule import PackageDetailSchedule
+from ..models.destination import Destination
+from ..schemas.import_schemas import (
+    DestinationImportRowModel,
+    PackageImportRowModel,
+    ImportRowErrorModel,
+    ImportReportModel
+)
+from .catalog_events import notify_change
+from ..utils.package_content import parse_itinerary, extract_inclusion_tags
+
+
+# asyncpg accepts at most 32767 bind parameters per statement
+MAX_BIND_PARAMS = 30000
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+
+# (row number, raw row or None, parse error or None)
+RawRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+# (row number, validated row)
+ValidRow = Tuple[int, BaseModel]
+
+
+class CatalogImportService:
+    """Streams, validates and batch-inserts catalog rows"""
+
+    def detect_format(self, filename: Optional[str], requested: Optional[str] = None) -> str:
+        """Use the requested format, falling back to the file extension"""
+        fmt = (requested or "").lower()
+        if not fmt and filename:
+            extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+            fmt = {"csv": "csv", "ndjson": "ndjson", "jsonl": "ndjson"}.get(extension, "")
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError("Unsupported import format. Use csv or ndjson.")
+        return fmt
+
+    def _iter_rows(self, binary, fmt: str) -> Iterator[RawRow]:
+        """Parse the file lazily; row numbers are line numbers in the file"""
+        text = io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+        try:
+            if fmt == "csv":
+                reader = csv.DictReader(text)
+                for row in reader:
+                    if None in row:
+                        yield reader.line_num, None, "Row has more cells than the header"
+                        continue
+                    yield reader.line_num, row, None
+            else:
+                for line_number, line in enumerate(text, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        value = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield line_number, None, f"Invalid JSON: {e.msg}"
+                        continue
+                    if not isinstance(value, dict):
+                        yield line_number, None, "Each line must be a JSON object"
+                        continue
+                    yield line_number, value, None
+        finally:
+            # Leave the upload's file open for its owner
+            text.detach()
+
+    async def _read_batches(self, file: UploadFile, fmt: str, batch_size: int) -> AsyncIterator[List[RawRow]]:
+        """Pull batches of parsed rows off the upload without loading it whole"""
+        await file.seek(0)
+        rows = self._iter_rows(file.file, fmt)
+        while True:
+            try:
+                batch = await run_in_threadpool(lambda: list(islice(rows, batch_size)))
+            except (csv.Error, UnicodeDecodeError) as e:
+                raise ValueError(f"Could not parse file: {str(e)}")
+            if not batch:
+                return
+            yield batch
+
+    def _clean(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Trim header names and treat empty cells as missing so defaults apply"""
+        cleaned = {}
+        for key, value in raw.items():
+            if key is None:
+                continue
+            if isinstance(value, str):
+                value = value.strip()
+                if value == "":
+                    continue
+            if value is None:
+                continue
+            cleaned[key.strip()] = value
+        return cleaned
+
+    def _validation_messages(self, error: ValidationError) -> List[str]:
+        messages = []
+        for detail in error.errors():
+            location = ".".join(str(part) for part in detail["loc"])
+            messages.append(f"{location}: {detail['msg']}" if location else detail["msg"])
+        return messages
+
+    async def _insert_many(self, session: AsyncSession, table: Table, rows: List[Dict[str, Any]]) -> None:
+        """Multi-row INSERT, split so each statement stays under the bind parameter limit"""
+        if not rows:
+            return
+        per_statement = max(1, MAX_BIND_PARAMS // len(rows[0]))
+        for start in range(0, len(rows), per_statement):
+            await session.execute(insert(table).values(rows[start:start + per_statement]))
+
+    async def _insert_new(
+        self,
+        session: AsyncSession,
+        table: Table,
+        rows: List[Dict[str, Any]],
+        constraint: str
+    ) -> Set[uuid.UUID]:
+        """
+        Multi-row INSERT ... ON CONFLICT (constraint) DO NOTHING RETURNING id,
+        split like _insert_many; returns the ids actually inserted
+        """
+        inserted = set()
+        if not rows:
+            return inserted
+        per_statement = max(1, MAX_BIND_PARAMS // len(rows[0]))
+        for start in range(0, len(rows), per_statement):
+            statement = pg_insert(table).values(rows[start:start + per_statement]).on_conflict_do_nothing(
+                constraint=constraint
+            ).returning(table.c.id)
+            inserted.update((await session.execute(statement)).scalars().all())
+        return inserted
+
+    async def _drop_duplicates(
+        self,
+        session: AsyncSession,
+        rows: List[ValidRow],
+        errors: List[ImportRowErrorModel],
+        unique_key: Callable[[Any], tuple],
+        existing_keys,
+        seen_keys: Set[tuple],
+        entity_type: str
+    ) -> List[ValidRow]:
+        """
+        Report rows whose unique key already exists, in the database (one query
+        per batch) or on an earlier row of the file, and keep the rest
+        """
+        keys = {unique_key(row) for _, row in rows}
+        existing = await existing_keys(session, keys - seen_keys)
+        kept = []
+        for row_number, row in rows:
+            key = unique_key(row)
+            if key in existing:
+                errors.append(ImportRowErrorModel(row=row_number, errors=[f"A {entity_type} with these values already exists"]))
+            elif key in seen_keys:
+                errors.append(ImportRowErrorModel(row=row_number, errors=[f"Duplicates an earlier {entity_type} row in this file"]))
+            else:
+                seen_keys.add(key)
+                kept.append((row_number, row))
+        return kept
+
+    async def _run(
+        self,
+        session: AsyncSession,
+        file: UploadFile,
+        fmt: str,
+        entity_type: str,
+        row_model: Type[BaseModel],
+        resolve,
+        unique_key: Callable[[Any], tuple],
+        existing_keys,
+        write,
+        dry_run: bool,
+        batch_size: int
+    ) -> ImportReportModel:
+        """
+        Validate and write an import batch by batch, collecting per-row errors.
+        write returns {row number: id} of the rows it inserted; the others conflicted.
+        """
+        report = ImportReportModel(
+            entity_type=entity_type,
+            dry_run=dry_run,
+            total_rows=0,
+            imported=0,
+            failed=0
+        )
+        seen_keys: Set[tuple] = set()
+
+        async for batch in self._read_batches(file, fmt, batch_size):
+            valid = []
+            for row_number, raw, parse_error in batch:
+                report.total_rows += 1
+                if parse_error:
+                    report.errors.append(ImportRowErrorModel(row=row_number, errors=[parse_error]))
+                    continue
+                try:
+                    valid.append((row_number, row_model.model_validate(self._clean(raw))))
+                except ValidationError as e:
+                    report.errors.append(ImportRowErrorModel(row=row_number, errors=self._validation_messages(e)))
+
+            if resolve and valid:
+                valid = await resolve(session, valid, report.errors)
+            if valid:
+                valid = await self._drop_duplicates(
+                    session, valid, report.errors, unique_key, existing_keys, seen_keys, entity_type
+                )
+
+            if not valid:
+                continue
+            if dry_run:
+                report.imported += len(valid)
+                continue
+
+            try:
+                inserted = await write(session, valid)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                print(f"Import batch failed: {str(e)}")
+                for row_number, _ in valid:
+                    report.errors.append(ImportRowErrorModel(
+                        row=row_number,
+                        errors=[f"Batch insert failed: {str(e).splitlines()[0]}"]
+                    ))
+                continue
+
+            report.imported += len(inserted)
+            for row_number, _ in valid:
+                if row_number not in inserted:
+                    # Written concurrently after the duplicate check
+                    report.errors.append(ImportRowErrorModel(
+                        row=row_number,
+                        errors=[f"A {entity_type} with these values already exists"]
+                    ))
+            await notify_change(entity_type, inserted.values())
+
+        report.errors.sort(key=lambda error: error.row)
+        report.failed = len(report.errors)
+        return report
+
+    async def import_destinations(
+        self,
+        session: AsyncSession,
+        file: UploadFile,
+        admin_id: str,
+        fmt: Optional[str] = None,
+        dry_run: bool = False,
+        batch_size: int = 500
+    ) -> ImportReportModel:
+        """Import destinations from a CSV/NDJSON upload"""
+        fmt = self.detect_format(file.filename, fmt)
+        created_by = uuid.UUID(str(admin_id))
+
+        def unique_key(row: DestinationImportRowModel) -> tuple:
+            # unique_destination_name_location
+            return (row.name, row.city, row.country)
+
+        async def existing_keys(session: AsyncSession, keys: Set[tuple]) -> Set[tuple]:
+            if not keys:
+                return set()
+            columns = (Destination.name, Destination.city, Destination.country)
+            found = await session.exec(select(*columns).where(tuple_(*columns).in_(keys)))
+            return {tuple(row) for row in found.all()}
+
+        async def write(session: AsyncSession, rows: List[Tuple[int, DestinationImportRowModel]]) -> Dict[int, uuid.UUID]:
+            now = datetime.now()
+            ids = {row_number: uuid.uuid4() for row_number, _ in rows}
+            inserted = await self._insert_new(session, Destination.__table__, [
+                {
+                    "id": ids[row_number],
+                    "name": row.name,
+                    "country": row.country,
+                    "city": row.city,
+                    "description": row.description,
+                    "best_time_to_visit": row.best_time_to_visit,
+                    "featured_image": row.featured_image,
+                    "is_active": row.is_active,
+                    "created_by": created_by,
+                    "created_at": now,
+                    "updated_at": now
+                }
+                for row_number, row in rows
+            ], "unique_destination_name_location")
+            return {row_number: entity_id for row_number, entity_id in ids.items() if entity_id in inserted}
+
+        return await self._run(
+            session, file, fmt, "destination", DestinationImportRowModel,
+            None, unique_key, existing_keys, write, dry_run, batch_size
+        )
+
+    async def import_packages(
+        self,
+        session: AsyncSession,
+        file: UploadFile,
+        admin_id: str,
+        fmt: Optional[str] = None,
+        dry_run: bool = False,
+        batch_size: int = 500
+    ) -> ImportReportModel:
+        """Import packages, with their detail/schedule and gallery, from a CSV/NDJSON upload"""
+        fmt = self.detect_format(file.filename, fmt)
+        created_by = uuid.UUID(str(admin_id))
+        # (lower name, lower country or "") -> destination ids, shared across batches
+        destinations_by_name: Dict[Tuple[str, str], List[uuid.UUID]] = {}
+        known_destination_ids = set()
+
+        async def resolve(
+            session: AsyncSession,
+            rows: List[Tuple[int, PackageImportRowModel]],
+            errors: List[ImportRowErrorModel]
+        ) -> List[Tuple[int, PackageImportRowModel]]:
+            """Resolve destinations for a batch with at most two queries"""
+            ids = {row.destination_id for _, row in rows if row.destination_id} - known_destination_ids
+            if ids:
+                found = await session.exec(select(Destination.id).where(Destination.id.in_(ids)))
+                known_destination_ids.update(found.all())
+
+            names = {
+                row.destination_name.lower() for _, row in rows
+                if not row.destination_id and (row.destination_name.lower(), "") not in destinations_by_name
+            }
+            if names:
+                found = await session.exec(
+                    select(Destination.id, Destination.name, Destination.country)
+                    .where(func.lower(Destination.name).in_(names))
+                )
+                for destination_id, name, country in found.all():
+                    destinations_by_name.setdefault((name.lower(), country.lower()), []).append(destination_id)
+                    destinations_by_name.setdefault((name.lower(), ""), []).append(destination_id)
+                for name in names:
+                    destinations_by_name.setdefault((name, ""), [])
+
+            resolved = []
+            for row_number, row in rows:
+                if row.destination_id:
+                    if row.destination_id not in known_destination_ids:
+                        errors.append(ImportRowErrorModel(row=row_number, errors=["destination_id: Destination not found"]))
+                        continue
+                else:
+                    key = (row.destination_name.lower(), (row.destination_country or "").lower())
+                    matches = destinations_by_name.get(key, [])
+                    if not matches:
+                        errors.append(ImportRowErrorModel(row=row_number, errors=["destination_name: Destination not found"]))
+                        continue
+                    if len(matches) > 1:
+                        errors.append(ImportRowErrorModel(
+                            row=row_number,
+                            errors=["destination_name: Matches several destinations, add destination_country"]
+                        ))
+                        continue
+                    row.destination_id = matches[0]
+                resolved.append((row_number, row))
+            return resolved
+
+        def unique_key(row: PackageImportRowModel) -> tuple:
+            # unique_title_per_destination
+            return (row.title, row.destination_id)
+
+        async def existing_keys(session: AsyncSession, keys: Set[tuple]) -> Set[tuple]:
+            if not keys:
+                return set()
+            columns = (Package.title, Package.destination_id)
+            found = await session.exec(select(*columns).where(tuple_(*columns).in_(keys)))
+            return {tuple(row) for row in found.all()}
+
+        async def write(session: AsyncSession, rows: List[Tuple[int, PackageImportRowModel]]) -> Dict[int, uuid.UUID]:
+            now = datetime.now()
+            ids = {row_number: uuid.uuid4() for row_number, _ in rows}
+            packages, schedules, images = [], [], []
+            for row_number, row in rows:
+                package_id = ids[row_number]
+                packages.append({
+                    "id": package_id,
+                    "title": row.title,
+                    "description": row.description,
+                    "price": row.price,
+                    "destination_id": row.destination_id,
+                    "created_by": created_by,
+                    "featured_image": row.featured_image,
+                    "is_featured": row.is_featured,
+                    "is_active": row.is_active,
+                    "created_at": now,
+                    "updated_at": now
+                })
+                schedules.append({
+                    "package_id": package_id,
+                    "highlights": row.highlights,
+                    "itinerary": row.itinerary,
+                    "inclusions": row.inclusions,
+                    "exclusions": row.exclusions,
+                    "terms_conditions": row.terms_conditions,
+                    "itinerary_days": parse_itinerary(row.itinerary),
+                    "inclusion_tags": extract_inclusion_tags(row.inclusions),
+                    "duration_days": row.duration_days,
+                    "duration_nights": row.duration_nights,
+                    "max_group_size": row.max_group_size,
+                    "available_from": row.available_from,
+                    "available_until": row.available_until,
+                    "created_at": now,
+                    "updated_at": now
+                })
+                for i, image_url in enumerate(row.image_gallery or []):
+                    images.append({
+                        "id": uuid.uuid4(),
+                        "package_id": package_id,
+                        "image_url": image_url,
+                        "alt_text": None,
+                        "display_order": i,
+                        "is_primary": i == 0,  # Match create_package: first image is primary
+                        "created_at": now
+                    })
+
+            inserted = await self._insert_new(session, Package.__table__, packages, "unique_title_per_destination")
+            # Children only for the packages that were not skipped as conflicts
+            await self._insert_many(session, PackageDetailSchedule.__table__, [
+                schedule for schedule in schedules if schedule["package_id"] in inserted
+            ])
+            await self._insert_many(session, PackageImage.__table__, [
+                image for image in images if image["package_id"] in inserted
+            ])
+            return {row_number: package_id for row_number, package_id in ids.items() if package_id in inserted}
+
+        return await self._run(
+            session, file, fmt, "package", PackageImportRowModel,
+            resolve, unique_key, existing_keys, write, dry_run, batch_size
+        )
+
+
+catalog_import_service = CatalogImportService()
@@ -0,0 +1,327 @@
+"""
+Static publishing of the public catalog.
+
+Renders the documents the public catalog endpoints serve (package, destination
+and blog details plus their paginated lists) and sitemap.xml into a storage
+bucket, so a CDN or Next.js ISR can serve the catalog without calling the API.
+
+Keys are flat, as the storage backends expect:
+  package-<id>.json, destination-<id>.json, blog-<id>.json
+  packages-page-<n>.json, destinations-page-<n>.json, blogs-page-<n>.json
+  sitemap.xml (a sitemap index over sitemap-<n>.xml past 50,000 URLs)
+  manifest.json
+
+manifest.json holds the watermark of the last run. The next run re-renders
+only rows whose updated_at moved after it and removes the documents of rows
+that were hidden or deleted (catalog_deletions), like the delta sync does; a
+missing or expired manifest means a full run.
+"""
+import asyncio
+import json
+import tempfile
+import uuid
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Set, Tuple
+from xml.sax.saxutils import escape
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import literal, union_all
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import Config
+from ..models.blog import Blog, BlogStatus
+from ..models.destination import Destination
+from ..models.package import Package
+from .blog_service import blog_service
+from .destination_service import destination_service
+from .detail_cache import detail_cache
+from .package_service import package_service
+from .storage_backends import StorageBackend
+from .storage_service import storage_service
+from .sync_service import sync_service
+
+
+PUBLISHED_ENTITY_TYPES = ("package", "destination", "blog")
+
+MANIFEST_KEY = "manifest.json"
+SITEMAP_KEY = "sitemap.xml"
+# Sitemap protocol limit per file
+SITEMAP_MAX_URLS = 50000
+SITEMAP_FETCH_SIZE = 1000
+RENDER_BATCH_SIZE = 100
+LIST_PAGE_SIZE = 1000
+
+# Public site paths: (entity type, path of its list page and detail pages)
+SITE_SECTIONS = [("package", "packages"), ("destination", "destinations"), ("blog", "blogs")]
+
+URLSET_OPEN = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = '</urlset>\n'
+
+
+class CatalogPublisher:
+    """Writes catalog documents to a bucket of a storage backend"""
+
+    def __init__(self, backend: Optional[StorageBackend] = None, bucket: Optional[str] = None):
+        self.backend = backend or storage_service.backend
+        self.bucket = bucket or Config.CATALOG_PUBLISH_BUCKET
+
+    def _detail_key(self, entity_type: str, entity_id: uuid.UUID) -> str:
+        return f"{entity_type}-{entity_id}.json"
+
+    def _page_key(self, entity_type: str, page: int) -> str:
+        return f"{entity_type}s-page-{page}.json"
+
+    def _visible(self, entity_type: str):
+        """(model, condition) of the rows the public endpoints show"""
+        if entity_type == "package":
+            return Package, Package.is_active == True
+        if entity_type == "destination":
+            return Destination, Destination.is_active == True
+        return Blog, Blog.status == BlogStatus.PUBLISHED
+
+    async def _write_json(self, key: str, document: Any) -> None:
+        # Same encoding FastAPI applies to the route responses
+        content = json.dumps(jsonable_encoder(document)).encode()
+        await self.backend.upload_bytes(self.bucket, key, content, "application/json")
+
+    async def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(await self.backend.download(self.bucket, MANIFEST_KEY))
+        except Exception:
+            return None
+
+    async def _list_keys(self) -> List[str]:
+        keys = []
+        offset = 0
+        while True:
+            page = await self.backend.list(self.bucket, limit=LIST_PAGE_SIZE, offset=offset)
+            keys.extend(item["name"] for item in page if item.get("name"))
+            if len(page) < LIST_PAGE_SIZE:
+                return keys
+            offset += LIST_PAGE_SIZE
+
+    async def _visible_ids(self, session: AsyncSession, entity_type: str) -> List[uuid.UUID]:
+        model, visible = self._visible(entity_type)
+        return list((await session.exec(select(model.id).where(visible))).all())
+
+    async def _changes(
+        self,
+        session: AsyncSession,
+        entity_type: str,
+        since: datetime
+    ) -> Tuple[Set[uuid.UUID], Set[uuid.UUID]]:
+        """Visible rows changed since the watermark, and the ids whose documents must go"""
+        model, visible = self._visible(entity_type)
+        # Schedule writes bump packages.updated_at as well
+        statement = select(model.id, visible).where(model.updated_at > since)
+        rows = (await session.exec(statement)).all()
+        changed = {entity_id for entity_id, is_visible in rows if is_visible}
+        removed = {entity_id for entity_id, is_visible in rows if not is_visible}
+        removed.update(await sync_service.deleted_ids(session, entity_type, since))
+        return changed, removed
+
+    async def _load(self, session: AsyncSession, entity_type: str, ids: List[uuid.UUID]) -> Dict[uuid.UUID, Any]:
+        """
+        Detail responses, built the way the detail endpoints build them from fresh
+        rows. Cache entries are dropped first: a cached package detail keeps a
+        renamed destination's old name, and a published document stays until its
+        row changes again.
+        """
+        await detail_cache.invalidate(entity_type, ids)
+        if entity_type == "package":
+            details = await package_service.get_package_details(session, ids)
+            return {entity_id: detail for entity_id, detail in details.items() if detail.is_active}
+        if entity_type == "destination":
+            details = await destination_service.get_destinations_by_ids(session, ids)
+            return {entity_id: detail for entity_id, detail in details.items() if detail.is_active}
+        details = await blog_service.get_blogs_by_ids(session, ids)
+        return {
+            entity_id: detail for entity_id, detail in details.items()
+            if detail.status == BlogStatus.PUBLISHED.value
+        }
+
+    async def _render_details(self, session: AsyncSession, entity_type: str, ids: List[uuid.UUID]) -> int:
+        rendered = 0
+        for start in range(0, len(ids), RENDER_BATCH_SIZE):
+            details = await self._load(session, entity_type, ids[start:start + RENDER_BATCH_SIZE])
+            await asyncio.gather(*(
+                self._write_json(self._detail_key(entity_type, entity_id), detail)
+                for entity_id, detail in details.items()
+            ))
+            rendered += len(details)
+        return rendered
+
+    async def _get_page(self, session: AsyncSession, entity_type: str, page: int) -> Dict[str, Any]:
+        limit = Config.CATALOG_PUBLISH_PAGE_SIZE
+        if entity_type == "package":
+            return await package_service.get_packages(session, page=page, limit=limit, active_only=True)
+        if entity_type == "destination":
+            return await destination_service.get_destinations(session, page=page, limit=limit, active_only=True)
+        return await blog_service.get_blogs(session, page=page, limit=limit, published_only=True)
+
+    async def _render_lists(self, session: AsyncSession, entity_type: str, previous_pages: int) -> int:
+        """Write every list page (page 1 even when empty) and drop pages past the new last one"""
+        page = 1
+        while True:
+            document = await self._get_page(session, entity_type, page)
+            await self._write_json(self._page_key(entity_type, page), document)
+            if page >= document["total_pages"]:
+                break
+            page += 1
+        stale = [self._page_key(entity_type, number) for number in range(page + 1, previous_pages + 1)]
+        await self.backend.remove(self.bucket, stale)
+        return page
+
+    async def publish_sitemap(self, session: AsyncSession, previous_parts: int = 0) -> Dict[str, int]:
+        """
+        Stream every public URL from a server-side cursor into sitemap files of
+        at most SITEMAP_MAX_URLS entries, spooled to temp files rather than memory.
+        """
+        site = Config.SITE_URL.rstrip('/')
+        sections = []
+        for entity_type, path in SITE_SECTIONS:
+            model, visible = self._visible(entity_type)
+            sections.append(select(
+                literal(path).label("path"),
+                model.id.label("id"),
+                model.updated_at.label("updated_at")
+            ).where(visible))
+        statement = union_all(*sections)
+
+        parts = []
+        urls = 0
+
+        def add_url(loc: str, lastmod: Optional[datetime] = None) -> None:
+            nonlocal urls
+            if urls % SITEMAP_MAX_URLS == 0:
+                if parts:
+                    parts[-1].write(URLSET_CLOSE.encode())
+                part = tempfile.TemporaryFile()
+                part.write(URLSET_OPEN.encode())
+                parts.append(part)
+            entry = f"<url><loc>{escape(loc)}</loc>"
+            if lastmod:
+                # updated_at holds naive server-local times
+                entry += f"<lastmod>{lastmod.astimezone().isoformat(timespec='seconds')}</lastmod>"
+            parts[-1].write((entry + "</url>\n").encode())
+            urls += 1
+
+        try:
+            add_url(f"{site}/")
+            for _, path in SITE_SECTIONS:
+                add_url(f"{site}/{path}")
+            result = await session.stream(statement.execution_options(yield_per=SITEMAP_FETCH_SIZE))
+            async for partition in result.partitions():
+                for path, entity_id, updated_at in partition:
+                    add_url(f"{site}/{path}/{entity_id}", updated_at)
+            parts[-1].write(URLSET_CLOSE.encode())
+
+            for part in parts:
+                part.seek(0)
+            if len(parts) == 1:
+                await self.backend.upload(self.bucket, SITEMAP_KEY, parts[0], "application/xml")
+            else:
+                index = ['<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n']
+                for number, part in enumerate(parts, start=1):
+                    key = f"sitemap-{number}.xml"
+                    await self.backend.upload(self.bucket, key, part, "application/xml")
+                    index.append(f"<sitemap><loc>{escape(self.backend.get_public_url(self.bucket, key))}</loc></sitemap>\n")
+                index.append('</sitemapindex>\n')
+                await self.backend.upload_bytes(self.bucket, SITEMAP_KEY, "".join(index).encode(), "application/xml")
+        finally:
+            for part in parts:
+                part.close()
+
+        written = len(parts) if len(parts) > 1 else 0
+        await self.backend.remove(
+            self.bucket,
+            [f"sitemap-{number}.xml" for number in range(written + 1, previous_parts + 1)]
+        )
+        return {"urls": urls, "parts": written}
+
+    async def publish(self, session: AsyncSession, full: bool = False) -> Dict[str, Any]:
+        """
+        Publish what changed since the last run, or everything when full is set
+        or the manifest is missing or older than the deletion log
+        """
+        manifest = None if full else await self._read_manifest()
+        since = datetime.fromisoformat(manifest["watermark"]) if manifest else None
+        if since is not None and sync_service.is_expired(since):
+            since = None
+        full = since is None
+        watermark = sync_service.watermark()
+
+        to_render: Dict[str, Set[uuid.UUID]] = {}
+        to_remove: Dict[str, Set[uuid.UUID]] = {}
+        if full:
+            try:
+                await self.backend.create_bucket(self.bucket, {"public": True})
+            except Exception:
+                pass  # Already there
+            existing = await self._list_keys()
+            for entity_type in PUBLISHED_ENTITY_TYPES:
+                to_render[entity_type] = set(await self._visible_ids(session, entity_type))
+                prefix = f"{entity_type}-"
+                published = set()
+                for key in existing:
+                    if key.startswith(prefix) and key.endswith(".json"):
+                        try:
+                            published.add(uuid.UUID(key[len(prefix):-len(".json")]))
+                        except ValueError:
+                            continue
+                to_remove[entity_type] = published - to_render[entity_type]
+        else:
+            for entity_type in PUBLISHED_ENTITY_TYPES:
+                to_render[entity_type], to_remove[entity_type] = await self._changes(session, entity_type, since)
+
+            # Package documents embed their destination's name
+            renamed = to_render["destination"] | to_remove["destination"]
+            if renamed:
+                statement = select(Package.id).where(
+                    Package.is_active == True,
+                    Package.destination_id.in_(renamed)
+                )
+                to_render["package"].update((await session.exec(statement)).all())
+            # Destination documents carry package counts and prices; destinations are few,
+            # and deleted packages no longer say which destination they belonged to
+            if to_render["package"] or to_remove["package"]:
+                to_render["destination"] = set(await self._visible_ids(session, "destination"))
+
+        previous_pages = (manifest or {}).get("pages", {})
+        stats = {"full": full, "watermark": watermark, "rendered": {}, "removed": {}, "pages": {}}
+        for entity_type in PUBLISHED_ENTITY_TYPES:
+            stats["rendered"][entity_type] = await self._render_details(
+                session, entity_type, sorted(to_render[entity_type])
+            )
+            await self.backend.remove(
+                self.bucket,
+                [self._detail_key(entity_type, entity_id) for entity_id in to_remove[entity_type]]
+            )
+            stats["removed"][entity_type] = len(to_remove[entity_type])
+            if full or to_render[entity_type] or to_remove[entity_type]:
+                stats["pages"][entity_type] = await self._render_lists(
+                    session, entity_type, previous_pages.get(entity_type, 0)
+                )
+            else:
+                stats["pages"][entity_type] = previous_pages.get(entity_type, 0)
+
+        previous_parts = (manifest or {}).get("sitemap_parts", 0)
+        if full or any(to_render.values()) or any(to_remove.values()):
+            sitemap = await self.publish_sitemap(session, previous_parts)
+        else:
+            sitemap = {"urls": (manifest or {}).get("sitemap_urls", 0), "parts": previous_parts}
+        stats["sitemap_urls"] = sitemap["urls"]
+
+        # Written last: an interrupted run is redone from the previous watermark
+        await self._write_json(MANIFEST_KEY, {
+            "watermark": watermark,
+            "published_at": datetime.now(),
+            "pages": stats["pages"],
+            "sitemap_urls": sitemap["urls"],
+            "sitemap_parts": sitemap["parts"]
+        })
+        return stats
+
+
+catalog_publisher = CatalogPublisher()
@@ -0,0 +1,380 @@
+"""
+Per-worker, immutable in-memory snapshot of the browsable catalog.
+
+Active packages (with their schedule summary) and active destinations are a
+few thousand rows, so each worker keeps them as slotted records with
+precomputed indexes: by id, by destination, by price and newest first. List
+and filter reads are answered from the snapshot without touching Postgres.
+
+A snapshot is never modified; a rebuild loads everything into a new one and
+swaps the reference, so readers always see one consistent version. Rebuilds
+are triggered by catalog changes: the worker that made the change rebuilds
+right away and publishes a Postgres NOTIFY so the other workers follow. A
+periodic poll of a cheap count/max(updated_at) signature catches anything a
+lost notification or an unnotified write missed.
+"""
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple, Set, Callable, Awaitable
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import selectinload
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import Config
+from ..db.main import async_engine, async_session_maker
+from ..models.destination import Destination
+from ..models.package import Package
+from ..models.package_detail_schedule import PackageDetailSchedule
+from ..schemas.destination_schemas import DestinationResponseModel
+from ..schemas.package_schemas import PackageResponseModel
+from .catalog_events import on_change
+from .package_service import package_service
+
+
+CATALOG_CHANNEL = "catalog_changed"
+
+SNAPSHOT_ENTITY_TYPES = ("package", "destination")
+
+
+@dataclass(frozen=True, slots=True)
+class PackageRecord:
+    id: uuid.UUID
+    destination_id: uuid.UUID
+    price: float
+    # Lowercased for case-insensitive substring search, like ILIKE
+    title: str
+    description: str
+    response: PackageResponseModel
+
+
+@dataclass(frozen=True, slots=True)
+class DestinationRecord:
+    id: uuid.UUID
+    name: str
+    response: DestinationResponseModel
+
+
+class CatalogSnapshot:
+    """One immutable version of the catalog; positions index the newest-first package tuple"""
+
+    __slots__ = (
+        "packages", "package_positions", "destination_positions", "prices", "price_order",
+        "sorted_prices", "destinations", "built_at", "build_seconds", "size_bytes"
+    )
+
+    def __init__(
+        self,
+        packages: List[PackageRecord],
+        destinations: List[DestinationRecord],
+        build_seconds: float
+    ):
+        # Packages newest first, destinations by name
+        self.packages: Tuple[PackageRecord, ...] = tuple(packages)
+        self.destinations: Tuple[DestinationRecord, ...] = tuple(destinations)
+
+        self.package_positions = {record.id: position for position, record in enumerate(self.packages)}
+        by_destination: Dict[uuid.UUID, List[int]] = {}
+        for position, record in enumerate(self.packages):
+            by_destination.setdefault(record.destination_id, []).append(position)
+        self.destination_positions = {
+            destination_id: np.array(positions, dtype=np.int32)
+            for destination_id, positions in by_destination.items()
+        }
+
+        self.prices = np.array([record.price for record in self.packages], dtype=float)
+        self.price_order = np.argsort(self.prices, kind="stable").astype(np.int32)
+        self.sorted_prices = self.prices[self.price_order]
+
+        self.built_at = datetime.utcnow()
+        self.build_seconds = build_seconds
+        # Approximate footprint: the serialized size of the prebuilt responses
+        self.size_bytes = sum(len(record.response.model_dump_json()) for record in self.packages) + sum(
+            len(record.response.model_dump_json()) for record in self.destinations
+        )
+
+    def _filter_positions(
+        self,
+        search: Optional[str] = None,
+        destination_id: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        search_description: bool = True
+    ) -> np.ndarray:
+        """Positions (newest first) of the packages matching every filter"""
+        mask = np.ones(len(self.packages), dtype=bool)
+
+        if destination_id:
+            try:
+                positions = self.destination_positions.get(uuid.UUID(str(destination_id)))
+            except ValueError:
+                positions = None
+            selected = np.zeros_like(mask)
+            if positions is not None:
+                selected[positions] = True
+            mask &= selected
+
+        if min_price is not None or max_price is not None:
+            low = np.searchsorted(self.sorted_prices, min_price, side="left") if min_price is not None else 0
+            high = np.searchsorted(self.sorted_prices, max_price, side="right") if max_price is not None else len(self.packages)
+            selected = np.zeros_like(mask)
+            selected[self.price_order[low:high]] = True
+            mask &= selected
+
+        positions = np.flatnonzero(mask)
+        if search:
+            term = search.lower()
+            positions = np.array([
+                position for position in positions
+                if term in self.packages[position].title
+                or (search_description and term in self.packages[position].description)
+            ], dtype=np.int64)
+        return positions
+
+    def list_packages(
+        self,
+        page: int = 1,
+        limit: int = 10,
+        search: Optional[str] = None,
+        destination_id: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        search_description: bool = True
+    ) -> Dict[str, Any]:
+        """Same result as PackageService.get_packages(active_only=True)"""
+        positions = self._filter_positions(search, destination_id, min_price, max_price, search_description)
+        total = len(positions)
+        offset = (page - 1) * limit
+        return {
+            "packages": [self.packages[position].response for position in positions[offset:offset + limit]],
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "total_pages": (total + limit - 1) // limit
+        }
+
+    def get_packages_in_order(self, package_ids: List[uuid.UUID]) -> List[PackageResponseModel]:
+        """Active packages by id, keeping the given order"""
+        return [
+            self.packages[self.package_positions[package_id]].response
+            for package_id in package_ids if package_id in self.package_positions
+        ]
+
+    def list_destinations(self, page: int = 1, limit: int = 12, search: Optional[str] = None) -> List[DestinationResponseModel]:
+        """Active destinations by name, optionally filtered by a name substring"""
+        offset = (page - 1) * limit
+        if search:
+            term = search.lower()
+            records = [record for record in self.destinations if term in record.name]
+        else:
+            records = self.destinations
+        return [record.response for record in records[offset:offset + limit]]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "built_at": self.built_at,
+            "age_seconds": round((datetime.utcnow() - self.built_at).total_seconds(), 1),
+            "build_ms": round(self.build_seconds * 1000, 1),
+            "packages": len(self.packages),
+            "destinations": len(self.destinations),
+            "size_bytes": self.size_bytes
+        }
+
+
+class CatalogSnapshotService:
+    """Builds the snapshot for this worker and keeps it in step with catalog changes"""
+
+    def __init__(self):
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._signature: Optional[Tuple] = None
+        self._lock = asyncio.Lock()
+        self._refresh_scheduled = False
+        self._tasks: Set[asyncio.Task] = set()
+        self._rebuilds = 0
+        self._refresh_listeners: List[Callable[[], Awaitable[None]]] = []
+        # Lets a worker ignore the notifications it published itself
+        self.worker_id = uuid.uuid4().hex
+
+    def on_refresh(self, listener: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+        """Register an async callback run after each new snapshot is swapped in"""
+        self._refresh_listeners.append(listener)
+        return listener
+
+    def current(self) -> Optional[CatalogSnapshot]:
+        """The latest snapshot, or None when disabled or not built yet (callers then use SQL)"""
+        if not Config.CATALOG_SNAPSHOT_ENABLED:
+            return None
+        return self._snapshot
+
+    async def _read_signature(self, session: AsyncSession) -> Tuple:
+        """Row counts and latest updates of the snapshot tables, in one round trip"""
+        statement = select(
+            select(func.count(Package.id)).scalar_subquery(),
+            select(func.max(Package.updated_at)).scalar_subquery(),
+            select(func.count(Destination.id)).scalar_subquery(),
+            select(func.max(Destination.updated_at)).scalar_subquery(),
+            select(func.max(PackageDetailSchedule.updated_at)).scalar_subquery()
+        )
+        return tuple((await session.exec(statement)).one())
+
+    async def build(self, session: AsyncSession) -> CatalogSnapshot:
+        started = time.perf_counter()
+        packages = (await session.exec(
+            select(Package).options(selectinload(Package.detail_schedule)).where(
+                Package.is_active == True
+            ).order_by(Package.created_at.desc(), Package.id)
+        )).all()
+        destinations = (await session.exec(
+            select(Destination).where(Destination.is_active == True).order_by(Destination.name.asc(), Destination.id)
+        )).all()
+
+        package_records = []
+        aggregates: Dict[uuid.UUID, Dict[str, Any]] = {}
+        for package in packages:
+            response = PackageResponseModel.model_validate(package_service.to_list_item(package))
+            package_records.append(PackageRecord(
+                id=package.id,
+                destination_id=package.destination_id,
+                price=float(package.price),
+                title=package.title.lower(),
+                description=(package.description or "").lower(),
+                response=response
+            ))
+
+            aggregate = aggregates.setdefault(package.destination_id, {
+                "active_packages": 0, "featured_packages": 0,
+                "min_price": None, "max_price": None, "min_duration_days": None
+            })
+            aggregate["active_packages"] += 1
+            aggregate["featured_packages"] += int(bool(package.is_featured))
+            price = float(package.price)
+            aggregate["min_price"] = price if aggregate["min_price"] is None else min(aggregate["min_price"], price)
+            aggregate["max_price"] = price if aggregate["max_price"] is None else max(aggregate["max_price"], price)
+            if response.duration_days is not None:
+                current = aggregate["min_duration_days"]
+                aggregate["min_duration_days"] = response.duration_days if current is None else min(current, response.duration_days)
+
+        # Built from the package pass, matching DestinationService.get_package_aggregates
+        destination_records = [
+            DestinationRecord(
+                id=destination.id,
+                name=destination.name.lower(),
+                response=DestinationResponseModel.model_validate(destination).model_copy(
+                    update=aggregates.get(destination.id, {})
+                )
+            )
+            for destination in destinations
+        ]
+        return CatalogSnapshot(package_records, destination_records, time.perf_counter() - started)
+
+    async def refresh(self, session: AsyncSession) -> Dict[str, Any]:
+        """Build a new snapshot and swap it in"""
+        signature = await self._read_signature(session)
+        snapshot = await self.build(session)
+        self._snapshot = snapshot
+        self._signature = signature
+        self._rebuilds += 1
+        for listener in self._refresh_listeners:
+            try:
+                await listener()
+            except Exception as e:
+                print(f"Snapshot listener {listener.__name__} failed: {str(e)}")
+        return snapshot.stats()
+
+    async def refresh_in_background(self) -> None:
+        """Background entry point with its own session; changes during a rebuild queue one more run"""
+        if self._refresh_scheduled:
+            return
+        self._refresh_scheduled = True
+        try:
+            async with self._lock:
+                self._refresh_scheduled = False
+                async with async_session_maker() as session:
+                    await self.refresh(session)
+        except Exception as e:
+            self._refresh_scheduled = False
+            print(f"Catalog snapshot rebuild failed: {str(e)}")
+
+    def schedule_refresh(self) -> None:
+        """Start a rebuild without waiting for it"""
+        task = asyncio.get_running_loop().create_task(self.refresh_in_background())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def poll(self) -> None:
+        """Rebuild when the table signature moved since the current snapshot"""
+        try:
+            async with async_session_maker() as session:
+                signature = await self._read_signature(session)
+        except Exception as e:
+            print(f"Catalog snapshot poll failed: {str(e)}")
+            return
+        if signature != self._signature:
+            await self.refresh_in_background()
+
+    async def publish(self, entity_type: str) -> None:
+        """NOTIFY the other workers that the catalog changed"""
+        async with async_engine.begin() as conn:
+            await conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": CATALOG_CHANNEL, "payload": f"{self.worker_id}:{entity_type}"}
+            )
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        if not payload.startswith(f"{self.worker_id}:"):
+            self.schedule_refresh()
+
+    async def _listen(self) -> None:
+        """LISTEN on a dedicated connection, polling between notifications until it drops"""
+        async with async_engine.connect() as conn:
+            raw_connection = await conn.get_raw_connection()
+            listener = raw_connection.driver_connection
+            await listener.add_listener(CATALOG_CHANNEL, self._on_notification)
+            try:
+                while not listener.is_closed():
+                    await asyncio.sleep(Config.CATALOG_SNAPSHOT_POLL_SECONDS)
+                    await self.poll()
+            finally:
+                if not listener.is_closed():
+                    await listener.remove_listener(CATALOG_CHANNEL, self._on_notification)
+
+    async def run(self) -> None:
+        """Build the first snapshot, then follow changes until cancelled (started from the app lifespan)"""
+        if not Config.CATALOG_SNAPSHOT_ENABLED:
+            return
+        await self.refresh_in_background()
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Catalog change listener unavailable, polling: {str(e)}")
+                await asyncio.sleep(Config.CATALOG_SNAPSHOT_POLL_SECONDS)
+                await self.poll()
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "enabled": Config.CATALOG_SNAPSHOT_ENABLED,
+            "worker_id": self.worker_id,
+            "rebuilds": self._rebuilds,
+            "snapshot": snapshot.stats() if snapshot else None
+        }
+
+
+catalog_snapshot_service = CatalogSnapshotService()
+
+
+@on_change(*SNAPSHOT_ENTITY_TYPES)
+async def refresh_catalog_snapshot(entity_type: str, ids: List[uuid.UUID]) -> None:
+    """Rebuild this worker's snapshot now and tell the other workers to follow"""
+    if not Config.CATALOG_SNAPSHOT_ENABLED:
+        return
+    catalog_snapshot_service.schedule_refresh()
+    await catalog_snapshot_service.publish(entity_type)
@@ -1,9 +1,22 @@
 from typing import Optional, Dict, Any, List
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select, func
+from sqlalchemy import or_, and_
 from fastapi import HTTPException, UploadFile
 from ..models.destination import Destination
-from ..schemas.destination_schemas import DestinationResponseModel, DestinationCreateModel, DestinationUpdateModel
+from ..models.package import Package
+from ..models.package_detail_schedule import PackageDetailSchedule
+from ..schemas.destination_schemas import (
+    DestinationResponseModel,
+    DestinationCreateModel,
+    DestinationUpdateModel,
+    NearbyDestinationModel
+)
+from ..utils.sql_utils import matches_any
+from ..utils.geo import geohash_for, covering_prefixes, prefix_upper_bound, haversine_km_sql
+from .catalog_events import notify_change
+from .detail_cache import detail_cache
+from .sync_service import sync_service
 from .supabase_service import supabase_service
 import uuid
 
@@ -68,7 +81,9 @@ class DestinationService:
         total_pages = (total + limit - 1) // limit
         
         return {
-            "destinations": [DestinationResponseModel.model_validate(dest) for dest in destinations],
+            "destinations": await self.with_package_aggregates(
+                session, [DestinationResponseModel.model_validate(dest) for dest in destinations]
+            ),
             "total": total,
             "page": page,
             "limit": limit,
@@ -106,14 +121,148 @@ class DestinationService:
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid destination ID format")
             
-        query = select(Destination).where(Destination.id == destination_uuid)
-        result = await session.exec(query)
-        destination = result.first()
+        destinations = await self.get_destinations_by_ids(session, [destination_uuid])
+        return destinations.get(destination_uuid)
+
+    async def get_destinations_by_ids(
+        self,
+        session: AsyncSession,
+        destination_ids: List[uuid.UUID]
+    ) -> Dict[uuid.UUID, DestinationResponseModel]:
+        """Destinations keyed by id for the ids that exist, cached ones first, the rest in one query"""
+        destination_ids = list(dict.fromkeys(destination_ids))
+        destinations = await detail_cache.get_many("destination", destination_ids, DestinationResponseModel)
+        missing = [destination_id for destination_id in destination_ids if destination_id not in destinations]
+        if missing:
+            result = await session.exec(select(Destination).where(matches_any(Destination.id, missing)))
+            loaded = {
+                destination.id: DestinationResponseModel.model_validate(destination)
+                for destination in result.all()
+            }
+            await detail_cache.set_many("destination", loaded)
+            destinations.update(loaded)
+        # Aggregates follow package writes, so they are attached fresh rather than cached
+        enriched = await self.with_package_aggregates(session, list(destinations.values()))
+        return {destination.id: destination for destination in enriched}
+
+    async def get_package_aggregates(
+        self,
+        session: AsyncSession,
+        destination_ids: List[uuid.UUID]
+    ) -> Dict[uuid.UUID, Dict[str, Any]]:
+        """
+        Package counts, price range and shortest duration per destination, from
+        one LEFT JOIN ... GROUP BY over the given destinations
+        """
+        if not destination_ids:
+            return {}
+        active = Package.is_active == True
+        statement = select(
+            Destination.id,
+            func.count(Package.id).label("total_packages"),
+            func.count(Package.id).filter(active).label("active_packages"),
+            func.count(Package.id).filter(active, Package.is_featured == True).label("featured_packages"),
+            func.min(Package.price).filter(active).label("min_price"),
+            func.max(Package.price).filter(active).label("max_price"),
+            func.min(PackageDetailSchedule.duration_days).filter(active).label("min_duration_days")
+        ).select_from(Destination).outerjoin(
+            Package, Package.destination_id == Destination.id
+        ).outerjoin(
+            PackageDetailSchedule, PackageDetailSchedule.package_id == Package.id
+        ).where(matches_any(Destination.id, destination_ids)).group_by(Destination.id)
         
-        if not destination:
-            return None
-            
-        return DestinationResponseModel.model_validate(destination)
+        return {
+            row.id: {
+                "total_packages": row.total_packages,
+                "active_packages": row.active_packages,
+                "featured_packages": row.featured_packages,
+                "min_price": float(row.min_price) if row.min_price is not None else None,
+                "max_price": float(row.max_price) if row.max_price is not None else None,
+                "min_duration_days": row.min_duration_days
+            }
+            for row in (await session.exec(statement)).all()
+        }
+
+    async def with_package_aggregates(
+        self,
+        session: AsyncSession,
+        destinations: List[DestinationResponseModel]
+    ) -> List[DestinationResponseModel]:
+        """Copies of the responses with their package aggregates filled in"""
+        aggregates = await self.get_package_aggregates(session, [destination.id for destination in destinations])
+        return [
+            destination.model_copy(update={
+                key: value for key, value in aggregates.get(destination.id, {}).items()
+                if key in DestinationResponseModel.model_fields
+            })
+            for destination in destinations
+        ]
+
+    async def get_nearby_destinations(
+        self,
+        session: AsyncSession,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: int = 20
+    ) -> List[NearbyDestinationModel]:
+        """
+        Active destinations within radius_km of a point, nearest first. Candidates
+        come from geohash prefix ranges around the point; the exact great-circle
+        distance then filters and orders them.
+        """
+        distance = haversine_km_sql(Destination.latitude, Destination.longitude, latitude, longitude)
+        statement = select(Destination, distance.label("distance_km")).where(
+            Destination.is_active == True,
+            Destination.latitude.isnot(None),
+            distance <= radius_km
+        )
+        prefixes = covering_prefixes(latitude, longitude, radius_km)
+        if prefixes is not None:
+            statement = statement.where(or_(*[
+                and_(Destination.geohash >= prefix, Destination.geohash < prefix_upper_bound(prefix))
+                for prefix in prefixes
+            ]))
+        rows = (await session.exec(statement.order_by(distance).limit(limit))).all()
+        
+        destinations = await self.with_package_aggregates(
+            session, [DestinationResponseModel.model_validate(destination) for destination, _ in rows]
+        )
+        return [
+            NearbyDestinationModel(**destination.model_dump(), distance_km=round(distance_km, 2))
+            for destination, (_, distance_km) in zip(destinations, rows)
+        ]
+
+    async def get_destinations_in_bbox(
+        self,
+        session: AsyncSession,
+        south: float,
+        west: float,
+        north: float,
+        east: float,
+        limit: int = 200
+    ) -> Dict[str, Any]:
+        """
+        Active destinations inside a map bounding box. A box with west > east
+        crosses the antimeridian and is matched as two longitude ranges.
+        """
+        if west <= east:
+            in_longitude = Destination.longitude.between(west, east)
+        else:
+            in_longitude = or_(Destination.longitude >= west, Destination.longitude <= east)
+        statement = select(Destination).where(
+            Destination.is_active == True,
+            Destination.latitude.between(south, north),
+            in_longitude
+        ).order_by(Destination.name.asc(), Destination.id).limit(limit + 1)
+        destinations = (await session.exec(statement)).all()
+        
+        return {
+            "destinations": await self.with_package_aggregates(
+                session, [DestinationResponseModel.model_validate(destination) for destination in destinations[:limit]]
+            ),
+            "truncated": len(destinations) > limit
+        }
 
     async def create_destination(
         self,
@@ -140,6 +289,7 @@ class DestinationService:
             destination_kwargs = destination_data.model_dump(exclude_unset=True)
             if admin_id:
                 destination_kwargs['created_by'] = admin_id
+            destination_kwargs['geohash'] = geohash_for(destination_data.latitude, destination_data.longitude)
 
             destination = Destination(
                 **destination_kwargs,
@@ -150,6 +300,7 @@ class DestinationService:
             session.add(destination)
             await session.commit()
             await session.refresh(destination)
+            await notify_change("destination", [destination.id])
 
             return DestinationResponseModel.model_validate(destination)
 
@@ -178,11 +329,13 @@ class DestinationService:
         if not destination:
             return None
         
+        previous_image = destination.featured_image
         try:
             # Handle featured image upload if provided
             if featured_image:
                 featured_image_url = await supabase_service.upload_destination_image(featured_image)
                 destination.featured_image = featured_image_url
+                destination.featured_image_renditions = None
             
             # Handle image gallery upload if provided
             if image_gallery:
@@ -196,9 +349,14 @@ class DestinationService:
             update_data = destination_data.model_dump(exclude_unset=True)
             for field, value in update_data.items():
                 setattr(destination, field, value)
+            if 'latitude' in update_data:
+                destination.geohash = geohash_for(destination.latitude, destination.longitude)
             
             await session.commit()
             await session.refresh(destination)
+            if destination.featured_image != previous_image:
+                await supabase_service.release_images([previous_image], "destination-images")
+            await notify_change("destination", [destination.id])
             
             return DestinationResponseModel.model_validate(destination)
             
@@ -220,9 +378,13 @@ class DestinationService:
         if not destination:
             return False
         
+        featured_image = destination.featured_image
         try:
             await session.delete(destination)
+            await sync_service.record_deletions(session, "destination", [destination_uuid])
             await session.commit()
+            await supabase_service.release_images([featured_image], "destination-images")
+            await notify_change("destination", [destination_uuid])
             return True
             
         except Exception as e:
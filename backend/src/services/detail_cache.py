@@ -0,0 +1,83 @@
+"""
+Redis cache of detail responses for packages, destinations and blogs.
+
+Each entry is the JSON of one response model under "detail:<entity>:<id>", so
+a batch of ids is read with one MGET and written with one pipeline. Catalog
+changes drop entries through catalog_events; the TTL bounds staleness from
+writes that do not notify (e.g. a destination rename shown on its packages).
+"""
+import uuid
+from typing import Dict, Iterable, List, Type, TypeVar
+
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from ..config import Config
+from ..db.redis import redis_client
+from .catalog_events import on_change
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+CACHED_ENTITY_TYPES = ("package", "destination", "blog")
+
+
+class DetailCache:
+    """Best-effort read-through cache; Redis errors only cost a cache miss"""
+
+    def _key(self, entity_type: str, entity_id: uuid.UUID) -> str:
+        return f"detail:{entity_type}:{entity_id}"
+
+    async def get_many(
+        self,
+        entity_type: str,
+        ids: List[uuid.UUID],
+        model: Type[ModelT]
+    ) -> Dict[uuid.UUID, ModelT]:
+        """Cached responses for the ids that have one"""
+        if not ids:
+            return {}
+        try:
+            values = await redis_client.mget([self._key(entity_type, entity_id) for entity_id in ids])
+        except RedisError as e:
+            print(f"Detail cache read failed: {str(e)}")
+            return {}
+        return {
+            entity_id: model.model_validate_json(value)
+            for entity_id, value in zip(ids, values)
+            if value is not None
+        }
+
+    async def set_many(self, entity_type: str, responses: Dict[uuid.UUID, BaseModel]) -> None:
+        """Store freshly built responses"""
+        if not responses:
+            return
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for entity_id, response in responses.items():
+                    pipe.set(
+                        self._key(entity_type, entity_id),
+                        response.model_dump_json(),
+                        ex=Config.DETAIL_CACHE_TTL_SECONDS
+                    )
+                await pipe.execute()
+        except RedisError as e:
+            print(f"Detail cache write failed: {str(e)}")
+
+    async def invalidate(self, entity_type: str, ids: Iterable[uuid.UUID]) -> None:
+        keys = [self._key(entity_type, entity_id) for entity_id in ids]
+        if not keys:
+            return
+        try:
+            await redis_client.delete(*keys)
+        except RedisError as e:
+            print(f"Detail cache invalidation failed: {str(e)}")
+
+
+detail_cache = DetailCache()
+
+
+@on_change(*CACHED_ENTITY_TYPES)
+async def invalidate_details(entity_type: str, ids: List[uuid.UUID]) -> None:
+    """Changed entities are rebuilt from the database on their next read"""
+    await detail_cache.invalidate(entity_type, ids)
@@ -0,0 +1,220 @@
+"""
+Direct-to-storage uploads: the API signs an upload, the client sends the bytes
+straight to storage, and the API then records the stored object on an entity.
+"""
+import re
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import select, func
+
+from ..config import Config
+from ..models.package import Package
+from ..models.package_image import PackageImage
+from ..models.destination import Destination
+from ..models.blog import Blog
+from ..schemas.upload_schemas import (
+    SignedUploadRequestModel,
+    SignedUploadResponseModel,
+    FinalizeUploadRequestModel,
+    FinalizeUploadResponseModel
+)
+from ..utils.image_utils import ImageManager
+from ..utils.upload_utils import IMAGE_EXTENSIONS, SNIFF_BYTES, sniff_image_type
+from .catalog_events import notify_change
+from .storage_service import storage_service
+
+
+# "<sha256><ext>" keys are content addressed; anything else was issued as "<uuid hex><ext>"
+CONTENT_KEY_PATTERN = re.compile(r"^(?P<sha256>[0-9a-f]{64})\.(jpg|png|gif|webp)$")
+RANDOM_KEY_PATTERN = re.compile(r"^[0-9a-f]{32}\.(jpg|png|gif|webp)$")
+
+VALID_TARGETS = {
+    "package": {"featured", "gallery"},
+    "destination": {"featured"},
+    "blog": {"cover"},
+}
+
+
+class DirectUploadService:
+    """Issues signed upload URLs and finalizes the uploaded objects"""
+
+    async def create_upload(self, request: SignedUploadRequestModel) -> SignedUploadResponseModel:
+        """Sign an upload for one image, or report that identical content is already stored"""
+        if request.size > Config.MAX_UPLOAD_BYTES:
+            raise ValueError(
+                f"File too large. Maximum allowed size is {Config.MAX_UPLOAD_BYTES // (1024 * 1024)} MB."
+            )
+
+        bucket = ImageManager.get_bucket_for_entity(request.entity_type)
+        extension = IMAGE_EXTENSIONS[request.content_type]
+        if request.sha256:
+            key = f"{request.sha256}{extension}"
+        else:
+            key = f"{uuid.uuid4().hex}{extension}"
+
+        backend = storage_service.backend
+        public_url = backend.get_public_url(bucket, key)
+
+        if request.sha256 and await backend.exists(bucket, key):
+            return SignedUploadResponseModel(
+                bucket=bucket,
+                key=key,
+                public_url=public_url,
+                already_exists=True
+            )
+
+        signed = await backend.create_signed_upload(bucket, key)
+        return SignedUploadResponseModel(
+            bucket=bucket,
+            key=key,
+            public_url=public_url,
+            upload_url=signed["upload_url"],
+            token=signed["token"],
+            expires_at=signed["expires_at"],
+            headers={"content-type": request.content_type}
+        )
+
+    async def finalize(
+        self,
+        session: AsyncSession,
+        request: FinalizeUploadRequestModel
+    ) -> Optional[FinalizeUploadResponseModel]:
+        """
+        Verify the uploaded object and record it on the entity.
+        Returns None if the entity does not exist.
+        """
+        if request.target not in VALID_TARGETS[request.entity_type]:
+            raise ValueError(f"Invalid target '{request.target}' for {request.entity_type}")
+
+        content_match = CONTENT_KEY_PATTERN.match(request.key)
+        if not content_match and not RANDOM_KEY_PATTERN.match(request.key):
+            raise ValueError("Invalid upload key")
+
+        bucket = ImageManager.get_bucket_for_entity(request.entity_type)
+        backend = storage_service.backend
+        size, content_type = await self._verify(bucket, request.key)
+
+        image_url = backend.get_public_url(bucket, request.key)
+        image_id = None
+        previous_image = None
+
+        if request.entity_type == "package":
+            package = (await session.exec(select(Package).where(Package.id == request.entity_id))).first()
+            if not package:
+                return None
+            if request.target == "featured":
+                previous_image = package.featured_image
+                package.featured_image = image_url
+                package.featured_image_renditions = None
+                package.updated_at = datetime.now()
+                session.add(package)
+            else:
+                image_id = await self._add_gallery_image(session, package.id, image_url, request)
+
+        elif request.entity_type == "destination":
+            destination = (await session.exec(select(Destination).where(Destination.id == request.entity_id))).first()
+            if not destination:
+                return None
+            previous_image = destination.featured_image
+            destination.featured_image = image_url
+            destination.featured_image_renditions = None
+            session.add(destination)
+
+        else:
+            blog = (await session.exec(select(Blog).where(Blog.id == request.entity_id))).first()
+            if not blog:
+                return None
+            previous_image = blog.cover_image
+            blog.cover_image = image_url
+            blog.cover_image_renditions = None
+            session.add(blog)
+
+        await session.commit()
+        await notify_change(request.entity_type, [request.entity_id])
+
+        # Content-addressed objects are reference counted like regular uploads
+        if content_match:
+            await storage_service.add_reference(
+                bucket, request.key, content_match.group("sha256"), size, content_type
+            )
+
+        # Like the regular update paths, release the image this one replaced
+        if previous_image and previous_image != image_url:
+            await storage_service.release_images([previous_image], bucket)
+
+        return FinalizeUploadResponseModel(
+            entity_type=request.entity_type,
+            entity_id=request.entity_id,
+            target=request.target,
+            image_url=image_url,
+            image_id=image_id
+        )
+
+    async def _verify(self, bucket: str, key: str) -> Tuple[int, str]:
+        """
+        Check a client-written object before recording it: its size and its
+        magic number against the key's extension. Only the first bytes are
+        read; the SHA-256 of a content-addressed key is checked by the
+        rendition step, which downloads the object anyway. Objects already
+        reference counted were checked when first stored. Rejected objects are
+        removed, unless something references them.
+        Returns (size, content type).
+        """
+        backend = storage_service.backend
+        info = await backend.stat(bucket, key)
+        if not info:
+            raise LookupError("Uploaded object not found in storage")
+        if await storage_service.is_tracked(bucket, key):
+            return info["size"], info["content_type"]
+
+        problem = None
+        content_type = None
+        if info["size"] > Config.MAX_UPLOAD_BYTES:
+            problem = "Uploaded object is too large"
+        else:
+            content_type = sniff_image_type(await backend.read_head(bucket, key, SNIFF_BYTES))
+            if not content_type or not key.endswith(IMAGE_EXTENSIONS[content_type]):
+                problem = "Uploaded object is not an allowed image"
+
+        if problem:
+            # A reference may have been taken since the check above; never remove shared objects
+            if not await storage_service.is_tracked(bucket, key):
+                await backend.remove(bucket, [key])
+            raise ValueError(problem)
+        return info["size"], content_type
+
+    async def _add_gallery_image(
+        self,
+        session: AsyncSession,
+        package_id: uuid.UUID,
+        image_url: str,
+        request: FinalizeUploadRequestModel
+    ) -> uuid.UUID:
+        """Append an image to the end of a package gallery"""
+        last_order = (await session.exec(
+            select(func.max(PackageImage.display_order)).where(PackageImage.package_id == package_id)
+        )).first()
+
+        if request.is_primary:
+            await session.execute(
+                PackageImage.__table__.update()
+                .where(PackageImage.package_id == package_id)
+                .values(is_primary=False)
+            )
+
+        image = PackageImage(
+            package_id=package_id,
+            image_url=image_url,
+            alt_text=request.alt_text,
+            display_order=0 if last_order is None else last_order + 1,
+            is_primary=request.is_primary,
+            created_at=datetime.now()
+        )
+        session.add(image)
+        await session.flush()
+        return image.id
+
+
+direct_upload_service = DirectUploadService()
@@ -0,0 +1,222 @@
+"""
+Service for generating image renditions and recording them on catalog entities
+"""
+from typing import Optional, Dict, Any, List
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import select
+from sqlalchemy import update, delete, or_, and_
+import uuid
+from datetime import datetime
+
+from ..db.main import async_session_maker
+from ..models.package import Package
+from ..models.package_image import PackageImage
+from ..models.destination import Destination
+from ..models.blog import Blog
+from ..utils.image_utils import ImageManager, ContentHashMismatch
+from .catalog_events import notify_change
+from .storage_service import storage_service
+
+
+class ImageRenditionService:
+    """Fills the *_renditions columns for images that do not have them yet"""
+
+    async def process_package(self, session: AsyncSession, package_id: uuid.UUID) -> int:
+        """Generate renditions for a package's featured image and gallery"""
+        package = (await session.exec(select(Package).where(Package.id == package_id))).first()
+        if not package:
+            return 0
+
+        processed = 0
+        if package.featured_image and not package.featured_image_renditions:
+            renditions = await ImageManager.create_renditions(package.featured_image, 'package')
+            if renditions:
+                # Only record if the image was not replaced while we were processing it
+                await session.execute(
+                    update(Package)
+                    .where(Package.id == package.id, Package.featured_image == package.featured_image)
+                    .values(featured_image_renditions=renditions)
+                )
+                processed += 1
+
+        images = (await session.exec(
+            select(PackageImage).where(
+                PackageImage.package_id == package_id,
+                PackageImage.renditions.is_(None)
+            )
+        )).all()
+        for image in images:
+            renditions = await ImageManager.create_renditions(image.image_url, 'package')
+            if renditions:
+                await session.execute(
+                    update(PackageImage)
+                    .where(PackageImage.id == image.id, PackageImage.image_url == image.image_url)
+                    .values(renditions=renditions)
+                )
+                processed += 1
+
+        await session.commit()
+        if processed:
+            await notify_change("package", [package_id])
+        return processed
+
+    async def process_destination(self, session: AsyncSession, destination_id: uuid.UUID) -> int:
+        """Generate renditions for a destination's featured image"""
+        destination = (await session.exec(select(Destination).where(Destination.id == destination_id))).first()
+        if not destination or not destination.featured_image or destination.featured_image_renditions:
+            return 0
+
+        renditions = await ImageManager.create_renditions(destination.featured_image, 'destination')
+        if not renditions:
+            return 0
+
+        await session.execute(
+            update(Destination)
+            .where(Destination.id == destination.id, Destination.featured_image == destination.featured_image)
+            .values(featured_image_renditions=renditions)
+        )
+        await session.commit()
+        await notify_change("destination", [destination_id])
+        return 1
+
+    async def process_blog(self, session: AsyncSession, blog_id: uuid.UUID) -> int:
+        """Generate renditions for a blog's cover image"""
+        blog = (await session.exec(select(Blog).where(Blog.id == blog_id))).first()
+        if not blog or not blog.cover_image or blog.cover_image_renditions:
+            return 0
+
+        renditions = await ImageManager.create_renditions(blog.cover_image, 'blog')
+        if not renditions:
+            return 0
+
+        await session.execute(
+            update(Blog)
+            .where(Blog.id == blog.id, Blog.cover_image == blog.cover_image)
+            .values(cover_image_renditions=renditions)
+        )
+        await session.commit()
+        await notify_change("blog", [blog_id])
+        return 1
+
+    async def process(self, session: AsyncSession, entity_type: str, entity_id: uuid.UUID) -> int:
+        """Dispatch to the processor for the given entity type"""
+        processors = {
+            'package': self.process_package,
+            'destination': self.process_destination,
+            'blog': self.process_blog,
+        }
+        if entity_type not in processors:
+            raise ValueError(f"Invalid entity type: {entity_type}")
+        return await processors[entity_type](session, entity_id)
+
+    async def process_in_background(self, entity_type: str, entity_id: uuid.UUID) -> None:
+        """
+        Background-task entry point. Opens its own session because the request
+        session is closed by the time background tasks run.
+        """
+        async with async_session_maker() as session:
+            try:
+                await self.process(session, entity_type, uuid.UUID(str(entity_id)))
+            except ContentHashMismatch as e:
+                await session.rollback()
+                print(f"Rejected direct upload for {entity_type} {entity_id}: {str(e)}")
+                await self.reject_image(session, entity_type, uuid.UUID(str(entity_id)), e.image_url)
+            except Exception as e:
+                print(f"Rendition processing failed for {entity_type} {entity_id}: {str(e)}")
+
+    async def reject_image(
+        self,
+        session: AsyncSession,
+        entity_type: str,
+        entity_id: uuid.UUID,
+        image_url: str
+    ) -> None:
+        """Detach an invalid image from the entity, then drop it from storage"""
+        now = datetime.now()
+        if entity_type == 'package':
+            await session.execute(
+                update(Package)
+                .where(Package.id == entity_id, Package.featured_image == image_url)
+                .values(featured_image=None, featured_image_renditions=None)
+            )
+            await session.execute(
+                delete(PackageImage)
+                .where(PackageImage.package_id == entity_id, PackageImage.image_url == image_url)
+            )
+            await session.execute(update(Package).where(Package.id == entity_id).values(updated_at=now))
+        elif entity_type == 'destination':
+            await session.execute(
+                update(Destination)
+                .where(Destination.id == entity_id, Destination.featured_image == image_url)
+                .values(featured_image=None, featured_image_renditions=None, updated_at=now)
+            )
+        elif entity_type == 'blog':
+            await session.execute(
+                update(Blog)
+                .where(Blog.id == entity_id, Blog.cover_image == image_url)
+                .values(cover_image=None, cover_image_renditions=None, updated_at=now)
+            )
+        else:
+            raise ValueError(f"Invalid entity type: {entity_type}")
+
+        await session.commit()
+        await notify_change(entity_type, [entity_id])
+        await storage_service.discard_image(image_url, ImageManager.get_bucket_for_entity(entity_type))
+
+    async def get_pending_ids(
+        self,
+        session: AsyncSession,
+        entity_type: str,
+        limit: Optional[int] = None
+    ) -> List[uuid.UUID]:
+        """Ids of entities that still have images without renditions"""
+        if entity_type == 'package':
+            statement = select(Package.id).where(or_(
+                and_(Package.featured_image.is_not(None), Package.featured_image_renditions.is_(None)),
+                Package.id.in_(select(PackageImage.package_id).where(PackageImage.renditions.is_(None)))
+            ))
+        elif entity_type == 'destination':
+            statement = select(Destination.id).where(
+                Destination.featured_image.is_not(None),
+                Destination.featured_image_renditions.is_(None)
+            )
+        elif entity_type == 'blog':
+            statement = select(Blog.id).where(
+                Blog.cover_image.is_not(None),
+                Blog.cover_image_renditions.is_(None)
+            )
+        else:
+            raise ValueError(f"Invalid entity type: {entity_type}")
+
+        if limit:
+            statement = statement.limit(limit)
+        return list((await session.exec(statement)).all())
+
+    async def backfill(
+        self,
+        session: AsyncSession,
+        entity_types: Optional[List[str]] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Process every stored image that has no renditions yet"""
+        summary = {}
+        for entity_type in entity_types or ImageManager.get_supported_entities():
+            entity_ids = await self.get_pending_ids(session, entity_type, limit)
+            processed = 0
+            failed = 0
+            for entity_id in entity_ids:
+                try:
+                    processed += await self.process(session, entity_type, entity_id)
+                except Exception as e:
+                    await session.rollback()
+                    failed += 1
+                    print(f"Rendition backfill failed for {entity_type} {entity_id}: {str(e)}")
+            summary[entity_type] = {
+                "entities": len(entity_ids),
+                "images_processed": processed,
+                "failed": failed
+            }
+        return summary
+
+
+image_rendition_service = ImageRenditionService()
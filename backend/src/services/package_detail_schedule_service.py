@@ -4,10 +4,13 @@ Service for combined package details and schedule operations
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 from typing import Optional
+from datetime import datetime
 import uuid
 
 from ..models.package_detail_schedule import PackageDetailSchedule
 from ..models.package import Package
+from ..utils.package_content import structured_content
+from .catalog_events import notify_change
 from ..schemas.package_detail_schedule_schemas import (
     PackageDetailScheduleCreateModel,
     PackageDetailScheduleUpdateModel
@@ -16,6 +19,15 @@ from ..schemas.package_detail_schedule_schemas import (
 class PackageDetailScheduleService:
     """Service class for combined package details and schedule operations"""
 
+    async def _touch_package(self, session: AsyncSession, package_id: uuid.UUID) -> None:
+        """
+        Schedule writes change what a package shows; bump its updated_at (server-local
+        time, like the other catalog tables) so delta sync and publishing see them
+        """
+        await session.execute(
+            Package.__table__.update().where(Package.id == package_id).values(updated_at=datetime.now())
+        )
+
     async def create_detail_schedule(
         self,
         session: AsyncSession,
@@ -34,10 +46,13 @@ class PackageDetailScheduleService:
         if existing:
             raise ValueError("Detail/schedule already exists for this package")
         # Create new
-        detail_schedule = PackageDetailSchedule(**data.dict())
+        values = data.dict()
+        detail_schedule = PackageDetailSchedule(**values, **structured_content(values))
         session.add(detail_schedule)
+        await self._touch_package(session, data.package_id)
         await session.commit()
         await session.refresh(detail_schedule)
+        await notify_change("package", [data.package_id])
         return detail_schedule
 
     async def get_by_package_id(self, session: AsyncSession, package_id: uuid.UUID) -> Optional[PackageDetailSchedule]:
@@ -56,10 +71,13 @@ class PackageDetailScheduleService:
         detail_schedule = result.first()
         if not detail_schedule:
             return None
-        for field, value in update_data.dict(exclude_unset=True).items():
+        values = update_data.dict(exclude_unset=True)
+        for field, value in {**values, **structured_content(values)}.items():
             setattr(detail_schedule, field, value)
+        await self._touch_package(session, package_id)
         await session.commit()
         await session.refresh(detail_schedule)
+        await notify_change("package", [package_id])
         return detail_schedule
 
     async def delete_by_package_id(self, session: AsyncSession, package_id: uuid.UUID) -> bool:
@@ -69,7 +87,9 @@ class PackageDetailScheduleService:
         if not detail_schedule:
             return False
         await session.delete(detail_schedule)
+        await self._touch_package(session, package_id)
         await session.commit()
+        await notify_change("package", [package_id])
         return True
 
 package_detail_schedule_service = PackageDetailScheduleService()
@@ -10,6 +10,8 @@ from ..schemas.package_image_schemas import (
     PackageImageUpdateModel,
     PackageImageResponseModel
 )
+from .catalog_events import notify_change
+from .storage_service import storage_service
 
 
 class PackageImageService:
@@ -44,6 +46,7 @@ class PackageImageService:
         db.add(db_image)
         await db.commit()
         await db.refresh(db_image)
+        await notify_change("package", [package_id])
         
         return PackageImageResponseModel.model_validate(db_image)
     
@@ -85,6 +88,7 @@ class PackageImageService:
         # Refresh all images
         for db_image in db_images:
             await db.refresh(db_image)
+        await notify_change("package", [package_id])
         
         return [PackageImageResponseModel.model_validate(img) for img in db_images]
     
@@ -128,6 +132,7 @@ class PackageImageService:
         
         await db.commit()
         await db.refresh(db_image)
+        await notify_change("package", [db_image.package_id])
         
         return PackageImageResponseModel.model_validate(db_image)
     
@@ -144,8 +149,12 @@ class PackageImageService:
         if not db_image:
             return False
         
+        package_id = db_image.package_id
+        image_url = db_image.image_url
         await db.delete(db_image)
         await db.commit()
+        await storage_service.release_images([image_url], "package-images")
+        await notify_change("package", [package_id])
         return True
     
     @staticmethod
@@ -154,10 +163,13 @@ class PackageImageService:
         package_id: uuid.UUID
     ) -> bool:
         """Delete all images for a package."""
-        await db.execute(
-            delete(PackageImage).where(PackageImage.package_id == package_id)
+        result = await db.execute(
+            delete(PackageImage).where(PackageImage.package_id == package_id).returning(PackageImage.image_url)
         )
+        image_urls = result.scalars().all()
         await db.commit()
+        await storage_service.release_images(image_urls, "package-images")
+        await notify_change("package", [package_id])
         return True
     
     @staticmethod
@@ -176,6 +188,7 @@ class PackageImageService:
             await db.execute(update_statement)
         
         await db.commit()
+        await notify_change("package", [package_id])
         
         # Return updated images
         return await PackageImageService.get_package_images(db, package_id)
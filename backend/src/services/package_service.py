@@ -1,47 +1,78 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+from collections import Counter
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, func, delete
+from sqlmodel import select, func, delete, update
+from sqlalchemy import case, and_, true, tuple_
 from sqlalchemy.orm import selectinload
-from datetime import datetime
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.dialects.postgresql import TSRANGE
+from datetime import datetime, date, time
+import uuid
 
 from ..models.package import Package
 from ..models.package_image import PackageImage
 from ..models.package_detail_schedule import PackageDetailSchedule
+from ..models.destination import Destination
 from ..models.booking import Booking, BookingStatus
+from ..auth.models import User
 from ..schemas.package_schemas import (
     PackageCreateModel, 
     PackageUpdateModel, 
     PackageResponseModel,
     PackageDetailResponseModel
 )
-from ..schemas.package_detail_schedule_schemas import PackageDetailScheduleCreateModel
-from .package_detail_schedule_service import package_detail_schedule_service
+from ..schemas.bulk_schemas import (
+    BulkSelectionModel,
+    PackageBulkUpdateModel,
+    PackageBulkDeleteModel,
+    BulkOperationResponseModel
+)
+from ..utils.sql_utils import matches_any
+from ..utils.package_content import structured_content
+from .catalog_events import notify_change
+from .detail_cache import detail_cache
+from .sync_service import sync_service
+from .storage_service import storage_service
+
+
+# Fields of PackageCreateModel/PackageUpdateModel stored on package_detail_schedule
+DETAIL_SCHEDULE_FIELDS = {
+    'duration_days', 'duration_nights', 'max_group_size', 'available_from', 'available_until',
+    'highlights', 'itinerary', 'inclusions', 'exclusions', 'terms_conditions'
+}
+
+# (key, min days, max days) buckets for the duration facet; None means open ended
+DURATION_BUCKETS = [
+    ("1-3", 1, 3),
+    ("4-7", 4, 7),
+    ("8-14", 8, 14),
+    ("15+", 15, None),
+]
+
+# How travel dates are matched against a package's availability window
+AVAILABILITY_MODES = ("overlap", "contain")
+
+# Bookings that keep a package from being deleted
+ACTIVE_BOOKING_STATUSES = [BookingStatus.PENDING, BookingStatus.CONFIRMED]
 
 
 class PackageService:
-    async def get_packages(
+    def apply_package_filters(
         self,
-        session: AsyncSession,
-        page: int = 1,
-        limit: int = 10,
+        statement,
         search: Optional[str] = None,
-        active_only: bool = False,
         destination_id: Optional[str] = None,
         min_price: Optional[float] = None,
-        max_price: Optional[float] = None
-    ) -> Dict[str, Any]:
-        """Get paginated list of packages with filtering"""
+        max_price: Optional[float] = None,
+        is_active: Optional[bool] = None,
+        is_featured: Optional[bool] = None
+    ):
+        """Apply the admin list filters to a select, update or delete statement"""
+        if is_active is not None:
+            statement = statement.where(Package.is_active == is_active)
         
-         
-        statement = select(Package).options(
-            selectinload(Package.images),
-            selectinload(Package.destination),
-            selectinload(Package.detail_schedule)
-        )
-        
-        # Add filters
-        if active_only:
-            statement = statement.where(Package.is_active == True)
+        if is_featured is not None:
+            statement = statement.where(Package.is_featured == is_featured)
         
         if search:
             search_term = f"%{search}%"
@@ -53,38 +84,47 @@ class PackageService:
         if destination_id:
             statement = statement.where(Package.destination_id == destination_id)
         
-        # trip_type_id logic removed
-        
         if min_price is not None:
             statement = statement.where(Package.price >= min_price)
         
         if max_price is not None:
             statement = statement.where(Package.price <= max_price)
         
-        # Get total count
-        count_statement = select(func.count(Package.id))
-        
-        # Apply the same filters to count statement
-        if active_only:
-            count_statement = count_statement.where(Package.is_active == True)
-        
-        if search:
-            search_term = f"%{search}%"
-            count_statement = count_statement.where(
-                (Package.title.ilike(search_term)) |
-                (Package.description.ilike(search_term))
-            )
-        
-        if destination_id:
-            count_statement = count_statement.where(Package.destination_id == destination_id)
-        
-        # trip_type_id logic removed
+        return statement
+    
+    def _apply_bulk_selection(self, statement, selection: BulkSelectionModel):
+        """Restrict a statement to the packages picked by a bulk request"""
+        if selection.ids is not None:
+            return statement.where(matches_any(Package.id, selection.ids))
+        return self.apply_package_filters(statement, **selection.filter.model_dump())
+    
+    async def get_packages(
+        self,
+        session: AsyncSession,
+        page: int = 1,
+        limit: int = 10,
+        search: Optional[str] = None,
+        active_only: bool = False,
+        destination_id: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Get paginated list of packages with filtering"""
         
-        if min_price is not None:
-            count_statement = count_statement.where(Package.price >= min_price)
+         
+        statement = select(Package).options(selectinload(Package.detail_schedule))
+        
+        filters = dict(
+            search=search,
+            destination_id=destination_id,
+            min_price=min_price,
+            max_price=max_price,
+            is_active=True if active_only else None
+        )
+        statement = self.apply_package_filters(statement, **filters)
         
-        if max_price is not None:
-            count_statement = count_statement.where(Package.price <= max_price)
+        # Get total count with the same filters
+        count_statement = self.apply_package_filters(select(func.count(Package.id)), **filters)
         
         total_result = await session.exec(count_statement)
         total = total_result.first() or 0
@@ -100,28 +140,10 @@ class PackageService:
         # Calculate pagination info
         total_pages = (total + limit - 1) // limit
         
-        # Convert to response models using the new combined detail/schedule
-        package_responses = []
-        for package in packages:
-            package_dict = package.model_dump()
-            # Fetch combined detail/schedule
-            detail_schedule = await package_detail_schedule_service.get_by_package_id(session, package.id)
-            if detail_schedule:
-                ds_dict = detail_schedule.model_dump()
-                # Always set duration_days and duration_nights from detail_schedule if it exists
-                for key in [
-                    'duration_days', 'duration_nights', 'max_group_size', 'available_from', 'available_until',
-                    'highlights', 'itinerary', 'inclusions', 'exclusions', 'terms_conditions']:
-                    if key in ['duration_days', 'duration_nights']:
-                        package_dict[key] = ds_dict.get(key)
-                    else:
-                        if package_dict.get(key) is None:
-                            package_dict[key] = ds_dict.get(key)
-            if package.images:
-                package_dict['image_gallery'] = [img.image_url for img in sorted(package.images, key=lambda x: x.display_order)]
-            # Debug log
-            print(f"[get_packages] Package {package.id}: duration_days={package_dict.get('duration_days')}, duration_nights={package_dict.get('duration_nights')}")
-            package_responses.append(PackageResponseModel.model_validate(package_dict))
+        package_responses = [
+            PackageResponseModel.model_validate(self.to_list_item(package))
+            for package in packages
+        ]
         return {
             "packages": package_responses,
             "total": total,
@@ -130,6 +152,196 @@ class PackageService:
             "total_pages": total_pages
         }
     
+    def to_list_item(self, package: Package) -> Dict[str, Any]:
+        """
+        List view of a package (detail_schedule must be loaded): its own columns,
+        the duration and the inclusion tags instead of the detail text.
+        """
+        package_dict = package.model_dump()
+        if package.detail_schedule:
+            package_dict['duration_days'] = package.detail_schedule.duration_days
+            package_dict['duration_nights'] = package.detail_schedule.duration_nights
+            package_dict['inclusion_tags'] = package.detail_schedule.inclusion_tags
+        return package_dict
+    
+    def _duration_bucket(self, duration_days):
+        """SQL expression mapping duration_days to a DURATION_BUCKETS key"""
+        whens = []
+        for key, low, high in DURATION_BUCKETS:
+            condition = duration_days >= low if high is None else duration_days.between(low, high)
+            whens.append((condition, key))
+        return case(*whens, else_=None)
+    
+    def _availability_condition(
+        self,
+        available_from: Optional[date],
+        available_until: Optional[date],
+        availability: str = "overlap"
+    ):
+        """Match the requested travel dates (inclusive, either may be open) against available_period"""
+        if availability not in AVAILABILITY_MODES:
+            raise ValueError(f"Invalid availability mode. Use one of: {', '.join(AVAILABILITY_MODES)}")
+        requested = func.tsrange(
+            datetime.combine(available_from, time.min) if available_from else None,
+            datetime.combine(available_until, time.min) if available_until else None,
+            '[]',
+            type_=TSRANGE
+        )
+        period = PackageDetailSchedule.__table__.c.available_period
+        if availability == "contain":
+            return period.contains(requested)
+        return period.overlaps(requested)
+    
+    async def search_packages(
+        self,
+        session: AsyncSession,
+        page: int = 1,
+        limit: int = 12,
+        search: Optional[str] = None,
+        destination_ids: Optional[List[uuid.UUID]] = None,
+        countries: Optional[List[str]] = None,
+        durations: Optional[List[str]] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        price_bucket_size: float = 500,
+        available_from: Optional[date] = None,
+        available_until: Optional[date] = None,
+        availability: str = "overlap",
+        inclusions: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Search active packages and count them by destination, country, duration
+        bucket and price bucket. Facets are computed in one GROUPING SETS query;
+        each facet's counts apply every filter except its own dimension, so the
+        UI can show what selecting another value would return.
+        
+        available_from/available_until select travel dates: "overlap" keeps
+        packages bookable on any of those days, "contain" only packages whose
+        availability window covers all of them. Both use the GiST-indexed
+        available_period range.
+        
+        inclusions keeps packages whose inclusion tags contain all of the given
+        tags (a GIN-indexed @> on inclusion_tags).
+        """
+        # Active packages matching the free-text search, with the facet columns
+        base = select(
+            Package.id.label("package_id"),
+            Package.destination_id.label("destination_id"),
+            Destination.name.label("destination_name"),
+            Destination.country.label("country"),
+            self._duration_bucket(PackageDetailSchedule.duration_days).label("duration"),
+            (func.floor(Package.price / price_bucket_size) * price_bucket_size).label("price_bucket"),
+            Package.price.label("price")
+        ).join(
+            Destination, Package.destination_id == Destination.id
+        ).outerjoin(
+            PackageDetailSchedule, PackageDetailSchedule.package_id == Package.id
+        ).where(Package.is_active == True)
+        if search:
+            search_term = f"%{search}%"
+            base = base.where(Package.title.ilike(search_term) | Package.description.ilike(search_term))
+        if available_from or available_until:
+            base = base.where(self._availability_condition(available_from, available_until, availability))
+        if inclusions:
+            base = base.where(PackageDetailSchedule.inclusion_tags.contains(sorted(set(inclusions))))
+        matches = base.cte("matches")
+        
+        conditions = {}
+        if destination_ids:
+            conditions["destination"] = matches.c.destination_id.in_(destination_ids)
+        if countries:
+            conditions["country"] = matches.c.country.in_(countries)
+        if durations:
+            conditions["duration"] = matches.c.duration.in_(durations)
+        price_conditions = []
+        if min_price is not None:
+            price_conditions.append(matches.c.price >= min_price)
+        if max_price is not None:
+            price_conditions.append(matches.c.price <= max_price)
+        if price_conditions:
+            conditions["price"] = and_(*price_conditions)
+        
+        def count_excluding(dimension: Optional[str]):
+            applied = [condition for key, condition in conditions.items() if key != dimension]
+            return func.count().filter(and_(true(), *applied))
+        
+        facet_statement = select(
+            func.grouping(
+                matches.c.destination_id, matches.c.country, matches.c.duration, matches.c.price_bucket
+            ).label("grouping"),
+            matches.c.destination_id,
+            matches.c.destination_name,
+            matches.c.country,
+            matches.c.duration,
+            matches.c.price_bucket,
+            count_excluding("destination").label("destination_count"),
+            count_excluding("country").label("country_count"),
+            count_excluding("duration").label("duration_count"),
+            count_excluding("price").label("price_count"),
+            count_excluding(None).label("total")
+        ).group_by(func.grouping_sets(
+            tuple_(matches.c.destination_id, matches.c.destination_name),
+            tuple_(matches.c.country),
+            tuple_(matches.c.duration),
+            tuple_(matches.c.price_bucket),
+            tuple_()
+        ))
+        
+        facets = {"destinations": [], "countries": [], "durations": [], "prices": []}
+        total = 0
+        # grouping() sets a bit for every column not in the row's grouping set
+        for row in (await session.exec(facet_statement)).all():
+            if row.grouping == 0b0111:
+                if row.destination_count:
+                    facets["destinations"].append({
+                        "value": str(row.destination_id),
+                        "label": row.destination_name,
+                        "count": row.destination_count
+                    })
+            elif row.grouping == 0b1011:
+                if row.country_count:
+                    facets["countries"].append({"value": row.country, "count": row.country_count})
+            elif row.grouping == 0b1101:
+                if row.duration is not None and row.duration_count:
+                    facets["durations"].append({"value": row.duration, "count": row.duration_count})
+            elif row.grouping == 0b1110:
+                if row.price_count:
+                    low = float(row.price_bucket)
+                    facets["prices"].append({"min": low, "max": low + price_bucket_size, "count": row.price_count})
+            else:
+                total = row.total
+        
+        facets["destinations"].sort(key=lambda facet: (-facet["count"], facet["label"] or ""))
+        facets["countries"].sort(key=lambda facet: (-facet["count"], facet["value"]))
+        duration_order = [key for key, _, _ in DURATION_BUCKETS]
+        facets["durations"].sort(key=lambda facet: duration_order.index(facet["value"]))
+        facets["prices"].sort(key=lambda facet: facet["min"])
+        
+        # The page itself, filtered on every dimension
+        page_ids = select(matches.c.package_id)
+        if conditions:
+            page_ids = page_ids.where(and_(*conditions.values()))
+        statement = select(Package).options(
+            selectinload(Package.detail_schedule)
+        ).where(Package.id.in_(page_ids)).order_by(
+            Package.created_at.desc()
+        ).offset((page - 1) * limit).limit(limit)
+        packages = (await session.exec(statement)).all()
+        
+        package_responses = [
+            PackageResponseModel.model_validate(self.to_list_item(package))
+            for package in packages
+        ]
+        
+        return {
+            "packages": package_responses,
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "total_pages": (total + limit - 1) // limit,
+            "facets": facets
+        }
+    
     async def get_package_by_id(self, session: AsyncSession, package_id: str) -> Optional[Package]:
         """Get a single package by ID with all relationships (except old schedule/details)"""
         statement = select(Package).options(
@@ -141,13 +353,53 @@ class PackageService:
     
     async def get_package_detail(self, session: AsyncSession, package_id: str) -> Optional[PackageDetailResponseModel]:
         """Get detailed package information with all related data (using combined detail/schedule)"""
-        package = await self.get_package_by_id(session, package_id)
-        if not package:
+        try:
+            package_uuid = uuid.UUID(str(package_id))
+        except ValueError:
             return None
-        # Build detailed response
+        details = await self.get_package_details(session, [package_uuid])
+        return details.get(package_uuid)
+    
+    async def get_package_details(
+        self,
+        session: AsyncSession,
+        package_ids: List[uuid.UUID]
+    ) -> Dict[uuid.UUID, PackageDetailResponseModel]:
+        """
+        Detail responses keyed by id for the packages that exist. Cached details
+        are reused; the rest are loaded with one query plus eager loads and cached.
+        """
+        package_ids = list(dict.fromkeys(package_ids))
+        details = await detail_cache.get_many("package", package_ids, PackageDetailResponseModel)
+        missing = [package_id for package_id in package_ids if package_id not in details]
+        if missing:
+            statement = select(Package).options(
+                selectinload(Package.images),
+                selectinload(Package.destination),
+                selectinload(Package.detail_schedule)
+            ).where(matches_any(Package.id, missing))
+            loaded = {
+                package.id: self._build_detail_response(
+                    package,
+                    package.detail_schedule,
+                    package.images,
+                    package.destination.name if package.destination else None
+                )
+                for package in (await session.exec(statement)).all()
+            }
+            await detail_cache.set_many("package", loaded)
+            details.update(loaded)
+        return details
+    
+    def _build_detail_response(
+        self,
+        package: Package,
+        detail_schedule: Optional[PackageDetailSchedule],
+        images: List[PackageImage],
+        destination_name: Optional[str]
+    ) -> PackageDetailResponseModel:
+        """Build the detailed response from already loaded objects"""
         package_dict = package.model_dump()
-        # Add related data from combined detail/schedule
-        detail_schedule = await package_detail_schedule_service.get_by_package_id(session, package.id)
         if detail_schedule:
             ds_dict = detail_schedule.model_dump()
             package_dict.update({
@@ -159,12 +411,14 @@ class PackageService:
                 'inclusions': ds_dict.get('inclusions'),
                 'exclusions': ds_dict.get('exclusions'),
                 'terms_conditions': ds_dict.get('terms_conditions'),
+                'itinerary_days': ds_dict.get('itinerary_days'),
+                'inclusion_tags': ds_dict.get('inclusion_tags'),
             })
-        if package.images:
-            package_dict['images'] = [img.model_dump() for img in package.images]
-            package_dict['image_gallery'] = [img.image_url for img in sorted(package.images, key=lambda x: x.display_order)]
-        if package.destination:
-            package_dict['destination_name'] = package.destination.name
+        if images:
+            package_dict['images'] = [img.model_dump() for img in images]
+            package_dict['image_gallery'] = [img.image_url for img in sorted(images, key=lambda x: x.display_order)]
+        if destination_name:
+            package_dict['destination_name'] = destination_name
         return PackageDetailResponseModel.model_validate(package_dict)
     
     async def create_package(
@@ -172,77 +426,76 @@ class PackageService:
         session: AsyncSession,
         package_data: PackageCreateModel,
         admin_id: Optional[str] = None
-    ) -> Package:
-        """Create a new package with related schedule and details, recording the admin who created it."""
+    ) -> PackageDetailResponseModel:
+        """
+        Create a package with its detail/schedule and gallery, recording the admin
+        who created it. Everything is written in one transaction with one flush.
+        """
+        destination_name = (await session.exec(
+            select(Destination.name).where(Destination.id == package_data.destination_id)
+        )).first()
+        if destination_name is None:
+            raise ValueError("Destination not found")
 
         # Extract normalized data for the main package
-        package_dict = package_data.model_dump(exclude={
-            'duration_days', 'duration_nights', 'max_group_size',
-            'available_from', 'available_until', 'highlights', 'itinerary',
-            'inclusions', 'exclusions', 'terms_conditions', 'image_gallery'
-        })
+        package_dict = package_data.model_dump(exclude=DETAIL_SCHEDULE_FIELDS | {'image_gallery'})
         if admin_id:
             package_dict['created_by'] = admin_id
 
-        # Create main package
-        new_package = Package(**package_dict)
+        now = datetime.now()
+        new_package = Package(**package_dict, created_at=now, updated_at=now)
         session.add(new_package)
-        await session.commit()
-        await session.refresh(new_package)
 
-        # Create combined detail/schedule with provided data
-        detail_schedule_data = PackageDetailScheduleCreateModel(
+        # Combined detail/schedule with provided data and its parsed itinerary/inclusions
+        detail_values = package_data.model_dump(include=DETAIL_SCHEDULE_FIELDS)
+        detail_schedule = PackageDetailSchedule(
             package_id=new_package.id,
-            duration_days=package_data.duration_days,
-            duration_nights=package_data.duration_nights,
-            max_group_size=package_data.max_group_size,
-            available_from=package_data.available_from,
-            available_until=package_data.available_until,
-            highlights=package_data.highlights,
-            itinerary=package_data.itinerary,
-            inclusions=package_data.inclusions,
-            exclusions=package_data.exclusions,
-            terms_conditions=package_data.terms_conditions
+            created_at=now,
+            updated_at=now,
+            **detail_values,
+            **structured_content(detail_values)
         )
-        try:
-            await package_detail_schedule_service.create_detail_schedule(session, detail_schedule_data)
-            print(f"Created detail/schedule for package {new_package.id}")
-        except Exception as e:
-            print(f"Error creating detail/schedule: {str(e)}")
+        session.add(detail_schedule)
 
-        # Create package images if provided
-        if package_data.image_gallery:
-            from ..services.package_image_service import package_image_service
-            from ..schemas.package_image_schemas import PackageImageCreateModel
+        # Gallery images, the first one primary
+        images = [
+            PackageImage(
+                package_id=new_package.id,
+                image_url=image_url,
+                display_order=i,
+                is_primary=(i == 0),
+                created_at=now
+            )
+            for i, image_url in enumerate(package_data.image_gallery or [])
+        ]
+        session.add_all(images)
 
-            # Add all gallery images to the package
-            for i, image_url in enumerate(package_data.image_gallery):
-                image_data = PackageImageCreateModel(
-                    image_url=image_url,
-                    display_order=i,
-                    is_primary=(i == 0)  # Make the first image primary
-                )
-                try:
-                    await package_image_service.create_package_image(
-                        session, new_package.id, image_data
-                    )
-                    print(f"Created image {i} for package {new_package.id}")
-                except Exception as e:
-                    print(f"Error creating image {i}: {str(e)}")
+        try:
+            await session.flush()
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
 
-        # Return the refreshed package with all relations and formatted data
-        package = await self.get_package_by_id(session, str(new_package.id))
-        return await self.get_package_detail(session, str(new_package.id))
+        await notify_change("package", [new_package.id])
+        return self._build_detail_response(new_package, detail_schedule, images, destination_name)
     
     async def update_package(
         self,
         session: AsyncSession,
         package_id: str,
         package_data: PackageUpdateModel
-    ) -> Optional[Package]:
-        """Update an existing package and its related data"""
-        # Get existing package
-        package = await self.get_package_by_id(session, package_id)
+    ) -> Optional[PackageDetailResponseModel]:
+        """
+        Update a package and its related data in one transaction. The gallery is
+        synced by diffing URLs, so unchanged images (and their renditions) are kept.
+        """
+        statement = select(Package).options(
+            selectinload(Package.images),
+            selectinload(Package.destination),
+            selectinload(Package.detail_schedule)
+        ).where(Package.id == package_id)
+        package = (await session.exec(statement)).first()
         if not package:
             return None
 
@@ -253,139 +506,277 @@ class PackageService:
         }
 
         update_data = package_data.model_dump(exclude_unset=True, exclude_none=True)
+        now = datetime.now()
+        # Images this update stops using, released once it has committed
+        released_images = []
+        if update_data.get('featured_image', package.featured_image) != package.featured_image:
+            released_images.append(package.featured_image)
 
-        for field, value in update_data.items():
-            if field in main_package_fields and hasattr(package, field):
-                setattr(package, field, value)
+        try:
+            for field, value in update_data.items():
+                if field in main_package_fields and hasattr(package, field):
+                    setattr(package, field, value)
 
-        package.updated_at = datetime.now()
-        session.add(package)
-        await session.commit()
-        await session.refresh(package)
+            # Renditions belong to the previous image; they are regenerated in the background
+            if 'featured_image' in update_data:
+                package.featured_image_renditions = None
 
-        # Update or create combined detail/schedule if any relevant data provided
-        combined_fields = {
-            'duration_days', 'duration_nights', 'max_group_size', 'available_from', 'available_until',
-            'highlights', 'itinerary', 'inclusions', 'exclusions', 'terms_conditions'
-        }
-        combined_updates = {k: v for k, v in update_data.items() if k in combined_fields}
-        if combined_updates:
-            from ..schemas.package_detail_schedule_schemas import PackageDetailScheduleUpdateModel, PackageDetailScheduleCreateModel
-            # Check if detail_schedule exists
-            detail_schedule = await package_detail_schedule_service.get_by_package_id(session, package.id)
-            if detail_schedule:
-                detail_schedule_update = PackageDetailScheduleUpdateModel(**combined_updates)
-                await package_detail_schedule_service.update_detail_schedule(session, package.id, detail_schedule_update)
+            package.updated_at = now
+
+            # Update or create combined detail/schedule if any relevant data provided
+            detail_schedule = package.detail_schedule
+            combined_updates = {k: v for k, v in update_data.items() if k in DETAIL_SCHEDULE_FIELDS}
+            combined_updates.update(structured_content(combined_updates))
+            if combined_updates:
+                if detail_schedule:
+                    for field, value in combined_updates.items():
+                        setattr(detail_schedule, field, value)
+                    detail_schedule.updated_at = now
+                else:
+                    # Creating requires the duration fields; fall back to 1 like before
+                    for f in ('duration_days', 'duration_nights'):
+                        if combined_updates.get(f) is None:
+                            combined_updates[f] = 1
+                    detail_schedule = PackageDetailSchedule(
+                        package_id=package.id,
+                        created_at=now,
+                        updated_at=now,
+                        **combined_updates
+                    )
+                    session.add(detail_schedule)
+
+            images = list(package.images)
+            if 'image_gallery' in update_data:
+                kept = await self._sync_gallery(session, package.id, images, update_data['image_gallery'], now)
+                kept_ids = {image.id for image in kept}
+                released_images.extend(image.image_url for image in images if image.id not in kept_ids)
+                images = kept
+
+            await session.flush()
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+        if package.destination and package.destination.id == package.destination_id:
+            destination_name = package.destination.name
+        else:
+            destination_name = (await session.exec(
+                select(Destination.name).where(Destination.id == package.destination_id)
+            )).first()
+
+        await storage_service.release_images(released_images, "package-images")
+        await notify_change("package", [package.id])
+        return self._build_detail_response(package, detail_schedule, images, destination_name)
+    
+    async def _sync_gallery(
+        self,
+        session: AsyncSession,
+        package_id: uuid.UUID,
+        existing: List[PackageImage],
+        image_urls: List[str],
+        now: datetime
+    ) -> List[PackageImage]:
+        """
+        Make the package gallery match image_urls (in order, first one primary)
+        with at most one DELETE, one INSERT and one UPDATE. Returns the resulting
+        images without re-querying them.
+        """
+        table = PackageImage.__table__
+
+        # Match each wanted URL to an existing row with that URL, if any
+        unmatched: Dict[str, List[PackageImage]] = {}
+        for image in sorted(existing, key=lambda x: x.display_order):
+            unmatched.setdefault(image.image_url, []).append(image)
+
+        gallery = []
+        new_rows = []
+        reorder = {}
+        for index, image_url in enumerate(image_urls):
+            candidates = unmatched.get(image_url)
+            if candidates:
+                image = candidates.pop(0)
+                if image.display_order != index or image.is_primary != (index == 0):
+                    reorder[image.id] = index
             else:
-                # If not exists, create it (requires all required fields)
-                # Try to get required fields from update_data, fallback to defaults if needed
-                required_fields = ['duration_days', 'duration_nights']
-                missing = [f for f in required_fields if f not in combined_updates]
-                if missing:
-                    # Try to get from package (if possible)
-                    for f in missing:
-                        val = getattr(package, f, None)
-                        if val is not None:
-                            combined_updates[f] = val
-                # If still missing required, set to 1 (safe fallback)
-                for f in required_fields:
-                    if f not in combined_updates or combined_updates[f] is None:
-                        combined_updates[f] = 1
-                detail_schedule_create = PackageDetailScheduleCreateModel(
-                    package_id=package.id,
-                    **combined_updates
+                image = PackageImage(
+                    package_id=package_id,
+                    image_url=image_url,
+                    display_order=index,
+                    is_primary=(index == 0),
+                    created_at=now
                 )
-                await package_detail_schedule_service.create_detail_schedule(session, detail_schedule_create)
+                new_rows.append({
+                    'id': image.id,
+                    'package_id': package_id,
+                    'image_url': image_url,
+                    'alt_text': None,
+                    'display_order': index,
+                    'is_primary': index == 0,
+                    'created_at': now
+                })
+            gallery.append(image)
 
-        # Update package images if provided
-        if 'image_gallery' in update_data:
-            from ..services.package_image_service import package_image_service
-            from ..schemas.package_image_schemas import PackageImageCreateModel
+        removed_ids = [image.id for images in unmatched.values() for image in images]
+        if removed_ids:
+            await session.execute(table.delete().where(table.c.id.in_(removed_ids)))
 
-            # Delete existing images for this package
-            await session.execute(delete(PackageImage).where(PackageImage.package_id == package.id))
-            await session.commit()
+        if reorder:
+            await session.execute(
+                table.update()
+                .where(table.c.id.in_(list(reorder)))
+                .values(
+                    display_order=case(reorder, value=table.c.id),
+                    is_primary=case({image_id: index == 0 for image_id, index in reorder.items()}, value=table.c.id)
+                )
+            )
+            # Keep the loaded objects in step without marking them dirty
+            for image in gallery:
+                if image.id in reorder:
+                    set_committed_value(image, 'display_order', reorder[image.id])
+                    set_committed_value(image, 'is_primary', reorder[image.id] == 0)
 
-            # Add all gallery images to the package
-            if update_data.get('image_gallery'):
-                for i, image_url in enumerate(update_data['image_gallery']):
-                    image_data = PackageImageCreateModel(
-                        image_url=image_url,
-                        display_order=i,
-                        is_primary=(i == 0)  # Make the first image primary
-                    )
-                    try:
-                        await package_image_service.create_package_image(
-                            session, package.id, image_data
-                        )
-                    except Exception as e:
-                        print(f"Error creating image {i}: {str(e)}")
+        if new_rows:
+            await session.execute(table.insert().values(new_rows))
 
-        # Make sure to fetch the updated package with all relations and return formatted data
-        return await self.get_package_detail(session, package_id)
+        return gallery
     
     async def delete_package(self, session: AsyncSession, package_id: str) -> bool:
         """Delete a package and its related data (cascaded by foreign keys)"""
+        # First get the package to verify it exists (this method handles UUID conversion)
+        package = await self.get_package_by_id(session, package_id)
+        if not package:
+            return False
+        
         try:
-            # First get the package to verify it exists (this method handles UUID conversion)
-            package = await self.get_package_by_id(session, package_id)
-            if not package:
-                return False
-            
-            # Check if there are any active bookings for this package
-            booking_query = select(Booking).where(
-                Booking.package_id == package_id,
-                Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED])
-            )
-            existing_bookings = await session.exec(booking_query)
-            existing_bookings_list = existing_bookings.all()
-            
-            if existing_bookings_list:
+            _, blocked, released_images = await self._delete_packages(session, [package.id])
+            if blocked:
                 # Don't allow deletion if there are active bookings
-                booking_details = []
-                for booking in existing_bookings_list:
-                    booking_details.append(f"Booking ID: {booking.id} (Status: {booking.status})")
-                
+                active_bookings = (await session.exec(
+                    select(Booking.id, Booking.status).where(
+                        Booking.package_id == package.id,
+                        Booking.status.in_(ACTIVE_BOOKING_STATUSES)
+                    )
+                )).all()
+                booking_details = [
+                    f"Booking ID: {booking_id} (Status: {status})" for booking_id, status in active_bookings
+                ]
                 raise ValueError(
-                    f"Cannot delete package. There are {len(existing_bookings_list)} active booking(s) for this package. "
+                    f"Cannot delete package. There are {len(active_bookings)} active booking(s) for this package. "
                     f"Please cancel or complete these bookings first:\n" + "\n".join(booking_details)
                 )
-            
-            # Delete related records in the correct order
-            
-            # 1. Delete package images
-            image_query = select(PackageImage).where(PackageImage.package_id == package_id)
-            images = await session.exec(image_query)
-            for image in images.all():
-                await session.delete(image)
-            
-            # 2. Delete package detail schedule
-            schedule_query = select(PackageDetailSchedule).where(PackageDetailSchedule.package_id == package_id)
-            schedules = await session.exec(schedule_query)
-            for schedule in schedules.all():
-                await session.delete(schedule)
-            
-            # 3. Delete completed/cancelled bookings (allow deletion of historical records)
-            historical_booking_query = select(Booking).where(
-                Booking.package_id == package_id,
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        
+        await storage_service.release_images(released_images, "package-images")
+        await notify_change("package", [package.id])
+        return True
+    
+    async def _delete_packages(
+        self,
+        session: AsyncSession,
+        package_ids: List[uuid.UUID]
+    ) -> Tuple[List[uuid.UUID], List[uuid.UUID], List[str]]:
+        """
+        Delete packages together with their images, detail/schedule and historical
+        bookings using one statement per table. Packages with pending or confirmed
+        bookings are left alone. Returns (deleted ids, blocked ids, image URLs to
+        release); the caller commits and then releases the images.
+        """
+        if not package_ids:
+            return [], [], []
+        
+        blocked = set((await session.exec(
+            select(Booking.package_id).where(
+                matches_any(Booking.package_id, package_ids),
+                Booking.status.in_(ACTIVE_BOOKING_STATUSES)
+            ).distinct()
+        )).all())
+        deletable = [package_id for package_id in package_ids if package_id not in blocked]
+        if not deletable:
+            return [], list(blocked), []
+        
+        released_images = list((await session.execute(
+            delete(PackageImage).where(matches_any(PackageImage.package_id, deletable))
+            .returning(PackageImage.image_url)
+            .execution_options(synchronize_session=False)
+        )).scalars().all())
+        await session.execute(
+            delete(PackageDetailSchedule).where(matches_any(PackageDetailSchedule.package_id, deletable))
+            .execution_options(synchronize_session=False)
+        )
+        
+        # Completed/cancelled/refunded bookings go with the package; keep users' counts in step
+        removed = await session.execute(
+            delete(Booking).where(
+                matches_any(Booking.package_id, deletable),
                 Booking.status.in_([BookingStatus.COMPLETED, BookingStatus.CANCELLED, BookingStatus.REFUNDED])
+            ).returning(Booking.user_id).execution_options(synchronize_session=False)
+        )
+        removed_per_user = Counter(removed.scalars().all())
+        if removed_per_user:
+            await session.execute(
+                update(User)
+                .where(matches_any(User.uid, removed_per_user))
+                .values(bookings_count=func.greatest(
+                    User.bookings_count - case(dict(removed_per_user), value=User.uid), 0
+                ))
+                .execution_options(synchronize_session=False)
             )
-            historical_bookings = await session.exec(historical_booking_query)
-            for booking in historical_bookings.all():
-                await session.delete(booking)
-            
-            # 4. Finally delete the package itself
-            await session.delete(package)
+        
+        featured = await session.execute(
+            delete(Package).where(matches_any(Package.id, deletable))
+            .returning(Package.featured_image)
+            .execution_options(synchronize_session=False)
+        )
+        released_images.extend(url for url in featured.scalars().all() if url)
+        await sync_service.record_deletions(session, "package", deletable)
+        return deletable, list(blocked), released_images
+    
+    async def bulk_delete_packages(
+        self,
+        session: AsyncSession,
+        selection: PackageBulkDeleteModel
+    ) -> BulkOperationResponseModel:
+        """Delete every selected package that has no active bookings, in one transaction"""
+        package_ids = (await session.exec(self._apply_bulk_selection(select(Package.id), selection))).all()
+        try:
+            deleted, blocked, released_images = await self._delete_packages(session, list(package_ids))
             await session.commit()
-            return True
-            
-        except ValueError as ve:
-            # Business logic error (e.g., active bookings exist)
+        except Exception:
             await session.rollback()
-            raise ve
-        except Exception as e:
+            raise
+        
+        await storage_service.release_images(released_images, "package-images")
+        await notify_change("package", deleted)
+        message = f"Deleted {len(deleted)} package(s)"
+        if blocked:
+            message += f"; {len(blocked)} skipped because they have active bookings"
+        return BulkOperationResponseModel(affected=len(deleted), skipped_ids=blocked, message=message)
+    
+    async def bulk_update_packages(
+        self,
+        session: AsyncSession,
+        changes: PackageBulkUpdateModel
+    ) -> BulkOperationResponseModel:
+        """Set is_active/is_featured on every selected package with one UPDATE"""
+        values = changes.model_dump(include={'is_active', 'is_featured'}, exclude_none=True)
+        statement = self._apply_bulk_selection(
+            update(Package).values(**values, updated_at=datetime.now()),
+            changes
+        ).returning(Package.id).execution_options(synchronize_session=False)
+        
+        try:
+            updated = (await session.execute(statement)).scalars().all()
+            await session.commit()
+        except Exception:
             await session.rollback()
-            raise e
+            raise
+        
+        await notify_change("package", updated)
+        return BulkOperationResponseModel(affected=len(updated), message=f"Updated {len(updated)} package(s)")
     
     async def toggle_active_status(self, session: AsyncSession, package_id: str) -> Optional[Package]:
         """Toggle the active status of a package"""
@@ -401,6 +792,7 @@ class PackageService:
         await session.commit()
         await session.refresh(package)
         
+        await notify_change("package", [package.id])
         return package
     
     async def toggle_featured_status(self, session: AsyncSession, package_id: str) -> Optional[Package]:
@@ -417,6 +809,7 @@ class PackageService:
         await session.commit()
         await session.refresh(package)
         
+        await notify_change("package", [package.id])
         return package
     
     async def get_featured_packages(self, session: AsyncSession, limit: int = 6) -> List[Package]:
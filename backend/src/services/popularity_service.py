@@ -0,0 +1,176 @@
+"""
+Booking-driven package popularity.
+
+A package's score combines its time-decayed confirmed/completed bookings and
+booking revenue (each normalised to the best package), a boost for the admin
+featured flag and a small recency term that orders packages without bookings.
+Scores are recomputed with one aggregate query and swapped into Redis sorted
+sets, so the featured and home endpoints read the top k ids in O(log n + k).
+"""
+import asyncio
+import math
+import uuid
+from typing import Optional, List, Dict, Set, Callable, Awaitable
+
+from redis.exceptions import RedisError
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import select, func
+from sqlalchemy import and_
+from sqlalchemy.orm import selectinload
+
+from ..config import Config
+from ..db.main import async_session_maker
+from ..db.redis import redis_client
+from ..models.package import Package
+from ..models.booking import Booking, BookingStatus
+from ..utils.sql_utils import matches_any
+from .catalog_events import on_change
+
+
+POPULARITY_KEY = "packages:popularity"
+FEATURED_POPULARITY_KEY = "packages:popularity:featured"
+
+# Weights of the normalised booking and revenue terms
+BOOKINGS_WEIGHT = 0.6
+REVENUE_WEIGHT = 0.4
+# Orders packages without bookings newest first without outranking real demand
+RECENCY_WEIGHT = 0.01
+
+COUNTED_STATUSES = [BookingStatus.CONFIRMED, BookingStatus.COMPLETED]
+
+
+class PopularityService:
+    """Computes package popularity and serves ranked package ids"""
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._refresh_scheduled = False
+        self._tasks: Set[asyncio.Task] = set()
+        self._refresh_listeners: List[Callable[[], Awaitable[None]]] = []
+
+    def on_refresh(self, listener: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+        """Register an async callback run after each ranking replacement"""
+        self._refresh_listeners.append(listener)
+        return listener
+
+    def _decay(self, timestamp):
+        """exp(-ln 2 * age / half-life) as a SQL expression; 1 now, 0.5 one half-life ago"""
+        age_days = func.extract("epoch", func.now() - timestamp) / 86400.0
+        return func.exp(-math.log(2) * func.greatest(age_days, 0) / Config.POPULARITY_HALF_LIFE_DAYS)
+
+    async def compute_scores(self, session: AsyncSession) -> Dict[str, Dict[str, float]]:
+        """Popularity of every active package, keyed by id, split into all and featured"""
+        booking_decay = self._decay(Booking.booking_date)
+        statement = select(
+            Package.id,
+            Package.is_featured,
+            self._decay(Package.created_at).label("recency"),
+            func.coalesce(func.sum(booking_decay), 0).label("bookings"),
+            func.coalesce(func.sum(booking_decay * Booking.total_amount), 0).label("revenue")
+        ).outerjoin(
+            Booking,
+            and_(Booking.package_id == Package.id, Booking.status.in_(COUNTED_STATUSES))
+        ).where(Package.is_active == True).group_by(Package.id)
+        rows = (await session.exec(statement)).all()
+
+        max_bookings = max((float(row.bookings) for row in rows), default=0) or 1
+        max_revenue = max((float(row.revenue) for row in rows), default=0) or 1
+
+        scores = {"all": {}, "featured": {}}
+        for row in rows:
+            score = (
+                BOOKINGS_WEIGHT * float(row.bookings) / max_bookings +
+                REVENUE_WEIGHT * float(row.revenue) / max_revenue +
+                RECENCY_WEIGHT * float(row.recency) +
+                (Config.POPULARITY_FEATURED_BOOST if row.is_featured else 0)
+            )
+            scores["all"][str(row.id)] = round(score, 8)
+            if row.is_featured:
+                scores["featured"][str(row.id)] = round(score, 8)
+        return scores
+
+    async def _refresh(self, session: AsyncSession) -> Dict[str, int]:
+        """Recompute scores and atomically replace the Redis rankings; the caller holds _lock"""
+        scores = await self.compute_scores(session)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            for key, ranking in ((POPULARITY_KEY, scores["all"]), (FEATURED_POPULARITY_KEY, scores["featured"])):
+                staging_key = f"{key}:staging"
+                pipe.delete(staging_key)
+                if ranking:
+                    pipe.zadd(staging_key, ranking)
+                    pipe.rename(staging_key, key)
+                else:
+                    pipe.delete(key)
+            await pipe.execute()
+        for listener in self._refresh_listeners:
+            try:
+                await listener()
+            except Exception as e:
+                print(f"Popularity listener {listener.__name__} failed: {str(e)}")
+        return {"packages": len(scores["all"]), "featured": len(scores["featured"])}
+
+    async def refresh(self, session: AsyncSession) -> Dict[str, int]:
+        """Recompute scores and atomically replace the Redis rankings"""
+        async with self._lock:
+            return await self._refresh(session)
+
+    async def refresh_in_background(self) -> None:
+        """Background entry point with its own session; concurrent requests coalesce into one run"""
+        if self._refresh_scheduled:
+            return
+        self._refresh_scheduled = True
+        try:
+            async with self._lock:
+                # Changes made from here on schedule another run
+                self._refresh_scheduled = False
+                async with async_session_maker() as session:
+                    await self._refresh(session)
+        except Exception as e:
+            self._refresh_scheduled = False
+            print(f"Popularity refresh failed: {str(e)}")
+
+    def schedule_refresh(self) -> None:
+        """Start a refresh without waiting for it"""
+        task = asyncio.get_running_loop().create_task(self.refresh_in_background())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def run_periodic_refresh(self) -> None:
+        """Refresh every POPULARITY_REFRESH_SECONDS until cancelled (started from the app lifespan)"""
+        while True:
+            await self.refresh_in_background()
+            await asyncio.sleep(Config.POPULARITY_REFRESH_SECONDS)
+
+    async def get_ranked_ids(self, offset: int = 0, limit: int = 12, featured_only: bool = False) -> Optional[List[uuid.UUID]]:
+        """
+        Package ids in popularity order, or None when no ranking is available
+        (Redis unreachable or not refreshed yet) so callers can fall back to SQL.
+        """
+        key = FEATURED_POPULARITY_KEY if featured_only else POPULARITY_KEY
+        try:
+            if not await redis_client.exists(POPULARITY_KEY):
+                return None
+            members = await redis_client.zrevrange(key, offset, offset + limit - 1)
+        except RedisError as e:
+            print(f"Popularity ranking unavailable: {str(e)}")
+            return None
+        return [uuid.UUID(member) for member in members]
+
+    async def get_packages_in_order(self, session: AsyncSession, package_ids: List[uuid.UUID]) -> List[Package]:
+        """Load active packages by id, keeping the given order"""
+        if not package_ids:
+            return []
+        statement = select(Package).options(
+            selectinload(Package.detail_schedule)
+        ).where(matches_any(Package.id, package_ids), Package.is_active == True)
+        by_id = {package.id: package for package in (await session.exec(statement)).all()}
+        return [by_id[package_id] for package_id in package_ids if package_id in by_id]
+
+
+popularity_service = PopularityService()
+
+
+@on_change("package")
+async def refresh_package_popularity(entity_type: str, ids: List[uuid.UUID]) -> None:
+    """Activation and featured changes show up in the rankings right after the response"""
+    popularity_service.schedule_refresh()
@@ -0,0 +1,390 @@
+"""
+"Similar packages" recommendations.
+
+Every active package is described by TF-IDF weights of its title, description
+and highlights plus its price, duration, destination and country. Similarities
+are computed with NumPy in row blocks and the top-k neighbors of each package
+are stored in package_similarities, so serving them is a primary-key read.
+
+Refreshes are incremental. Only packages whose content hash changed are scored
+against the catalog, along with lists that point at a changed or removed
+package. Every other list is merged with its scores against the changed
+packages. A full rebuild (offline script) recomputes everything with
+up-to-date IDF weights.
+"""
+import asyncio
+import hashlib
+import math
+import re
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Set, Tuple
+
+import numpy as np
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import select, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import selectinload
+from starlette.concurrency import run_in_threadpool
+
+from ..config import Config
+from ..db.main import async_session_maker
+from ..models.package import Package
+from ..models.package_detail_schedule import PackageDetailSchedule
+from ..models.package_similarity import PackageSimilarity
+from ..models.destination import Destination
+from ..utils.sql_utils import matches_any
+from .catalog_events import on_change
+from .package_service import package_service
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]{2,}")
+
+STOP_WORDS = frozenset("""
+    a an and are as at be by for from has have in into is it its of on or our
+    the their this to with you your will we all per day days night nights
+""".split())
+
+# Weight of each similarity component; they sum to 1 so scores stay in [0, 1]
+WEIGHTS = {
+    "text": 0.55,
+    "destination": 0.15,
+    "country": 0.10,
+    "price": 0.10,
+    "duration": 0.10,
+}
+
+# Rows scored per NumPy block; bounds memory to BLOCK_ROWS x catalog size floats
+BLOCK_ROWS = 512
+
+
+@dataclass
+class CatalogFeatures:
+    """Feature matrices for the active catalog, row i describing ids[i]"""
+    ids: List[uuid.UUID]
+    hashes: List[str]
+    text: np.ndarray         # (n, terms) L2-normalised TF-IDF
+    destination: np.ndarray  # (n,) destination index
+    country: np.ndarray      # (n,) country index
+    price: np.ndarray        # (n,) log price scaled to [0, 1]
+    duration: np.ndarray     # (n,) duration_days scaled to [0, 1]
+
+
+class RecommendationService:
+    """Builds and serves precomputed similar-package lists"""
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._refresh_scheduled = False
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load_catalog(self, session: AsyncSession) -> List[Any]:
+        """Content of every active package needed for the features"""
+        statement = select(
+            Package.id,
+            Package.title,
+            Package.description,
+            Package.price,
+            Package.destination_id,
+            Destination.country,
+            PackageDetailSchedule.highlights,
+            PackageDetailSchedule.duration_days
+        ).join(
+            Destination, Package.destination_id == Destination.id
+        ).outerjoin(
+            PackageDetailSchedule, PackageDetailSchedule.package_id == Package.id
+        ).where(Package.is_active == True).order_by(Package.id)
+        return (await session.exec(statement)).all()
+
+    def _tokens(self, *texts: Optional[str]) -> List[str]:
+        tokens = []
+        for text in texts:
+            if text:
+                tokens.extend(token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS)
+        return tokens
+
+    def _content_hash(self, row) -> str:
+        content = (
+            row.title, row.description, row.highlights, float(row.price),
+            row.duration_days, row.destination_id, (row.country or "").lower()
+        )
+        return hashlib.sha256("\x1f".join(str(value) for value in content).encode("utf-8")).hexdigest()
+
+    def _scale(self, values: np.ndarray) -> np.ndarray:
+        span = values.max() - values.min() if values.size else 0
+        if span <= 0:
+            return np.zeros_like(values)
+        return (values - values.min()) / span
+
+    def build_features(self, rows: List[Any], max_terms: int) -> CatalogFeatures:
+        """TF-IDF (sublinear tf, smoothed idf) over the most common terms, plus scaled numeric features"""
+        documents = [Counter(self._tokens(row.title, row.description, row.highlights)) for row in rows]
+        document_frequency = Counter()
+        for document in documents:
+            document_frequency.update(document.keys())
+        vocabulary = {term: i for i, (term, _) in enumerate(document_frequency.most_common(max_terms))}
+
+        text = np.zeros((len(rows), len(vocabulary)), dtype=np.float32)
+        for r, document in enumerate(documents):
+            for term, count in document.items():
+                column = vocabulary.get(term)
+                if column is not None:
+                    text[r, column] = 1.0 + math.log(count)
+        if vocabulary:
+            frequencies = np.array([document_frequency[term] for term in vocabulary], dtype=np.float32)
+            text *= np.log((1 + len(rows)) / (1 + frequencies)) + 1
+            norms = np.linalg.norm(text, axis=1, keepdims=True)
+            norms[norms == 0] = 1
+            text /= norms
+
+        _, destination = np.unique([str(row.destination_id) for row in rows], return_inverse=True)
+        _, country = np.unique([(row.country or "").lower() for row in rows], return_inverse=True)
+
+        price = np.log1p(np.array([float(row.price) for row in rows], dtype=np.float32))
+        durations = np.array(
+            [row.duration_days if row.duration_days is not None else np.nan for row in rows],
+            dtype=np.float32
+        )
+        if np.isnan(durations).any():
+            # Packages without a schedule are treated as average length
+            fill = np.nanmean(durations) if not np.isnan(durations).all() else 0
+            durations = np.where(np.isnan(durations), fill, durations)
+
+        return CatalogFeatures(
+            ids=[row.id for row in rows],
+            hashes=[self._content_hash(row) for row in rows],
+            text=text,
+            destination=destination.ravel(),
+            country=country.ravel(),
+            price=self._scale(price),
+            duration=self._scale(durations)
+        )
+
+    def _similarity(self, features: CatalogFeatures, rows: np.ndarray) -> np.ndarray:
+        """(len(rows), n) weighted similarities of the given rows to every package"""
+        scores = WEIGHTS["text"] * (features.text[rows] @ features.text.T)
+        scores += WEIGHTS["destination"] * (features.destination[rows, None] == features.destination[None, :])
+        scores += WEIGHTS["country"] * (features.country[rows, None] == features.country[None, :])
+        scores += WEIGHTS["price"] * (1 - np.abs(features.price[rows, None] - features.price[None, :]))
+        scores += WEIGHTS["duration"] * (1 - np.abs(features.duration[rows, None] - features.duration[None, :]))
+        # Never recommend a package to itself
+        scores[np.arange(len(rows)), rows] = -np.inf
+        return scores
+
+    def _top_k(self, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Column indices and scores of the k best entries per row, best first"""
+        k = min(k, scores.shape[1])
+        if k <= 0:
+            return np.empty((scores.shape[0], 0), dtype=int), np.empty((scores.shape[0], 0))
+        indices = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        best = np.take_along_axis(scores, indices, axis=1)
+        order = np.argsort(-best, axis=1)
+        return np.take_along_axis(indices, order, axis=1), np.take_along_axis(best, order, axis=1)
+
+    def compute_neighbors(
+        self,
+        features: CatalogFeatures,
+        recompute: Set[uuid.UUID],
+        changed: Set[uuid.UUID],
+        stored: Dict[uuid.UUID, Tuple[List[uuid.UUID], List[float]]],
+        top_k: int
+    ) -> Dict[uuid.UUID, Tuple[List[uuid.UUID], List[float]]]:
+        """
+        New neighbor lists keyed by package id: full top-k for `recompute`, and
+        for every other stored list a merge with the scores of `changed` packages.
+        """
+        position = {package_id: i for i, package_id in enumerate(features.ids)}
+        k = min(top_k, len(features.ids) - 1)
+        results = {}
+
+        rows = np.array(sorted(position[package_id] for package_id in recompute), dtype=int)
+        for start in range(0, len(rows), BLOCK_ROWS):
+            block = rows[start:start + BLOCK_ROWS]
+            indices, best = self._top_k(self._similarity(features, block), k)
+            for r, row in enumerate(block):
+                results[features.ids[row]] = (
+                    [features.ids[j] for j in indices[r]],
+                    [round(float(score), 6) for score in best[r]]
+                )
+
+        merge_rows = np.array(
+            [position[package_id] for package_id in stored if package_id in position and package_id not in recompute],
+            dtype=int
+        )
+        changed_rows = np.array(sorted(position[package_id] for package_id in changed), dtype=int)
+        if not merge_rows.size or not changed_rows.size:
+            return results
+
+        # Similarity is symmetric, so scoring the changed rows gives every other
+        # package's score against them
+        candidates = {
+            row: dict(zip((position[n] for n in stored[features.ids[row]][0]), stored[features.ids[row]][1]))
+            for row in merge_rows
+        }
+        for start in range(0, len(changed_rows), BLOCK_ROWS):
+            block = changed_rows[start:start + BLOCK_ROWS]
+            against_changed = self._similarity(features, block).T[merge_rows]
+            indices, best = self._top_k(against_changed, k)
+            for r, row in enumerate(merge_rows):
+                for j, score in zip(indices[r], best[r]):
+                    candidates[row][int(block[j])] = round(float(score), 6)
+
+        for row in merge_rows:
+            ranked = sorted(candidates[row].items(), key=lambda item: -item[1])[:k]
+            neighbors = ([features.ids[j] for j, _ in ranked], [score for _, score in ranked])
+            if neighbors != stored[features.ids[row]]:
+                results[features.ids[row]] = neighbors
+        return results
+
+    async def refresh(
+        self,
+        session: AsyncSession,
+        full: bool = False,
+        top_k: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Recompute the neighbor lists affected by catalog changes since the last refresh"""
+        async with self._lock:
+            return await self._refresh(session, full, top_k)
+
+    async def _refresh(self, session: AsyncSession, full: bool, top_k: Optional[int]) -> Dict[str, int]:
+        """refresh() with the lock already held"""
+        top_k = top_k or Config.SIMILAR_PACKAGES_TOP_K
+        rows = await self.load_catalog(session)
+        stored_rows = (await session.exec(select(PackageSimilarity))).all()
+        stored = {row.package_id: (list(row.neighbor_ids), list(row.scores)) for row in stored_rows}
+        stored_hashes = {row.package_id: row.content_hash for row in stored_rows}
+
+        features = await run_in_threadpool(self.build_features, rows, Config.SIMILAR_PACKAGES_MAX_TERMS)
+        hashes = dict(zip(features.ids, features.hashes))
+
+        removed = [package_id for package_id in stored if package_id not in hashes]
+        changed = {
+            package_id for package_id, content_hash in hashes.items()
+            if full or stored_hashes.get(package_id) != content_hash
+        }
+        # Lists pointing at a changed, deactivated or deleted package are rebuilt
+        recompute = set(changed) | {
+            package_id for package_id, (neighbors, _) in stored.items()
+            if package_id in hashes and any(n in changed or n not in hashes for n in neighbors)
+        }
+        live_stored = {package_id: value for package_id, value in stored.items() if package_id in hashes}
+
+        results = {}
+        if recompute and len(features.ids) > 1:
+            results = await run_in_threadpool(
+                self.compute_neighbors, features, recompute, changed, live_stored, top_k
+            )
+        elif recompute:
+            results = {package_id: ([], []) for package_id in recompute}
+
+        try:
+            now = datetime.utcnow()
+            values = [
+                {
+                    "package_id": package_id,
+                    "neighbor_ids": neighbors,
+                    "scores": scores,
+                    "content_hash": hashes[package_id],
+                    "computed_at": now
+                }
+                for package_id, (neighbors, scores) in results.items()
+            ]
+            # Stay well under the bind parameter limit
+            for start in range(0, len(values), 1000):
+                statement = pg_insert(PackageSimilarity).values(values[start:start + 1000])
+                await session.execute(statement.on_conflict_do_update(
+                    index_elements=[PackageSimilarity.package_id],
+                    set_={
+                        "neighbor_ids": statement.excluded.neighbor_ids,
+                        "scores": statement.excluded.scores,
+                        "content_hash": statement.excluded.content_hash,
+                        "computed_at": statement.excluded.computed_at
+                    }
+                ))
+            if removed:
+                await session.execute(
+                    delete(PackageSimilarity).where(matches_any(PackageSimilarity.package_id, removed))
+                )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+        return {
+            "packages": len(features.ids),
+            "changed": len(changed),
+            "recomputed": len(recompute),
+            "updated": len(results),
+            "removed": len(removed)
+        }
+
+    async def refresh_in_background(self) -> None:
+        """Background entry point with its own session; concurrent requests coalesce into one run"""
+        if self._refresh_scheduled:
+            return
+        self._refresh_scheduled = True
+        async with self._lock:
+            # Changes made from here on schedule another run
+            self._refresh_scheduled = False
+            async with async_session_maker() as session:
+                try:
+                    await self._refresh(session, False, None)
+                except Exception as e:
+                    print(f"Similar packages refresh failed: {str(e)}")
+
+    def schedule_refresh(self) -> None:
+        """Start an incremental refresh without waiting for it"""
+        task = asyncio.get_running_loop().create_task(self.refresh_in_background())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def get_similar(
+        self,
+        session: AsyncSession,
+        package_id: uuid.UUID,
+        limit: int = 10
+    ) -> Optional[Dict[str, Any]]:
+        """Stored neighbors of an active package, or None if the package does not exist"""
+        exists = (await session.exec(
+            select(Package.id).where(Package.id == package_id, Package.is_active == True)
+        )).first()
+        if not exists:
+            return None
+
+        similarity = (await session.exec(
+            select(PackageSimilarity).where(PackageSimilarity.package_id == package_id)
+        )).first()
+        if not similarity:
+            return {"package_id": package_id, "packages": [], "computed_at": None}
+
+        scores = dict(zip(similarity.neighbor_ids, similarity.scores))
+        neighbor_ids = similarity.neighbor_ids[:limit]
+        packages = (await session.exec(
+            select(Package).options(selectinload(Package.detail_schedule)).where(
+                matches_any(Package.id, neighbor_ids),
+                Package.is_active == True
+            )
+        )).all() if neighbor_ids else []
+        by_id = {package.id: package for package in packages}
+
+        similar = []
+        for neighbor_id in neighbor_ids:
+            package = by_id.get(neighbor_id)
+            if not package:
+                continue
+            package_dict = package_service.to_list_item(package)
+            package_dict['score'] = scores[neighbor_id]
+            similar.append(package_dict)
+
+        return {"package_id": package_id, "packages": similar, "computed_at": similarity.computed_at}
+
+
+recommendation_service = RecommendationService()
+
+
+@on_change("package")
+async def refresh_similar_packages(entity_type: str, ids: List[uuid.UUID]) -> None:
+    """Package changes are picked up by an incremental refresh after the response"""
+    recommendation_service.schedule_refresh()
@@ -0,0 +1,323 @@
+"""
+Storage backends for uploaded files.
+
+The active backend is chosen with Config.STORAGE_BACKEND:
+- "supabase": Supabase storage buckets (production)
+- "local": plain files under Config.LOCAL_STORAGE_PATH, served by the API itself
+"""
+import hashlib
+import hmac
+import io
+import mimetypes
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import BinaryIO, List, Optional
+from urllib.parse import quote, urlencode, urlparse
+
+import httpx
+from starlette.concurrency import run_in_threadpool
+
+from ..config import Config
+
+
+SUPABASE_SIGNED_UPLOAD_TTL = 2 * 60 * 60
+
+
+class StorageBackend(ABC):
+    """Minimal object-store interface used by the storage service"""
+
+    name: str
+
+    @abstractmethod
+    async def upload(self, bucket: str, key: str, body: BinaryIO, content_type: str) -> None:
+        """Store an object, overwriting any existing object with the same key"""
+
+    @abstractmethod
+    async def upload_bytes(self, bucket: str, key: str, content: bytes, content_type: str, upsert: bool = True) -> None:
+        """Store an in-memory object"""
+
+    @abstractmethod
+    async def exists(self, bucket: str, key: str) -> bool:
+        """Check whether an object exists"""
+
+    @abstractmethod
+    async def stat(self, bucket: str, key: str) -> Optional[dict]:
+        """Size and content type of an object, or None if it does not exist"""
+
+    @abstractmethod
+    async def create_signed_upload(self, bucket: str, key: str) -> dict:
+        """
+        Short-lived URL a client can PUT the object's bytes to directly.
+        Returns {"upload_url", "token", "expires_at"} (expires_at is a unix timestamp).
+        """
+
+    @abstractmethod
+    async def download(self, bucket: str, key: str) -> bytes:
+        """Read an object's bytes"""
+
+    @abstractmethod
+    async def read_head(self, bucket: str, key: str, n: int) -> bytes:
+        """Read only the first n bytes of an object"""
+
+    @abstractmethod
+    async def remove(self, bucket: str, keys: List[str]) -> None:
+        """Delete several objects in one call"""
+
+    @abstractmethod
+    async def list(self, bucket: str, limit: int = 100, offset: int = 0) -> List[dict]:
+        """List objects ordered by name, in the Supabase listing format"""
+
+    @abstractmethod
+    async def create_bucket(self, bucket: str, options: Optional[dict] = None) -> None:
+        """Create a bucket (raises if it already exists)"""
+
+    @abstractmethod
+    def get_public_url(self, bucket: str, key: str) -> str:
+        """Public URL an object is served from"""
+
+    def key_from_url(self, url: str) -> Optional[str]:
+        """Extract the object key from a public URL"""
+        try:
+            # Public URLs end with the key and may carry an (empty) query string
+            parts = urlparse(url).path.split('/')
+            if parts and parts[-1]:
+                return parts[-1]
+            return None
+        except Exception:
+            return None
+
+
+class SupabaseStorageBackend(StorageBackend):
+    """Supabase storage. The client is created on first use."""
+
+    name = "supabase"
+
+    def __init__(self):
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            if not Config.SUPABASE_URL or not Config.SUPABASE_KEY:
+                raise RuntimeError("SUPABASE_URL and SUPABASE_KEY must be set to use Supabase storage")
+            from supabase import create_client
+            self._client = create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY)
+        return self._client
+
+    async def upload(self, bucket: str, key: str, body: BinaryIO, content_type: str) -> None:
+        await run_in_threadpool(
+            self.client.storage.from_(bucket).upload,
+            path=key,
+            file=body,
+            file_options={"content-type": content_type, "upsert": "true"}
+        )
+
+    async def upload_bytes(self, bucket: str, key: str, content: bytes, content_type: str, upsert: bool = True) -> None:
+        await run_in_threadpool(
+            self.client.storage.from_(bucket).upload,
+            path=key,
+            file=content,
+            file_options={"content-type": content_type, "upsert": "true" if upsert else "false"}
+        )
+
+    async def exists(self, bucket: str, key: str) -> bool:
+        try:
+            return await run_in_threadpool(self.client.storage.from_(bucket).exists, key)
+        except Exception:
+            return False
+
+    async def stat(self, bucket: str, key: str) -> Optional[dict]:
+        try:
+            info = await run_in_threadpool(self.client.storage.from_(bucket).info, key)
+        except Exception:
+            return None
+        metadata = info.get("metadata") or {}
+        return {
+            "size": info.get("size") or metadata.get("size") or 0,
+            "content_type": info.get("content_type") or metadata.get("mimetype") or "application/octet-stream"
+        }
+
+    async def create_signed_upload(self, bucket: str, key: str) -> dict:
+        signed = await run_in_threadpool(self.client.storage.from_(bucket).create_signed_upload_url, key)
+        return {
+            "upload_url": signed["signed_url"],
+            "token": signed["token"],
+            # Supabase signed upload URLs are valid for two hours
+            "expires_at": int(time.time()) + SUPABASE_SIGNED_UPLOAD_TTL
+        }
+
+    async def download(self, bucket: str, key: str) -> bytes:
+        return await run_in_threadpool(self.client.storage.from_(bucket).download, key)
+
+    async def read_head(self, bucket: str, key: str, n: int) -> bytes:
+        # The storage client has no ranged download; ask the object endpoint for a byte range
+        url = f"{Config.SUPABASE_URL.rstrip('/')}/storage/v1/object/{bucket}/{quote(key)}"
+        headers = {
+            "apikey": Config.SUPABASE_KEY,
+            "Authorization": f"Bearer {Config.SUPABASE_KEY}",
+            "Range": f"bytes=0-{n - 1}"
+        }
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url, headers=headers)
+            response.raise_for_status()
+        # A server that ignores Range answers 200 with the whole object
+        return response.content[:n]
+
+    async def remove(self, bucket: str, keys: List[str]) -> None:
+        if keys:
+            await run_in_threadpool(self.client.storage.from_(bucket).remove, keys)
+
+    async def list(self, bucket: str, limit: int = 100, offset: int = 0) -> List[dict]:
+        response = await run_in_threadpool(
+            self.client.storage.from_(bucket).list,
+            "",
+            {"limit": limit, "offset": offset, "sortBy": {"column": "name", "order": "asc"}}
+        )
+        return response or []
+
+    async def create_bucket(self, bucket: str, options: Optional[dict] = None) -> None:
+        await run_in_threadpool(self.client.storage.create_bucket, id=bucket, options=options)
+
+    def get_public_url(self, bucket: str, key: str) -> str:
+        return self.client.storage.from_(bucket).get_public_url(key)
+
+
+class LocalStorageBackend(StorageBackend):
+    """Files on local disk, one directory per bucket. Used for development and tests."""
+
+    name = "local"
+
+    def __init__(self, root: str, base_url: str):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip('/')
+
+    def _path(self, bucket: str, key: str) -> str:
+        # Keys are flat file names; refuse anything that could escape the bucket
+        if not key or key != os.path.basename(key) or key.startswith('.'):
+            raise ValueError(f"Invalid object key: {key}")
+        return os.path.join(self.root, bucket, key)
+
+    def _write(self, bucket: str, key: str, body: BinaryIO) -> None:
+        path = self._path(bucket, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file first so readers never see a partial object
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = body.read(Config.UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    async def upload(self, bucket: str, key: str, body: BinaryIO, content_type: str) -> None:
+        await run_in_threadpool(self._write, bucket, key, body)
+
+    async def upload_bytes(self, bucket: str, key: str, content: bytes, content_type: str, upsert: bool = True) -> None:
+        if not upsert and await self.exists(bucket, key):
+            raise FileExistsError(f"Object already exists: {bucket}/{key}")
+        await run_in_threadpool(self._write, bucket, key, io.BytesIO(content))
+
+    async def exists(self, bucket: str, key: str) -> bool:
+        return os.path.isfile(self._path(bucket, key))
+
+    async def stat(self, bucket: str, key: str) -> Optional[dict]:
+        path = self._path(bucket, key)
+        if not os.path.isfile(path):
+            return None
+        return {
+            "size": os.path.getsize(path),
+            "content_type": mimetypes.guess_type(key)[0] or "application/octet-stream"
+        }
+
+    def _sign(self, bucket: str, key: str, expires_at: int) -> str:
+        message = f"{bucket}/{key}:{expires_at}".encode()
+        return hmac.new(Config.JWT_SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+    async def create_signed_upload(self, bucket: str, key: str) -> dict:
+        self._path(bucket, key)
+        expires_at = int(time.time()) + Config.SIGNED_UPLOAD_EXPIRE_SECONDS
+        token = self._sign(bucket, key, expires_at)
+        query = urlencode({"expires": expires_at, "token": token})
+        return {
+            "upload_url": f"{Config.LOCAL_UPLOAD_URL.rstrip('/')}/{bucket}/{key}?{query}",
+            "token": token,
+            "expires_at": expires_at
+        }
+
+    def verify_signed_upload(self, bucket: str, key: str, expires_at: int, token: str) -> bool:
+        """Check a token issued by create_signed_upload"""
+        if expires_at < time.time():
+            return False
+        return hmac.compare_digest(self._sign(bucket, key, expires_at), token)
+
+    async def download(self, bucket: str, key: str) -> bytes:
+        def _read():
+            with open(self._path(bucket, key), "rb") as f:
+                return f.read()
+        return await run_in_threadpool(_read)
+
+    async def read_head(self, bucket: str, key: str, n: int) -> bytes:
+        def _read():
+            with open(self._path(bucket, key), "rb") as f:
+                return f.read(n)
+        return await run_in_threadpool(_read)
+
+    async def remove(self, bucket: str, keys: List[str]) -> None:
+        def _remove():
+            for key in keys:
+                try:
+                    os.unlink(self._path(bucket, key))
+                except FileNotFoundError:
+                    pass
+        await run_in_threadpool(_remove)
+
+    async def list(self, bucket: str, limit: int = 100, offset: int = 0) -> List[dict]:
+        def _list():
+            directory = os.path.join(self.root, bucket)
+            if not os.path.isdir(directory):
+                return []
+            names = sorted(
+                entry.name for entry in os.scandir(directory)
+                if entry.is_file() and not entry.name.startswith('.')
+            )
+            objects = []
+            for name in names[offset:offset + limit]:
+                stat = os.stat(os.path.join(directory, name))
+                modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat()
+                objects.append({
+                    "name": name,
+                    "created_at": modified,
+                    "updated_at": modified,
+                    "metadata": {
+                        "size": stat.st_size,
+                        "mimetype": mimetypes.guess_type(name)[0] or "application/octet-stream"
+                    }
+                })
+            return objects
+        return await run_in_threadpool(_list)
+
+    async def create_bucket(self, bucket: str, options: Optional[dict] = None) -> None:
+        directory = os.path.join(self.root, bucket)
+        if os.path.isdir(directory):
+            raise FileExistsError(f"Bucket {bucket} already exists")
+        os.makedirs(directory)
+
+    def get_public_url(self, bucket: str, key: str) -> str:
+        return f"{self.base_url}/{bucket}/{key}"
+
+
+def get_storage_backend() -> StorageBackend:
+    """Build the backend selected in Config.STORAGE_BACKEND"""
+    if Config.STORAGE_BACKEND == "local":
+        return LocalStorageBackend(Config.LOCAL_STORAGE_PATH, Config.LOCAL_STORAGE_URL)
+    if Config.STORAGE_BACKEND == "supabase":
+        return SupabaseStorageBackend()
+    raise ValueError(f"Unknown storage backend: {Config.STORAGE_BACKEND}")
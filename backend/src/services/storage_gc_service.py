@@ -0,0 +1,162 @@
+"""
+Garbage collection of stored images that no catalog record references any more
+"""
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Set
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import select
+from sqlalchemy import union_all, delete
+
+from ..config import Config
+from ..models.package import Package
+from ..models.package_image import PackageImage
+from ..models.destination import Destination
+from ..models.blog import Blog
+from ..models.storage_object import StorageObject
+from .storage_service import storage_service
+
+
+# "<stem>_w<width>.webp" objects are renditions of the original named "<stem>.<ext>"
+RENDITION_KEY_PATTERN = re.compile(r"^(?P<stem>.+)_w\d+\.webp$")
+
+# Buckets that belong to catalog entities; other buckets must be named explicitly
+DEFAULT_GC_BUCKETS = ["package-images", "destination-images", "blogs-images"]
+
+
+class StorageGCService:
+    """Finds and removes unreferenced objects in storage buckets"""
+
+    async def get_referenced_stems(self, session: AsyncSession) -> Set[str]:
+        """
+        Key stems of every image URL stored on packages, package images,
+        destinations and blogs, read with one streamed query.
+
+        Stems (keys without extension) are collected so an original also keeps
+        its renditions alive.
+        """
+        statement = union_all(
+            select(PackageImage.image_url.label("url")),
+            select(Package.featured_image.label("url")).where(Package.featured_image.is_not(None)),
+            select(Destination.featured_image.label("url")).where(Destination.featured_image.is_not(None)),
+            select(Blog.cover_image.label("url")).where(Blog.cover_image.is_not(None)),
+        )
+
+        stems = set()
+        result = await session.stream(statement.execution_options(yield_per=1000))
+        async for (url,) in result:
+            key = storage_service._extract_filename_from_url(url)
+            if key:
+                stems.add(os.path.splitext(key)[0])
+        return stems
+
+    async def list_bucket(self, bucket: str, page_size: int) -> List[dict]:
+        """Every object in a bucket, fetched page by page"""
+        objects = []
+        offset = 0
+        while True:
+            page = await storage_service.list_images(bucket, limit=page_size, offset=offset)
+            # Folder placeholders have no id/metadata
+            objects.extend(item for item in page if item.get("name") and item.get("metadata"))
+            if len(page) < page_size:
+                return objects
+            offset += page_size
+
+    def _is_referenced(self, key: str, stems: Set[str]) -> bool:
+        match = RENDITION_KEY_PATTERN.match(key)
+        stem = match.group("stem") if match else os.path.splitext(key)[0]
+        return stem in stems
+
+    def _created_at(self, item: dict) -> Optional[datetime]:
+        value = item.get("created_at") or item.get("updated_at")
+        if not value:
+            return None
+        try:
+            created = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        return created if created.tzinfo else created.replace(tzinfo=timezone.utc)
+
+    async def collect(
+        self,
+        session: AsyncSession,
+        buckets: Optional[List[str]] = None,
+        grace_hours: Optional[int] = None,
+        dry_run: bool = True,
+        page_size: int = 1000,
+        batch_size: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Remove objects that are not referenced by any record and are older than
+        the grace period. With dry_run nothing is deleted and the report lists
+        what would be.
+        """
+        grace_hours = Config.STORAGE_GC_GRACE_HOURS if grace_hours is None else grace_hours
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=grace_hours)
+        buckets = buckets or DEFAULT_GC_BUCKETS
+        for bucket in buckets:
+            if bucket not in storage_service.buckets:
+                raise ValueError(f"Invalid bucket type: {bucket}")
+
+        stems = await self.get_referenced_stems(session)
+        # Deduplicated uploads can re-reference an old object; treat those as new
+        recently_referenced = set((await session.exec(
+            select(StorageObject.key).where(StorageObject.updated_at > cutoff.replace(tzinfo=None))
+        )).all())
+
+        report = {
+            "dry_run": dry_run,
+            "grace_hours": grace_hours,
+            "referenced_images": len(stems),
+            "buckets": {}
+        }
+
+        for bucket in buckets:
+            # List the whole bucket before deleting so offsets stay stable
+            objects = await self.list_bucket(bucket, page_size)
+            orphans = []
+            orphan_bytes = 0
+            skipped_recent = 0
+            for item in objects:
+                if self._is_referenced(item["name"], stems):
+                    continue
+                created_at = self._created_at(item)
+                if created_at is None or created_at > cutoff or item["name"] in recently_referenced:
+                    skipped_recent += 1
+                    continue
+                orphans.append(item["name"])
+                orphan_bytes += (item.get("metadata") or {}).get("size") or 0
+
+            deleted = 0
+            failed = 0
+            if not dry_run:
+                for start in range(0, len(orphans), batch_size):
+                    batch = orphans[start:start + batch_size]
+                    try:
+                        await storage_service.backend.remove(bucket, batch)
+                        await session.execute(
+                            delete(StorageObject)
+                            .where(StorageObject.bucket == bucket, StorageObject.key.in_(batch))
+                        )
+                        await session.commit()
+                        deleted += len(batch)
+                    except Exception as e:
+                        await session.rollback()
+                        failed += len(batch)
+                        print(f"Storage GC failed for a batch in {bucket}: {str(e)}")
+
+            report["buckets"][bucket] = {
+                "objects": len(objects),
+                "orphaned": len(orphans),
+                "orphaned_bytes": orphan_bytes,
+                "skipped_within_grace": skipped_recent,
+                "deleted": deleted,
+                "failed": failed,
+                "orphaned_keys": orphans if dry_run else []
+            }
+
+        return report
+
+
+storage_gc_service = StorageGCService()
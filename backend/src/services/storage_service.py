@@ -0,0 +1,363 @@
+import os
+import uuid
+from datetime import datetime
+from typing import Optional, Literal, List, Iterable
+from fastapi import UploadFile, HTTPException
+import mimetypes
+from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from ..config import Config
+from ..db.main import async_session_maker
+from ..models.storage_object import StorageObject
+from ..utils.upload_utils import spool_upload, SpooledUpload
+from .storage_backends import StorageBackend, get_storage_backend
+
+
+# Define bucket types
+BucketType = Literal["blogs-images", "package-images", "destination-images", "activity-images"]
+
+
+def rendition_key(key: str, width: int) -> str:
+    """Object key of a width-bounded rendition, stored next to its original"""
+    return f"{os.path.splitext(key)[0]}_w{width}.webp"
+
+
+class StorageService:
+    """
+    Image storage on top of the configured backend.
+
+    Uploaded images are keyed by the SHA-256 of their content, so uploading the
+    same file again only costs an existence check. Every upload of a key adds a
+    reference in storage_objects and every delete removes one; the object is only
+    removed from storage once nothing references it.
+    """
+
+    def __init__(self, backend: Optional[StorageBackend] = None):
+        self.backend = backend or get_storage_backend()
+        # Define all available buckets
+        self.buckets = {
+            "blogs-images": "blogs-images",
+            "package-images": "package-images",
+            "destination-images": "destination-images",
+            "activity-images": "activity-images"
+        }
+
+    async def upload_image(self, file: UploadFile, bucket_type: BucketType) -> str:
+        """
+        Upload an image to the specified storage bucket and return the public URL
+        """
+        try:
+            # Validate bucket type
+            if bucket_type not in self.buckets:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid bucket type. Must be one of: {list(self.buckets.keys())}"
+                )
+
+            # Validate file type
+            if not self._is_valid_image(file.filename):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid file type. Only images (jpg, jpeg, png, gif, webp) are allowed."
+                )
+
+            # Stream the body to a temp file, checking size and magic number as we go
+            spooled = await spool_upload(file)
+            try:
+                bucket_name = self.buckets[bucket_type]
+                key = f"{spooled.sha256}{spooled.extension}"
+                await self._store(bucket_name, key, spooled)
+            finally:
+                spooled.cleanup()
+
+            return self.backend.get_public_url(bucket_name, key)
+
+        except Exception as e:
+            if isinstance(e, HTTPException):
+                raise e
+            raise HTTPException(
+                status_code=500,
+                detail=f"An error occurred while uploading the image: {str(e)}"
+            )
+
+    async def _store(self, bucket_name: str, key: str, spooled: SpooledUpload) -> None:
+        """Take a reference on a content-addressed key and transfer the bytes only if needed"""
+        # The reference is committed before the transfer. A first reference always
+        # uploads: the object may still be there from a release that is removing it
+        # right now (see _release_reference), so its existence proves nothing.
+        ref_count = await self.add_reference(
+            bucket_name, key, spooled.sha256, spooled.size, spooled.content_type
+        )
+        try:
+            if ref_count == 1 or not await self.backend.exists(bucket_name, key):
+                with open(spooled.path, "rb") as body:
+                    await self.backend.upload(bucket_name, key, body, spooled.content_type)
+        except Exception:
+            await self._release_reference(bucket_name, key)
+            raise
+
+    async def add_reference(
+        self,
+        bucket_name: str,
+        key: str,
+        sha256: str,
+        size: int,
+        content_type: str
+    ) -> int:
+        """Record one more reference to an object and return the new count"""
+        now = datetime.utcnow()
+        statement = pg_insert(StorageObject).values(
+            id=uuid.uuid4(),
+            bucket=bucket_name,
+            key=key,
+            sha256=sha256,
+            size=size,
+            content_type=content_type,
+            ref_count=1,
+            created_at=now,
+            updated_at=now
+        ).on_conflict_do_update(
+            constraint="storage_objects_bucket_key_key",
+            set_={"ref_count": StorageObject.ref_count + 1, "updated_at": now}
+        ).returning(StorageObject.ref_count)
+
+        async with async_session_maker() as session:
+            result = await session.execute(statement)
+            await session.commit()
+            return result.scalar_one()
+
+    async def is_tracked(self, bucket_name: str, key: str) -> bool:
+        """Whether an object is reference counted, i.e. its content was verified when first stored"""
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(StorageObject.id).where(StorageObject.bucket == bucket_name, StorageObject.key == key)
+            )
+            return result.first() is not None
+
+    async def _release_reference(self, bucket_name: str, key: str) -> bool:
+        """
+        Drop one reference to an object, removing it (and its renditions) from
+        storage when none are left. Returns False if the key is not tracked.
+
+        The row goes in its own short transaction and the object is removed after
+        the commit, so no row lock is held across the storage call. An upload of
+        the same content racing with that call can lose its bytes; the next
+        upload of that content finds the object missing and transfers it again.
+        """
+        async with async_session_maker() as session:
+            result = await session.execute(
+                update(StorageObject)
+                .where(StorageObject.bucket == bucket_name, StorageObject.key == key)
+                .values(ref_count=StorageObject.ref_count - 1, updated_at=datetime.utcnow())
+                .returning(StorageObject.ref_count)
+            )
+            remaining = result.scalar_one_or_none()
+            if remaining is None:
+                await session.rollback()
+                return False
+
+            if remaining <= 0:
+                await session.execute(
+                    delete(StorageObject)
+                    .where(StorageObject.bucket == bucket_name, StorageObject.key == key)
+                )
+            await session.commit()
+
+        if remaining <= 0:
+            await self.backend.remove(bucket_name, [key] + self._rendition_keys(key))
+        return True
+
+    async def discard_image(self, image_url: str, bucket_type: BucketType) -> None:
+        """
+        Drop every reference to an image and remove it with its renditions.
+        For objects found to be invalid after they were recorded.
+        """
+        bucket_name = self.buckets[bucket_type]
+        key = self._extract_filename_from_url(image_url)
+        if not key:
+            return
+        async with async_session_maker() as session:
+            await session.execute(
+                delete(StorageObject)
+                .where(StorageObject.bucket == bucket_name, StorageObject.key == key)
+            )
+            await session.commit()
+        await self.backend.remove(bucket_name, [key] + self._rendition_keys(key))
+
+    def _rendition_keys(self, key: str) -> List[str]:
+        return [rendition_key(key, width) for width in Config.IMAGE_RENDITION_WIDTHS]
+
+    # Specific upload methods for each bucket type
+    async def upload_blog_image(self, file: UploadFile) -> str:
+        """Upload a blog image to storage and return the public URL"""
+        return await self.upload_image(file, "blogs-images")
+
+    async def upload_package_image(self, file: UploadFile) -> str:
+        """Upload a package image to storage and return the public URL"""
+        return await self.upload_image(file, "package-images")
+
+    async def upload_destination_image(self, file: UploadFile) -> str:
+        """Upload a destination image to storage and return the public URL"""
+        return await self.upload_image(file, "destination-images")
+
+    async def upload_activity_image(self, file: UploadFile) -> str:
+        """Upload an activity image to storage and return the public URL"""
+        return await self.upload_image(file, "activity-images")
+
+    async def delete_image(self, image_url: str, bucket_type: BucketType) -> bool:
+        """
+        Release an image in the specified storage bucket using its URL.
+        The object is only removed once no other upload references it.
+        """
+        try:
+            # Validate bucket type
+            if bucket_type not in self.buckets:
+                return False
+
+            # Extract filename from URL
+            filename = self._extract_filename_from_url(image_url)
+            if not filename:
+                return False
+
+            bucket_name = self.buckets[bucket_type]
+            if not await self._release_reference(bucket_name, filename):
+                # Uploaded before reference counting existed: the object is not shared
+                await self.backend.remove(bucket_name, [filename])
+
+            # If no exception was raised, consider it successful
+            return True
+
+        except Exception as e:
+            print(f"Error deleting image: {str(e)}")
+            return False
+
+    async def release_images(self, image_urls: Iterable[Optional[str]], bucket_type: BucketType) -> None:
+        """
+        Release the images a record stopped using; call after its transaction
+        committed. URLs that are not objects of the bucket (e.g. external links
+        given in a catalog import) are skipped.
+        """
+        bucket_name = self.buckets[bucket_type]
+        for image_url in image_urls:
+            if not image_url:
+                continue
+            key = self._extract_filename_from_url(image_url)
+            if not key or image_url.split('?')[0] != self.backend.get_public_url(bucket_name, key).split('?')[0]:
+                continue
+            await self.delete_image(image_url, bucket_type)
+
+    # Specific delete methods for each bucket type
+    async def delete_blog_image(self, image_url: str) -> bool:
+        """Delete a blog image from storage using its URL"""
+        return await self.delete_image(image_url, "blogs-images")
+
+    async def delete_package_image(self, image_url: str) -> bool:
+        """Delete a package image from storage using its URL"""
+        return await self.delete_image(image_url, "package-images")
+
+    async def delete_destination_image(self, image_url: str) -> bool:
+        """Delete a destination image from storage using its URL"""
+        return await self.delete_image(image_url, "destination-images")
+
+    async def delete_activity_image(self, image_url: str) -> bool:
+        """Delete an activity image from storage using its URL"""
+        return await self.delete_image(image_url, "activity-images")
+
+    async def upload_bytes(
+        self,
+        content: bytes,
+        filename: str,
+        bucket_type: BucketType,
+        content_type: str,
+        upsert: bool = True
+    ) -> str:
+        """
+        Upload raw bytes under a fixed filename and return the public URL.
+        Used for derived objects (e.g. image renditions) whose names are deterministic;
+        these are not reference counted.
+        """
+        if bucket_type not in self.buckets:
+            raise ValueError(f"Invalid bucket type: {bucket_type}")
+
+        bucket_name = self.buckets[bucket_type]
+        await self.backend.upload_bytes(bucket_name, filename, content, content_type, upsert)
+        return self.backend.get_public_url(bucket_name, filename)
+
+    async def download_image(self, image_url: str, bucket_type: BucketType) -> Optional[bytes]:
+        """
+        Download the stored bytes of an image using its public URL
+        """
+        try:
+            if bucket_type not in self.buckets:
+                return None
+
+            filename = self._extract_filename_from_url(image_url)
+            if not filename:
+                return None
+
+            bucket_name = self.buckets[bucket_type]
+            return await self.backend.download(bucket_name, filename)
+
+        except Exception as e:
+            print(f"Error downloading image: {str(e)}")
+            return None
+
+    async def list_images(self, bucket_type: BucketType, limit: int = 100, offset: int = 0) -> list:
+        """
+        List images in the specified bucket
+        """
+        try:
+            if bucket_type not in self.buckets:
+                return []
+
+            bucket_name = self.buckets[bucket_type]
+            return await self.backend.list(bucket_name, limit=limit, offset=offset)
+
+        except Exception as e:
+            print(f"Error listing images: {str(e)}")
+            return []
+
+    async def create_bucket(self, bucket_type: BucketType, options: Optional[dict] = None) -> None:
+        """Create a storage bucket (raises if it already exists)"""
+        if bucket_type not in self.buckets:
+            raise ValueError(f"Invalid bucket type: {bucket_type}")
+        await self.backend.create_bucket(self.buckets[bucket_type], options)
+
+    def get_bucket_info(self) -> dict:
+        """Get information about all available buckets"""
+        return {
+            "storage_backend": self.backend.name,
+            "available_buckets": list(self.buckets.keys()),
+            "bucket_descriptions": {
+                "blogs-images": "Images for blog posts and articles",
+                "package-images": "Images for travel packages",
+                "destination-images": "Images for travel destinations",
+                "activity-images": "Images for activities and attractions"
+            }
+        }
+
+    def _is_valid_image(self, filename: str) -> bool:
+        """Check if the file is a valid image type"""
+        if not filename:
+            return False
+
+        valid_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+        file_extension = self._get_file_extension(filename).lower()
+        return file_extension in valid_extensions
+
+    def _get_file_extension(self, filename: str) -> str:
+        """Get file extension from filename"""
+        return os.path.splitext(filename)[1].lower()
+
+    def _get_content_type(self, filename: str) -> str:
+        """Get MIME type from filename"""
+        content_type, _ = mimetypes.guess_type(filename)
+        return content_type or 'application/octet-stream'
+
+    def _extract_filename_from_url(self, url: str) -> Optional[str]:
+        """Extract the object key from a public URL"""
+        return self.backend.key_from_url(url)
+
+
+# Create a singleton instance
+storage_service = StorageService()
@@ -0,0 +1,134 @@
+"""
+Delta sync for the public catalog lists.
+
+A client that already holds a list passes the watermark of its last sync as
+updated_since and receives only what changed after it: rows whose updated_at
+moved (still visible ones as items, hidden ones as removals) and tombstones of
+deleted rows from catalog_deletions. The returned watermark lags the server
+clock slightly so rows committed just after the read are sent again next time
+instead of being missed; re-applying a row is harmless.
+"""
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Iterable
+
+from sqlalchemy.orm import selectinload
+from sqlmodel import select, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import Config
+from ..models.blog import Blog, BlogStatus
+from ..models.catalog_deletion import CatalogDeletion
+from ..models.destination import Destination
+from ..models.package import Package
+from ..schemas.destination_schemas import DestinationResponseModel
+from ..schemas.package_schemas import PackageResponseModel
+
+
+class SyncService:
+    async def record_deletions(self, session: AsyncSession, entity_type: str, ids: Iterable[uuid.UUID]) -> None:
+        """
+        Add tombstones to the caller's transaction, so they commit with the delete,
+        and drop this entity type's tombstones older than the retention window.
+        """
+        session.add_all([CatalogDeletion(entity_type=entity_type, entity_id=entity_id) for entity_id in ids])
+        await session.execute(
+            delete(CatalogDeletion).where(
+                CatalogDeletion.entity_type == entity_type,
+                CatalogDeletion.deleted_at < datetime.now() - timedelta(days=Config.SYNC_TOMBSTONE_RETENTION_DAYS)
+            ).execution_options(synchronize_session=False)
+        )
+
+    def _local(self, timestamp: datetime) -> datetime:
+        """updated_at columns hold naive server-local times; convert aware client timestamps"""
+        return timestamp.astimezone().replace(tzinfo=None) if timestamp.tzinfo else timestamp
+
+    def is_expired(self, updated_since: datetime) -> bool:
+        """True when tombstones since then may have been pruned, so a delta could miss deletions"""
+        return self._local(updated_since) < datetime.now() - timedelta(days=Config.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+    def watermark(self) -> datetime:
+        """Where the next delta should start; lags the clock to cover transactions still committing"""
+        return datetime.now() - timedelta(seconds=Config.SYNC_WATERMARK_LAG_SECONDS)
+
+    async def deleted_ids(self, session: AsyncSession, entity_type: str, updated_since: datetime) -> List[uuid.UUID]:
+        """Ids of entity_type deleted after updated_since, from the tombstones"""
+        statement = select(CatalogDeletion.entity_id).where(
+            CatalogDeletion.entity_type == entity_type,
+            CatalogDeletion.deleted_at > updated_since
+        ).distinct()
+        return list((await session.exec(statement)).all())
+
+    def _delta(self, key: str, items: List[Any], deleted_ids: List[uuid.UUID], watermark: datetime) -> Dict[str, Any]:
+        """A delta in the shape of the paginated list responses, all on one page"""
+        return {
+            key: items,
+            "total": len(items),
+            "page": 1,
+            "limit": len(items),
+            "total_pages": 1 if items else 0,
+            "deleted_ids": deleted_ids,
+            "watermark": watermark
+        }
+
+    async def get_package_changes(self, session: AsyncSession, updated_since: datetime) -> Dict[str, Any]:
+        """Active packages changed since updated_since, and the ids to drop"""
+        # Imported here: the catalog services import this module to record deletions
+        from .package_service import package_service
+
+        updated_since = self._local(updated_since)
+        watermark = self.watermark()
+        # Schedule writes bump the package's updated_at too (durations and inclusion tags show in lists)
+        statement = select(Package).options(selectinload(Package.detail_schedule)).where(
+            Package.updated_at > updated_since
+        ).order_by(Package.updated_at, Package.id)
+        changed = (await session.exec(statement)).all()
+
+        items = [
+            PackageResponseModel.model_validate(package_service.to_list_item(package))
+            for package in changed if package.is_active
+        ]
+        hidden = [package.id for package in changed if not package.is_active]
+        deleted = await self.deleted_ids(session, "package", updated_since)
+        return self._delta("packages", items, hidden + deleted, watermark)
+
+    async def get_destination_changes(self, session: AsyncSession, updated_since: datetime) -> Dict[str, Any]:
+        """Active destinations changed since updated_since, and the ids to drop"""
+        from .destination_service import destination_service
+
+        updated_since = self._local(updated_since)
+        watermark = self.watermark()
+        statement = select(Destination).where(Destination.updated_at > updated_since).order_by(
+            Destination.updated_at, Destination.id
+        )
+        changed = (await session.exec(statement)).all()
+
+        items = await destination_service.with_package_aggregates(session, [
+            DestinationResponseModel.model_validate(destination)
+            for destination in changed if destination.is_active
+        ])
+        hidden = [destination.id for destination in changed if not destination.is_active]
+        deleted = await self.deleted_ids(session, "destination", updated_since)
+        return self._delta("destinations", items, hidden + deleted, watermark)
+
+    async def get_blog_changes(self, session: AsyncSession, updated_since: datetime) -> Dict[str, Any]:
+        """Published blogs changed since updated_since, and the ids to drop"""
+        from src.auth.models import User
+
+        updated_since = self._local(updated_since)
+        watermark = self.watermark()
+        statement = select(Blog, User.full_name).join(User, Blog.author_id == User.uid).where(
+            Blog.updated_at > updated_since
+        ).order_by(Blog.updated_at, Blog.id)
+        changed = (await session.exec(statement)).all()
+
+        items = [
+            {**blog.model_dump(), 'author_name': author_name}
+            for blog, author_name in changed if blog.status == BlogStatus.PUBLISHED
+        ]
+        hidden = [blog.id for blog, _ in changed if blog.status != BlogStatus.PUBLISHED]
+        deleted = await self.deleted_ids(session, "blog", updated_since)
+        return self._delta("blogs", items, hidden + deleted, watermark)
+
+
+sync_service = SyncService()
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from ..services.storage_backends import LocalStorageBackend
+from ..services.storage_service import storage_service
+from ..utils.upload_utils import spool_chunks
+
+storage_upload_router = APIRouter()
+
+
+@storage_upload_router.put("/upload/{bucket}/{key}")
+async def receive_signed_upload(
+    bucket: str,
+    key: str,
+    request: Request,
+    expires: int = Query(...),
+    token: str = Query(...)
+):
+    """Receive a signed direct upload (local storage backend stand-in for Supabase signed URLs)"""
+    backend = storage_service.backend
+    if not isinstance(backend, LocalStorageBackend):
+        raise HTTPException(status_code=404, detail="Not found")
+
+    if bucket not in storage_service.buckets:
+        raise HTTPException(status_code=400, detail="Invalid bucket")
+
+    try:
+        valid = backend.verify_signed_upload(bucket, key, expires, token)
+    except ValueError:
+        valid = False
+    if not valid:
+        raise HTTPException(status_code=403, detail="Invalid or expired upload token")
+
+    spooled = await spool_chunks(request.stream())
+    try:
+        if not key.endswith(spooled.extension):
+            raise HTTPException(status_code=400, detail="File content does not match the key's image type")
+        # Content-addressed keys must match what was actually received
+        stem = key[:-len(spooled.extension)]
+        if len(stem) == 64 and stem != spooled.sha256:
+            raise HTTPException(status_code=400, detail="File content does not match its SHA-256")
+
+        with open(spooled.path, "rb") as body:
+            await backend.upload(bucket, key, body, spooled.content_type)
+    finally:
+        spooled.cleanup()
+
+    return {"bucket": bucket, "key": key, "size": spooled.size}
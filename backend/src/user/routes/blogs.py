@@ -1,12 +1,14 @@
 """
 Public blog routes for users
 """
-from fastapi import APIRouter, HTTPException, Depends, Query, UploadFile, File, Form
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, UploadFile, File, Form, BackgroundTasks
+from typing import Optional, List
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 import uuid
+from datetime import datetime
 
+from ...config import Config
 from ...db.main import get_session
 from ...models.blog import Blog, BlogStatus
 from ...schemas.blog_schemas import (
@@ -16,7 +18,10 @@ from ...schemas.blog_schemas import (
     BlogCreateModel,
     BlogUpdateModel
 )
+from ...schemas.batch_schemas import parse_batch_ids, BlogBatchResponseModel
 from ...services.blog_service import blog_service
+from ...services.sync_service import sync_service
+from ...services.image_rendition_service import image_rendition_service
 from ...auth.dependencies import get_current_user
 from ...auth.models import User
 
@@ -29,10 +34,19 @@ async def get_public_blogs(
     limit: int = Query(12, ge=1, le=50, description="Number of items per page"),
     search: Optional[str] = Query(None, description="Search term"),
     category: Optional[str] = Query(None, description="Filter by category"),
+    updated_since: Optional[datetime] = Query(None, description="Only changes after this watermark (delta sync); other filters are ignored"),
     session: AsyncSession = Depends(get_session),
 ):
-    """Get published blogs with filtering (only published blogs visible to public)"""
+    """
+    Get published blogs with filtering (only published blogs visible to public).
+    With updated_since, return only the blogs changed since then plus the ids to remove.
+    """
+    if updated_since and sync_service.is_expired(updated_since):
+        raise HTTPException(status_code=410, detail="updated_since is older than the deletion log; fetch the full list again")
     try:
+        if updated_since:
+            return await sync_service.get_blog_changes(session, updated_since)
+        
         result = await blog_service.get_blogs(
             session=session,
             page=page,
@@ -47,6 +61,30 @@ async def get_public_blogs(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@blogs_router.get("/blogs/batch", response_model=BlogBatchResponseModel)
+async def get_blogs_batch(
+    ids: List[str] = Query(..., description="Blog ids, repeatable or comma separated"),
+    session: AsyncSession = Depends(get_session),
+):
+    """Get many published blogs at once, in request order; unpublished or unknown ids are marked not found"""
+    try:
+        blog_ids = parse_batch_ids(ids, Config.BATCH_GET_MAX_IDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        blogs = await blog_service.get_blogs_by_ids(session, blog_ids)
+        items = []
+        for blog_id in blog_ids:
+            blog = blogs.get(blog_id)
+            if blog and blog.status == BlogStatus.PUBLISHED.value:
+                items.append({"id": blog_id, "found": True, "blog": blog})
+            else:
+                items.append({"id": blog_id, "found": False})
+        return {"items": items}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @blogs_router.get("/blogs/{blog_id}")
 async def get_blog_by_id(
     blog_id: str,
@@ -74,6 +112,7 @@ async def get_blog_by_id(
 
 @blogs_router.post("/my-blogs", response_model=BlogResponseModel)
 async def create_user_blog(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     excerpt: Optional[str] = Form(None),
     content: str = Form(...),
@@ -102,6 +141,8 @@ async def create_user_blog(
             blog_data=blog_data,
             cover_image=cover_image
         )
+        if new_blog.cover_image:
+            background_tasks.add_task(image_rendition_service.process_in_background, 'blog', new_blog.id)
         
         return BlogResponseModel.model_validate(new_blog)
         
@@ -162,6 +203,7 @@ async def get_user_blogs(
 @blogs_router.put("/my-blogs/{blog_id}", response_model=BlogResponseModel)
 async def update_user_blog(
     blog_id: str,
+    background_tasks: BackgroundTasks,
     title: Optional[str] = Form(None),
     excerpt: Optional[str] = Form(None),
     content: Optional[str] = Form(None),
@@ -209,6 +251,8 @@ async def update_user_blog(
             blog_data=blog_update,
             cover_image=cover_image
         )
+        if cover_image:
+            background_tasks.add_task(image_rendition_service.process_in_background, 'blog', updated_blog.id)
         
         return BlogResponseModel.model_validate(updated_blog)
         
@@ -1,8 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from datetime import datetime
+from ...config import Config
 from ...db.main import get_session
 from ...auth.dependencies import get_current_user
 from ...services.destination_service import destination_service
-from ...schemas.destination_schemas import DestinationListResponseModel, DestinationResponseModel
+from ...services.sync_service import sync_service
+from ...schemas.destination_schemas import (
+    DestinationListResponseModel,
+    DestinationResponseModel,
+    NearbyDestinationsResponseModel,
+    DestinationMapResponseModel
+)
+from ...schemas.batch_schemas import parse_batch_ids, DestinationBatchResponseModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 destinations_router = APIRouter()
@@ -12,15 +22,21 @@ async def get_destinations(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=50, description="Number of items per page"),
     search: str = Query(None, description="Search term"),
+    updated_since: Optional[datetime] = Query(None, description="Only changes after this watermark (delta sync); other filters are ignored"),
     session: AsyncSession = Depends(get_session),
     current_user=Depends(get_current_user)
 ):
     """
     Get public destinations with pagination and optional search.
     
-    This endpoint returns a paginated list of destinations.
+    This endpoint returns a paginated list of destinations. With updated_since,
+    it returns only the destinations changed since then plus the ids to remove.
     """
+    if updated_since and sync_service.is_expired(updated_since):
+        raise HTTPException(status_code=410, detail="updated_since is older than the deletion log; fetch the full list again")
     try:
+        if updated_since:
+            return await sync_service.get_destination_changes(session, updated_since)
         result = await destination_service.get_destinations(
             session=session,
             page=page,
@@ -31,6 +47,74 @@ async def get_destinations(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@destinations_router.get("/destinations/batch", response_model=DestinationBatchResponseModel)
+async def get_destinations_batch(
+    ids: List[str] = Query(..., description="Destination ids, repeatable or comma separated"),
+    session: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user)
+):
+    """
+    Get many destinations at once, in request order. Inactive or unknown ids are marked not found.
+    """
+    try:
+        destination_ids = parse_batch_ids(ids, Config.BATCH_GET_MAX_IDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        destinations = await destination_service.get_destinations_by_ids(session, destination_ids)
+        items = []
+        for destination_id in destination_ids:
+            destination = destinations.get(destination_id)
+            if destination and destination.is_active:
+                items.append({"id": destination_id, "found": True, "destination": destination})
+            else:
+                items.append({"id": destination_id, "found": False})
+        return {"items": items}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@destinations_router.get("/destinations/nearby", response_model=NearbyDestinationsResponseModel)
+async def get_nearby_destinations(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude of the centre"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude of the centre"),
+    radius: float = Query(50, gt=0, le=2000, description="Radius in km"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of destinations"),
+    session: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user)
+):
+    """
+    Get active destinations within a radius of a point, nearest first.
+    """
+    try:
+        destinations = await destination_service.get_nearby_destinations(
+            session, latitude=lat, longitude=lon, radius_km=radius, limit=limit
+        )
+        return {"latitude": lat, "longitude": lon, "radius_km": radius, "destinations": destinations}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@destinations_router.get("/destinations/map", response_model=DestinationMapResponseModel)
+async def get_destinations_in_bbox(
+    south: float = Query(..., ge=-90, le=90),
+    west: float = Query(..., ge=-180, le=180),
+    north: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+    limit: int = Query(200, ge=1, le=500, description="Maximum number of destinations"),
+    session: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user)
+):
+    """
+    Get active destinations inside a map bounding box (west > east crosses the antimeridian).
+    """
+    if south > north:
+        raise HTTPException(status_code=400, detail="south must not be greater than north")
+    try:
+        return await destination_service.get_destinations_in_bbox(
+            session, south=south, west=west, north=north, east=east, limit=limit
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @destinations_router.get("/destinations/{destination_id}", response_model=DestinationResponseModel)
 async def get_destination_by_id(
     destination_id: str,
@@ -1,12 +1,16 @@
 """
 Public package routes for users
 """
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
+from typing import Optional, List, Literal
+from datetime import date, datetime
+import uuid
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
+from sqlalchemy.orm import selectinload
 
 from ...auth.dependencies import get_current_user
+from ...config import Config
 from ...db.main import get_session
 from ...models.package import Package
 from ...models.destination import Destination
@@ -14,9 +18,17 @@ from ...models.destination import Destination
 from ...schemas.package_schemas import (
     PackageResponseModel, 
     PackageDetailResponseModel,
-    PackageListResponseModel
+    PackageListResponseModel,
+    PackageSearchResponseModel,
+    SimilarPackagesResponseModel
 )
-from ...services.package_service import package_service
+from ...schemas.batch_schemas import parse_batch_ids, PackageBatchResponseModel
+from ...services.package_service import package_service, DURATION_BUCKETS
+from ...services.recommendation_service import recommendation_service
+from ...utils.package_content import INCLUSION_TAGS
+from ...services.popularity_service import popularity_service
+from ...services.catalog_snapshot import catalog_snapshot_service
+from ...services.sync_service import sync_service
 
 packages_router = APIRouter()
 
@@ -31,11 +43,31 @@ async def get_public_packages(
     min_price: Optional[float] = Query(None, ge=0, description="Minimum price"),
     max_price: Optional[float] = Query(None, ge=0, description="Maximum price"),
     difficulty: Optional[str] = Query(None, description="Filter by difficulty level"),
+    updated_since: Optional[datetime] = Query(None, description="Only changes after this watermark (delta sync); other filters are ignored"),
     session: AsyncSession = Depends(get_session),
     current_user=Depends(get_current_user),
 ):
-    """Get public packages with filtering (only active packages, full info)"""
+    """
+    Get public packages with filtering (only active packages, full info).
+    With updated_since, return only the packages changed since then plus the ids to remove.
+    """
+    if updated_since and sync_service.is_expired(updated_since):
+        raise HTTPException(status_code=410, detail="updated_since is older than the deletion log; fetch the full list again")
     try:
+        if updated_since:
+            return await sync_service.get_package_changes(session, updated_since)
+        
+        snapshot = catalog_snapshot_service.current()
+        if snapshot is not None:
+            return snapshot.list_packages(
+                page=page,
+                limit=limit,
+                search=search,
+                destination_id=destination_id,
+                min_price=min_price,
+                max_price=max_price
+            )
+        
         result = await package_service.get_packages(
             session=session,
             page=page,
@@ -52,29 +84,90 @@ async def get_public_packages(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@packages_router.get("/packages/search", response_model=PackageSearchResponseModel)
+async def search_packages(
+    page: int = Query(1, ge=1, description="Page number"),
+    limit: int = Query(12, ge=1, le=50, description="Number of items per page"),
+    search: Optional[str] = Query(None, description="Search term"),
+    destination_id: Optional[List[uuid.UUID]] = Query(None, description="Filter by destinations (repeatable)"),
+    country: Optional[List[str]] = Query(None, description="Filter by countries (repeatable)"),
+    duration: Optional[List[str]] = Query(None, description="Filter by duration buckets: 1-3, 4-7, 8-14, 15+"),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum price"),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum price"),
+    price_bucket_size: float = Query(500, gt=0, description="Width of the price histogram buckets"),
+    available_from: Optional[date] = Query(None, description="First travel date"),
+    available_until: Optional[date] = Query(None, description="Last travel date"),
+    availability: Literal["overlap", "contain"] = Query(
+        "overlap", description="overlap: available on any of the dates; contain: available on all of them"
+    ),
+    inclusion: Optional[List[str]] = Query(None, description="Require inclusion tags, e.g. breakfast, airport_transfer (repeatable)"),
+    session: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user),
+):
+    """
+    Search active packages and return facet counts for destination, country, duration and price.
+    Optionally restrict to packages available between available_from and available_until
+    and to packages that include every requested inclusion tag.
+    """
+    valid_durations = {key for key, _, _ in DURATION_BUCKETS}
+    if duration and not set(duration) <= valid_durations:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid duration. Use one of: {', '.join(key for key, _, _ in DURATION_BUCKETS)}"
+        )
+    if inclusion and not set(inclusion) <= INCLUSION_TAGS.keys():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid inclusion. Use one of: {', '.join(INCLUSION_TAGS)}"
+        )
+    if available_from and available_until and available_from > available_until:
+        raise HTTPException(status_code=400, detail="available_from must be before available_until")
+    try:
+        result = await package_service.search_packages(
+            session=session,
+            page=page,
+            limit=limit,
+            search=search,
+            destination_ids=destination_id,
+            countries=country,
+            durations=duration,
+            min_price=min_price,
+            max_price=max_price,
+            price_bucket_size=price_bucket_size,
+            available_from=available_from,
+            available_until=available_until,
+            availability=availability,
+            inclusions=inclusion
+        )
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @packages_router.get("/packages/featured", response_model=PackageListResponseModel)
 async def get_featured_packages(
     limit: int = Query(6, ge=1, le=20, description="Number of featured packages"),
     session: AsyncSession = Depends(get_session),
     current_user=Depends(get_current_user)
 ):
-    """Get featured packages for homepage (full info)"""
+    """Get featured packages for homepage, most popular first (full info)"""
     try:
-        result = await package_service.get_packages(
-            session=session,
-            page=1,
-            limit=limit,
-            active_only=True,
-            search=None,
-            destination_id=None,
-            trip_type_id=None,
-            min_price=None,
-            max_price=None
-        )
-        # Filter for featured
-        featured = [pkg for pkg in result["packages"] if getattr(pkg, "is_featured", False)]
+        package_ids = await popularity_service.get_ranked_ids(limit=limit, featured_only=True)
+        if package_ids is not None:
+            packages = await popularity_service.get_packages_in_order(session, package_ids)
+        else:
+            # No ranking yet; newest featured packages
+            statement = select(Package).options(selectinload(Package.detail_schedule)).where(
+                Package.is_active == True,
+                Package.is_featured == True
+            ).order_by(Package.created_at.desc()).limit(limit)
+            packages = (await session.exec(statement)).all()
+
+        featured = [
+            PackageResponseModel.model_validate(package_service.to_list_item(package))
+            for package in packages
+        ]
         return {
-            **result,
             "packages": featured,
             "total": len(featured),
             "page": 1,
@@ -109,6 +202,52 @@ async def get_search_suggestions(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@packages_router.get("/packages/batch", response_model=PackageBatchResponseModel)
+async def get_packages_batch(
+    ids: List[str] = Query(..., description="Package ids, repeatable or comma separated"),
+    session: AsyncSession = Depends(get_session)
+):
+    """Get package details for many ids at once, in request order; inactive or unknown ids are marked not found"""
+    try:
+        package_ids = parse_batch_ids(ids, Config.BATCH_GET_MAX_IDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        details = await package_service.get_package_details(session, package_ids)
+        items = []
+        for package_id in package_ids:
+            detail = details.get(package_id)
+            if detail and detail.is_active:
+                items.append({"id": package_id, "found": True, "package": detail})
+            else:
+                items.append({"id": package_id, "found": False})
+        return {"items": items}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@packages_router.get("/packages/{package_id}/similar", response_model=SimilarPackagesResponseModel)
+async def get_similar_packages(
+    package_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    limit: int = Query(6, ge=1, le=20, description="Number of similar packages"),
+    session: AsyncSession = Depends(get_session)
+):
+    """Get precomputed similar packages for a package detail page"""
+    try:
+        result = await recommendation_service.get_similar(session, package_id, limit=limit)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Package not found")
+        if result["computed_at"] is None:
+            # Not indexed yet (new package); pick it up for the next request
+            background_tasks.add_task(recommendation_service.refresh_in_background)
+        return result
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @packages_router.get("/packages/{package_id}", response_model=PackageDetailResponseModel)
 async def get_package_details(
     package_id: str,
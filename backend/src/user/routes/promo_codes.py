@@ -9,7 +9,9 @@ from ...db.main import get_session
 from ...schemas.promo_code_schemas import (
     PromoCodeValidationModel,
     PromoCodeValidationResponseModel,
-    PromoCodeResponseModel
+    PromoCodeResponseModel,
+    PromoQuoteRequestModel,
+    PromoQuoteResponseModel
 )
 from ...services.promo_code_service import PromoCodeService
 from ...auth.dependencies import get_current_user
@@ -72,6 +74,30 @@ async def validate_promo_code(
         )
 
 
+@promo_codes_router.post("/promo_codes/quote", response_model=PromoQuoteResponseModel)
+async def quote_promo_code(
+    quote_data: PromoQuoteRequestModel,
+    session: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user)
+):
+    """
+    Apply a promo code to many packages at once.
+    
+    Takes the code and either a list of package IDs or a package filter, and
+    returns the discounted price of every package so listings can show them
+    without validating the code once per package.
+    """
+    try:
+        result = await PromoCodeService.quote_packages(session=session, request=quote_data)
+        return result
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error quoting promo code: {str(e)}"
+        )
+
+
 @promo_codes_router.get("/check/{code}", response_model=PromoCodeValidationResponseModel)
 async def check_promo_code_quick(
     code: str,
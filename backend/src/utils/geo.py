@@ -0,0 +1,128 @@
+"""
+Geohash helpers for destination coordinates, without PostGIS.
+
+A geohash interleaves longitude and latitude bits into a base-32 string, so
+points sharing a prefix lie in the same cell and a B-tree index finds every
+point of a cell with one range scan. A radius search looks up the 3x3
+block of cells around the centre at the finest precision whose cells are at
+least as large as the radius, then filters exactly by great-circle distance.
+Prefixes are matched as [prefix, prefix_upper_bound) ranges on a "C" collated
+column, which the index serves even as bound parameters of a prepared plan.
+"""
+import math
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func
+
+
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def validate_coordinates(latitude: Optional[float], longitude: Optional[float]) -> None:
+    """Raise ValueError unless both are given and in range, or both are missing"""
+    if (latitude is None) != (longitude is None):
+        raise ValueError("latitude and longitude must be given together")
+    if latitude is not None and not -90 <= latitude <= 90:
+        raise ValueError("latitude must be between -90 and 90")
+    if longitude is not None and not -180 <= longitude <= 180:
+        raise ValueError("longitude must be between -180 and 180")
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= mid:
+            value |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def geohash_for(latitude: Optional[float], longitude: Optional[float]) -> Optional[str]:
+    """Stored geohash of a destination; None without coordinates"""
+    if latitude is None or longitude is None:
+        return None
+    return encode_geohash(latitude, longitude)
+
+
+def cell_size_degrees(precision: int) -> Tuple[float, float]:
+    """(height, width) of a geohash cell in degrees"""
+    lon_bits = math.ceil(5 * precision / 2)
+    lat_bits = 5 * precision - lon_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def covering_prefixes(latitude: float, longitude: float, radius_km: float) -> Optional[List[str]]:
+    """
+    Geohash prefixes whose cells together contain every point within radius_km,
+    or None when the circle is too large or too close to a pole for cells to
+    help (callers then scan by distance alone).
+    """
+    radius_lat = radius_km / KM_PER_DEGREE_LAT
+    # Cells are narrowest at the circle's edge nearest a pole
+    edge_latitude = abs(latitude) + radius_lat
+    if edge_latitude >= 89:
+        return None
+    km_per_degree_lon = KM_PER_DEGREE_LAT * math.cos(math.radians(edge_latitude))
+
+    precision = 0
+    for candidate in range(1, GEOHASH_PRECISION + 1):
+        height, width = cell_size_degrees(candidate)
+        if height * KM_PER_DEGREE_LAT < radius_km or width * km_per_degree_lon < radius_km:
+            break
+        precision = candidate
+    if precision == 0:
+        return None
+
+    # The centre cell and its eight neighbours
+    height, width = cell_size_degrees(precision)
+    prefixes = set()
+    for lat_step in (-1, 0, 1):
+        cell_latitude = latitude + lat_step * height
+        if not -90 <= cell_latitude <= 90:
+            continue
+        for lon_step in (-1, 0, 1):
+            cell_longitude = (longitude + lon_step * width + 180) % 360 - 180
+            prefixes.add(encode_geohash(cell_latitude, cell_longitude, precision))
+    return sorted(prefixes)
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with prefix (byte order)"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    d_lat = math.radians(lat2 - lat1)
+    d_lon = math.radians(lon2 - lon1)
+    a = math.sin(d_lat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(d_lon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_km_sql(latitude_column, longitude_column, latitude: float, longitude: float):
+    """Great-circle distance in km from (latitude, longitude) as a SQL expression"""
+    d_lat = func.radians(latitude_column - latitude)
+    d_lon = func.radians(longitude_column - longitude)
+    a = (
+        func.power(func.sin(d_lat / 2), 2) +
+        math.cos(math.radians(latitude)) * func.cos(func.radians(latitude_column)) * func.power(func.sin(d_lon / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(a)))
@@ -2,9 +2,134 @@
 Image utilities for VistaVoyage backend
 Provides helper functions for image management across all models
 """
-from typing import List, Optional, Dict, Any
+import asyncio
+import base64
+import hashlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import List, Optional, Dict, Any, Sequence
 from fastapi import UploadFile
+from PIL import Image, ImageOps
+from ..config import Config
 from ..services.supabase_service import supabase_service
+from ..services.storage_service import rendition_key
+
+
+RENDITION_CONTENT_TYPE = "image/webp"
+PLACEHOLDER_SIZE = 16
+
+
+@dataclass
+class ImageRendition:
+    """A single width-bounded WebP rendition of an image"""
+    width: int
+    height: int
+    content: bytes
+
+
+@dataclass
+class RenditionBundle:
+    """Result of processing one source image"""
+    width: int
+    height: int
+    placeholder: str
+    renditions: List[ImageRendition] = field(default_factory=list)
+
+
+def build_renditions(content: bytes, widths: Sequence[int], quality: int = 80) -> RenditionBundle:
+    """
+    Decode an image and produce width-bounded WebP renditions plus a tiny
+    base64 placeholder (LQIP). EXIF is dropped from every output after the
+    orientation tag has been applied to the pixels.
+    
+    This is CPU-bound and runs inside the process pool, so it must stay a
+    plain module-level function.
+    """
+    with Image.open(io.BytesIO(content)) as source:
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+        
+        original_width, original_height = image.size
+        renditions = []
+        seen_widths = set()
+        
+        for width in sorted(set(widths)):
+            # Never upscale: small originals collapse into a single rendition
+            target_width = min(width, original_width)
+            if target_width in seen_widths:
+                continue
+            seen_widths.add(target_width)
+            
+            target_height = max(1, round(original_height * target_width / original_width))
+            resized = image if target_width == original_width else image.resize(
+                (target_width, target_height), Image.Resampling.LANCZOS
+            )
+            buffer = io.BytesIO()
+            resized.save(buffer, format="WEBP", quality=quality, method=4, exif=b"")
+            renditions.append(ImageRendition(target_width, target_height, buffer.getvalue()))
+        
+        thumbnail = image.copy()
+        thumbnail.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+        buffer = io.BytesIO()
+        thumbnail.save(buffer, format="WEBP", quality=30, exif=b"")
+        placeholder = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+    
+    return RenditionBundle(
+        width=original_width,
+        height=original_height,
+        placeholder=placeholder,
+        renditions=renditions
+    )
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Lazily create the shared process pool used for image processing"""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=Config.IMAGE_PROCESS_POOL_SIZE)
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the image process pool (called on application shutdown)"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+async def generate_renditions(content: bytes, widths: Optional[Sequence[int]] = None) -> RenditionBundle:
+    """Run build_renditions in the process pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_process_pool(),
+        partial(
+            build_renditions,
+            content,
+            tuple(widths or Config.IMAGE_RENDITION_WIDTHS),
+            Config.IMAGE_RENDITION_QUALITY
+        )
+    )
+
+
+def rendition_filename(image_url: str, width: int) -> str:
+    """Deterministic object name for a rendition, stored next to its original"""
+    return rendition_key(supabase_service._extract_filename_from_url(image_url) or "", width)
+
+
+class ContentHashMismatch(ValueError):
+    """A content-addressed object whose bytes do not hash to its key"""
+
+    def __init__(self, image_url: str):
+        super().__init__(f"Stored object does not match its content hash: {image_url}")
+        self.image_url = image_url
 
 
 class ImageManager:
@@ -110,6 +235,63 @@ class ImageManager:
         
         return results
     
+    @classmethod
+    async def create_renditions(cls, image_url: str, entity_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Generate and upload renditions for an already stored image
+        
+        Args:
+            image_url: Public URL of the original image
+            entity_type: Type of entity (blog, package, destination)
+            
+        Returns:
+            JSON-serializable rendition metadata, or None if the original
+            could not be downloaded or decoded
+        
+        Raises:
+            ContentHashMismatch: a content-addressed original does not hash to its key
+        """
+        if entity_type not in cls.BUCKET_MAPPING:
+            raise ValueError(f"Invalid entity type: {entity_type}")
+        
+        bucket_type = cls.BUCKET_MAPPING[entity_type]
+        content = await supabase_service.download_image(image_url, bucket_type)
+        if not content:
+            return None
+        
+        # "<sha256><ext>" keys written directly by clients are only hash-checked here
+        stem = os.path.splitext(supabase_service._extract_filename_from_url(image_url) or "")[0]
+        if len(stem) == 64 and hashlib.sha256(content).hexdigest() != stem:
+            raise ContentHashMismatch(image_url)
+        
+        try:
+            bundle = await generate_renditions(content)
+        except Exception as e:
+            print(f"Failed to process image {image_url}: {str(e)}")
+            return None
+        
+        sources = []
+        for rendition in bundle.renditions:
+            url = await supabase_service.upload_bytes(
+                rendition.content,
+                rendition_filename(image_url, rendition.width),
+                bucket_type,
+                RENDITION_CONTENT_TYPE
+            )
+            sources.append({
+                "width": rendition.width,
+                "height": rendition.height,
+                "url": url
+            })
+        
+        return {
+            "width": bundle.width,
+            "height": bundle.height,
+            "format": "webp",
+            "placeholder": bundle.placeholder,
+            "sources": sources
+        }
+    
     @classmethod
     def get_supported_entities(cls) -> List[str]:
         """Get list of supported entity types"""
@@ -0,0 +1,112 @@
+"""
+Structured views of the free-text package content.
+
+Admins write itineraries and inclusions as plain text. parse_itinerary splits an
+itinerary into days ("Day 1: Arrival ..." headers) and extract_inclusion_tags
+maps inclusions onto a fixed tag vocabulary, so both can be stored as JSONB next
+to the text and filtered with indexed containment queries.
+"""
+import re
+from typing import Optional, List, Dict, Any
+
+
+# Normalised inclusion tag -> phrases that mention it (case-insensitive regexes)
+INCLUSION_TAGS: Dict[str, List[str]] = {
+    "breakfast": [r"breakfasts?", r"bed (?:and|&) breakfast", r"\bb ?& ?b\b"],
+    "lunch": [r"lunch(?:es)?"],
+    "dinner": [r"dinners?"],
+    "all_meals": [r"all meals", r"full board", r"all[- ]inclusive"],
+    "accommodation": [r"accommodations?", r"hotels?", r"resorts?", r"lodges?", r"guest ?houses?", r"homestays?"],
+    "airport_transfer": [
+        r"airport (?:pick[- ]?ups?|drop[- ]?offs?|drops?|transfers?)",
+        r"(?:pick[- ]?ups?|drop[- ]?offs?|transfers?) (?:from|to) (?:the )?airport",
+    ],
+    "flights": [r"flights?", r"air ?fares?", r"air tickets?"],
+    "transport": [r"transport(?:ation)?", r"(?:private|a/?c|air[- ]conditioned) (?:cars?|vehicles?|coach(?:es)?|bus(?:es)?|vans?)"],
+    "guide": [r"(?:tour |local |english[- ]speaking )?guides?\b", r"guided"],
+    "sightseeing": [r"sightseeing", r"city tours?"],
+    "entrance_fees": [r"entr(?:y|ance) (?:fees?|tickets?)", r"admission(?: fees?| tickets?)?", r"park fees?"],
+    "activities": [r"activities", r"excursions?", r"safaris?", r"cruises?", r"boat (?:rides?|trips?)"],
+    "visa": [r"visas?"],
+    "travel_insurance": [r"(?:travel )?insurance"],
+    "wifi": [r"wi-?fi"],
+    "taxes": [r"taxes", r"\bvat\b", r"service charges?"],
+}
+
+_TAG_PATTERNS = {
+    tag: re.compile(r"\b(?:" + "|".join(phrases) + r")", re.IGNORECASE)
+    for tag, phrases in INCLUSION_TAGS.items()
+}
+
+# Items that name something the package does not cover, e.g. "Lunch (not included)"
+_NEGATED_ITEM = re.compile(
+    r"\b(?:not included|excluded|not covered|own expense|at extra cost|optional)\b", re.IGNORECASE
+)
+
+# Inclusion lists are written as lines, bullets or comma/semicolon separated items
+_ITEM_SEPARATOR = re.compile(r"[\n;,•]+|\s+-\s+")
+
+# "Day 1:", "DAY 2 -", "Day 3-4.", "- Day 5)" ... anywhere in the text
+_DAY_HEADER = re.compile(
+    r"(?:^|(?<=[\s.;]))(?:[-*•]\s*)?day\s*(\d{1,3})(?:\s*(?:-|–|to|&)\s*(\d{1,3}))?\s*[:.)\-–]\s*",
+    re.IGNORECASE
+)
+
+_TITLE_END = re.compile(r"\n|(?<=[.!?])\s|\s[-–]\s")
+
+MAX_TITLE_LENGTH = 120
+
+
+def extract_inclusion_tags(text: Optional[str]) -> List[str]:
+    """Sorted vocabulary tags mentioned by the inclusions text"""
+    if not text:
+        return []
+    tags = set()
+    for item in _ITEM_SEPARATOR.split(text):
+        if not item.strip() or _NEGATED_ITEM.search(item):
+            continue
+        tags.update(tag for tag, pattern in _TAG_PATTERNS.items() if pattern.search(item))
+    return sorted(tags)
+
+
+def parse_itinerary(text: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Split an itinerary into [{"day", "title", "description"}] entries, one per
+    "Day N" header ("Day 3-4" headers also carry "end_day"). Text without day
+    headers gives an empty list; the original text stays the source of truth.
+    """
+    if not text:
+        return []
+    headers = list(_DAY_HEADER.finditer(text))
+    days = []
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+        body = text[header.end():end].strip()
+        split = _TITLE_END.search(body)
+        title = body[:split.start()] if split else body
+        description = body[split.end():].strip() if split else ""
+        if len(title) > MAX_TITLE_LENGTH:
+            title, description = "", body
+
+        day = {
+            "day": int(header.group(1)),
+            "title": title.strip().rstrip(".:") or None,
+            "description": description or None
+        }
+        if header.group(2) and int(header.group(2)) > day["day"]:
+            day["end_day"] = int(header.group(2))
+        days.append(day)
+    return days
+
+
+def structured_content(values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Structured columns derived from the text fields present in values (a create
+    or update payload), so a partial update only refreshes what it changed.
+    """
+    derived = {}
+    if "itinerary" in values:
+        derived["itinerary_days"] = parse_itinerary(values["itinerary"])
+    if "inclusions" in values:
+        derived["inclusion_tags"] = extract_inclusion_tags(values["inclusions"])
+    return derived
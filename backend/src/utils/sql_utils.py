@@ -0,0 +1,14 @@
+"""
+Small SQL expression helpers shared by the services
+"""
+from typing import Iterable
+from sqlalchemy import any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+
+
+def matches_any(column, values: Iterable):
+    """
+    column = ANY(:values), with the whole list bound as one array parameter so
+    statement size and bind count do not grow with the number of ids.
+    """
+    return column == any_(bindparam(None, list(values), type_=ARRAY(column.type)))
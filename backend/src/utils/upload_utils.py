@@ -0,0 +1,192 @@
+"""
+Helpers for reading uploaded files in bounded chunks instead of buffering them in memory
+"""
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from fastapi import UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from ..config import Config
+
+
+# Bytes needed from the start of a file to recognise every supported format
+SNIFF_BYTES = 12
+
+# Content type -> canonical file extension for the image formats we accept
+IMAGE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """Detect the image content type from the file's magic number"""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+@dataclass
+class SpooledUpload:
+    """An upload copied to a temporary file on disk"""
+    path: str
+    size: int
+    content_type: str
+    extension: str
+    sha256: str
+
+    def cleanup(self) -> None:
+        """Remove the temporary file"""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum allowed size is {max_bytes // (1024 * 1024)} MB."
+    )
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_bytes: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> SpooledUpload:
+    """
+    Copy an uploaded image to a temporary file chunk by chunk.
+
+    The content type is sniffed from the first chunk and the copy is aborted as
+    soon as the size limit is passed, so at most one chunk is held in memory.
+    The caller owns the returned file and must call cleanup() on it.
+    """
+    max_bytes = max_bytes or Config.MAX_UPLOAD_BYTES
+    chunk_size = chunk_size or Config.UPLOAD_CHUNK_SIZE
+
+    # Starlette records the part size while parsing, so oversized files can be
+    # rejected without reading them at all
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    await file.seek(0)
+
+    async def chunks():
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    return await spool_chunks(chunks(), max_bytes)
+
+
+async def spool_chunks(chunks: AsyncIterator[bytes], max_bytes: Optional[int] = None) -> SpooledUpload:
+    """
+    Copy an image body arriving as a stream of chunks (an UploadFile or a raw
+    request body) to a temporary file, sniffing its type and enforcing max_bytes.
+    """
+    max_bytes = max_bytes or Config.MAX_UPLOAD_BYTES
+    iterator = chunks.__aiter__()
+
+    head = b""
+    while len(head) < SNIFF_BYTES:
+        try:
+            head += await iterator.__anext__()
+        except StopAsyncIteration:
+            break
+
+    content_type = sniff_image_type(head)
+    if not content_type:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file type. Only images (jpg, jpeg, png, gif, webp) are allowed."
+        )
+
+    extension = IMAGE_EXTENSIONS[content_type]
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(prefix="upload-", suffix=extension)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            chunk = head
+            while chunk is not None:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                digest.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+                try:
+                    chunk = await iterator.__anext__()
+                except StopAsyncIteration:
+                    chunk = None
+    except BaseException:
+        os.unlink(path)
+        raise
+
+    return SpooledUpload(
+        path=path,
+        size=size,
+        content_type=content_type,
+        extension=extension,
+        sha256=digest.hexdigest()
+    )
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject multipart request bodies larger than max_body_size while they are
+    still being received, before Starlette spools them to disk.
+    """
+
+    def __init__(self, app, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_size:
+            response = JSONResponse(
+                {"detail": "Request body too large."},
+                status_code=413
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # HTTPException is re-raised untouched by FastAPI's body parsing
+                    raise HTTPException(status_code=413, detail="Request body too large.")
+            return message
+
+        await self.app(scope, limited_receive, send)
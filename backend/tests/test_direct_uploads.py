@@ -0,0 +1,290 @@
+"""
+Direct uploads through the local storage backend: sign an upload, PUT the bytes
+to the signed URL, then finalize the object onto a destination.
+
+The database is replaced by an in-memory entity and reference-count table;
+everything between the routes and the files on disk is the real code.
+"""
+import asyncio
+import hashlib
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.admin.dependencies import admin_access_bearer
+from src.admin.routes.uploads import uploads_router
+from src.db.main import get_session
+from src.services import direct_upload_service as direct_upload_module
+from src.services import image_rendition_service as image_rendition_module
+from src.services import storage_service as storage_module
+from src.services.image_rendition_service import image_rendition_service
+from src.services.storage_backends import LocalStorageBackend
+from src.services.storage_service import storage_service
+from src.storage.routes import storage_upload_router
+from src.utils.image_utils import ImageManager, ContentHashMismatch
+
+
+BUCKET = "destination-images"
+BASE_URL = "http://testserver/storage"
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00\x00\x00\rIHDR" + bytes(range(48))
+JPEG = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00" + bytes(range(48))
+
+
+class FakeSession:
+    """Just enough of AsyncSession for finalizing onto one destination"""
+
+    def __init__(self, destination):
+        self.destination = destination
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def exec(self, statement):
+        return SimpleNamespace(first=lambda: self.destination)
+
+    async def execute(self, statement):
+        return None
+
+    def add(self, instance):
+        pass
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+class FakeReferences:
+    """storage_objects as a dict of (bucket, key) -> ref_count"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.counts = {}
+
+    async def add_reference(self, bucket_name, key, sha256, size, content_type):
+        self.counts[(bucket_name, key)] = self.counts.get((bucket_name, key), 0) + 1
+        return self.counts[(bucket_name, key)]
+
+    async def is_tracked(self, bucket_name, key):
+        return (bucket_name, key) in self.counts
+
+    async def release_reference(self, bucket_name, key):
+        if (bucket_name, key) not in self.counts:
+            return False
+        self.counts[(bucket_name, key)] -= 1
+        if self.counts[(bucket_name, key)] <= 0:
+            del self.counts[(bucket_name, key)]
+            await self.backend.remove(bucket_name, [key])
+        return True
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    backend = LocalStorageBackend(str(tmp_path), BASE_URL)
+    monkeypatch.setattr(storage_service, "backend", backend)
+    return backend
+
+
+@pytest.fixture
+def references(backend, monkeypatch):
+    references = FakeReferences(backend)
+    monkeypatch.setattr(storage_service, "add_reference", references.add_reference)
+    monkeypatch.setattr(storage_service, "is_tracked", references.is_tracked)
+    monkeypatch.setattr(storage_service, "_release_reference", references.release_reference)
+    return references
+
+
+@pytest.fixture
+def destination():
+    return SimpleNamespace(id=uuid.uuid4(), featured_image=None, featured_image_renditions=None)
+
+
+@pytest.fixture
+def events(monkeypatch):
+    """Catalog notifications and rendition jobs scheduled by finalize"""
+    events = SimpleNamespace(changes=[], renditions=[])
+
+    async def record_change(entity_type, ids):
+        events.changes.append((entity_type, list(ids)))
+
+    async def record_rendition(entity_type, entity_id):
+        events.renditions.append((entity_type, entity_id))
+
+    monkeypatch.setattr(direct_upload_module, "notify_change", record_change)
+    monkeypatch.setattr(image_rendition_service, "process_in_background", record_rendition)
+    return events
+
+
+@pytest.fixture
+def client(references, destination, events):
+    app = FastAPI()
+    app.include_router(uploads_router, prefix="/api/v1/admin")
+    app.include_router(storage_upload_router, prefix="/api/v1/storage")
+    app.dependency_overrides[admin_access_bearer] = lambda: {"sub": "admin"}
+
+    async def session_override():
+        yield FakeSession(destination)
+
+    app.dependency_overrides[get_session] = session_override
+    return TestClient(app)
+
+
+def sign(client, content, content_type="image/png", content_addressed=False):
+    payload = {"entity_type": "destination", "content_type": content_type, "size": len(content)}
+    if content_addressed:
+        payload["sha256"] = hashlib.sha256(content).hexdigest()
+    response = client.post("/api/v1/admin/uploads/sign", json=payload)
+    assert response.status_code == 200
+    return response.json()
+
+
+def finalize(client, destination, key):
+    return client.post("/api/v1/admin/uploads/finalize", json={
+        "entity_type": "destination",
+        "entity_id": str(destination.id),
+        "key": key,
+        "target": "featured"
+    })
+
+
+def test_valid_upload_is_recorded_on_the_destination(client, backend, destination, events):
+    signed = sign(client, PNG)
+    assert backend.verify_signed_upload(BUCKET, signed["key"], signed["expires_at"], signed["token"])
+
+    response = client.put(signed["upload_url"], content=PNG, headers=signed["headers"])
+    assert response.status_code == 200
+    assert asyncio.run(backend.download(BUCKET, signed["key"])) == PNG
+
+    response = finalize(client, destination, signed["key"])
+    assert response.status_code == 200
+    assert response.json()["image_url"] == signed["public_url"]
+    assert destination.featured_image == signed["public_url"]
+    assert events.changes == [("destination", [destination.id])]
+    assert events.renditions == [("destination", destination.id)]
+
+
+def test_content_addressed_upload_takes_a_reference(client, references, destination):
+    signed = sign(client, PNG, content_addressed=True)
+    assert signed["key"] == f"{hashlib.sha256(PNG).hexdigest()}.png"
+
+    assert client.put(signed["upload_url"], content=PNG).status_code == 200
+    assert finalize(client, destination, signed["key"]).status_code == 200
+    assert references.counts == {(BUCKET, signed["key"]): 1}
+
+
+def test_forged_token_is_rejected(client, backend):
+    signed = sign(client, PNG)
+    forged = signed["upload_url"].replace(signed["token"], "0" * 64)
+
+    assert client.put(forged, content=PNG).status_code == 403
+    assert not asyncio.run(backend.exists(BUCKET, signed["key"]))
+
+
+def test_expired_token_is_rejected(client, backend):
+    key = f"{uuid.uuid4().hex}.png"
+    expires_at = int(time.time()) - 1
+    token = backend._sign(BUCKET, key, expires_at)
+    assert not backend.verify_signed_upload(BUCKET, key, expires_at, token)
+
+    response = client.put(
+        f"/api/v1/storage/upload/{BUCKET}/{key}",
+        params={"expires": expires_at, "token": token},
+        content=PNG
+    )
+    assert response.status_code == 403
+    assert not asyncio.run(backend.exists(BUCKET, key))
+
+
+def test_content_addressed_put_must_match_its_hash(client, backend):
+    signed = sign(client, PNG, content_addressed=True)
+    other = PNG + b"\x01"
+
+    response = client.put(signed["upload_url"], content=other)
+    assert response.status_code == 400
+    assert not asyncio.run(backend.exists(BUCKET, signed["key"]))
+
+
+def test_put_with_a_wrong_magic_number_is_rejected(client, backend):
+    signed = sign(client, PNG)
+
+    assert client.put(signed["upload_url"], content=JPEG).status_code == 400
+    assert client.put(signed["upload_url"], content=b"not an image at all").status_code == 400
+    assert not asyncio.run(backend.exists(BUCKET, signed["key"]))
+
+
+def test_finalize_rejects_and_removes_a_wrong_magic_number(client, backend, destination):
+    # Written straight to storage, as a client can with a Supabase signed URL
+    key = f"{uuid.uuid4().hex}.png"
+    asyncio.run(backend.upload_bytes(BUCKET, key, JPEG, "image/png"))
+
+    response = finalize(client, destination, key)
+    assert response.status_code == 400
+    assert destination.featured_image is None
+    assert not asyncio.run(backend.exists(BUCKET, key))
+
+
+def test_finalize_of_a_missing_object_is_not_found(client, destination):
+    assert finalize(client, destination, f"{uuid.uuid4().hex}.png").status_code == 404
+
+
+def test_finalize_releases_the_replaced_image(client, backend, references, destination):
+    previous_key = f"{hashlib.sha256(JPEG).hexdigest()}.jpg"
+    asyncio.run(backend.upload_bytes(BUCKET, previous_key, JPEG, "image/jpeg"))
+    asyncio.run(references.add_reference(BUCKET, previous_key, previous_key[:64], len(JPEG), "image/jpeg"))
+    destination.featured_image = backend.get_public_url(BUCKET, previous_key)
+
+    signed = sign(client, PNG)
+    assert client.put(signed["upload_url"], content=PNG).status_code == 200
+    assert finalize(client, destination, signed["key"]).status_code == 200
+
+    assert destination.featured_image == signed["public_url"]
+    assert (BUCKET, previous_key) not in references.counts
+    assert not asyncio.run(backend.exists(BUCKET, previous_key))
+
+
+def test_finalize_keeps_a_replaced_image_that_is_still_shared(client, backend, references, destination):
+    previous_key = f"{hashlib.sha256(JPEG).hexdigest()}.jpg"
+    asyncio.run(backend.upload_bytes(BUCKET, previous_key, JPEG, "image/jpeg"))
+    for _ in range(2):
+        asyncio.run(references.add_reference(BUCKET, previous_key, previous_key[:64], len(JPEG), "image/jpeg"))
+    destination.featured_image = backend.get_public_url(BUCKET, previous_key)
+
+    signed = sign(client, PNG)
+    assert client.put(signed["upload_url"], content=PNG).status_code == 200
+    assert finalize(client, destination, signed["key"]).status_code == 200
+
+    assert references.counts == {(BUCKET, previous_key): 1}
+    assert asyncio.run(backend.exists(BUCKET, previous_key))
+
+
+def test_rendition_step_discards_a_hash_mismatch(client, backend, references, destination, events, monkeypatch):
+    # A content-addressed key whose bytes were swapped after signing passes
+    # finalize (the magic number is fine) and is caught when renditions are made
+    key = f"{hashlib.sha256(PNG).hexdigest()}.png"
+    asyncio.run(backend.upload_bytes(BUCKET, key, PNG + b"\x01", "image/png"))
+    assert finalize(client, destination, key).status_code == 200
+    assert references.counts == {(BUCKET, key): 1}
+
+    image_url = backend.get_public_url(BUCKET, key)
+    with pytest.raises(ContentHashMismatch):
+        asyncio.run(ImageManager.create_renditions(image_url, "destination"))
+
+    session = FakeSession(destination)
+    monkeypatch.setattr(storage_module, "async_session_maker", lambda: session)
+    monkeypatch.setattr(image_rendition_module, "notify_change", direct_upload_module.notify_change)
+    asyncio.run(image_rendition_service.reject_image(
+        session, "destination", destination.id, image_url
+    ))
+    assert session.commits == 2
+    assert events.changes[-1] == ("destination", [destination.id])
+    assert not asyncio.run(backend.exists(BUCKET, key))